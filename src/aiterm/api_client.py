@@ -15,24 +15,38 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
+import asyncio
+import atexit
 import datetime
+import gzip
 import json
 import logging
 import os
 import re
 import sys
+import time
 from logging.handlers import RotatingFileHandler
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from . import config
 from .engine import AIEngine, PROVIDER_CONFIGS, _is_groq_reasoning_model
 from .logger import log
 from .settings import settings
+from .utils import fast_json
 from .utils.formatters import RESET_COLOR, SYSTEM_MSG
+from .utils.log_writer import BackgroundWriter
 from .utils.redaction import redact_sensitive_info
 
+try:
+    # Optional HTTP/2 transport, installed via `pip install "aiterm[http2]"`.
+    import httpx
+except ImportError:
+    httpx = None
+
 # Dim grey, used to render reasoning/chain-of-thought during the /debug reveal.
 REASONING_COLOR = "\033[90m"
 
@@ -49,6 +63,12 @@ class ApiRequestError(Exception):
     pass
 
 
+class RateLimitedError(ApiRequestError):
+    """Raised when the provider still answers HTTP 429 after transport retries."""
+
+    pass
+
+
 def _setup_raw_logger() -> logging.Logger:
     """Sets up a rotating file logger specifically for raw API logs."""
     raw_logger = logging.getLogger("aiterm_raw")
@@ -73,12 +93,286 @@ def _setup_raw_logger() -> logging.Logger:
 raw_api_logger = _setup_raw_logger()
 
 
+class _RawLogWriter(BackgroundWriter):
+    """
+    Writes raw API log entries from a background daemon thread.
+
+    Entries are queued by the request path and serialized off it, then written
+    as one newline-delimited batch once 'batch_size' entries have accumulated
+    or 'interval' seconds have passed since the first one arrived.
+    """
+
+    def __init__(self, batch_size: int = 16, interval: float = 1.0) -> None:
+        super().__init__("aiterm-raw-log", batch_size, interval)
+
+    def put(self, entry: dict) -> None:
+        """Queues a (redacted) log entry for writing."""
+        self._put(entry)
+
+    def _write(self, entries: list) -> None:
+        raw_api_logger.info("\n".join(json.dumps(e) for e in entries))
+
+
+_raw_log_writer = _RawLogWriter()
+atexit.register(_raw_log_writer.flush)
+
+
+# Longest wait honoured from a provider's Retry-After header, in seconds.
+_RETRY_AFTER_MAX = 30.0
+
+
+class _CappedRetry(Retry):
+    """Retry policy that never sleeps longer than _RETRY_AFTER_MAX per attempt."""
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), _RETRY_AFTER_MAX)
+
+
+# Transient rate limits and gateway errors are retried with backoff,
+# honouring Retry-After. The final response is returned rather than raised so
+# the provider's error body still reaches raise_for_status(). Read failures
+# are not retried: the POST body has already been sent, and resending it could
+# bill a second completion. The HTTP/2 transport applies the same policy in
+# _send_with_retries().
+_RETRY_POLICY = _CappedRetry(
+    total=4,
+    connect=4,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(408, 425, 429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["POST"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def _retry_delay(method: str, response, attempt: int) -> float | None:
+    """
+    Returns how long to wait before retrying an httpx request that got
+    'response', following _RETRY_POLICY, or None if it should not be retried.
+    """
+    policy = _RETRY_POLICY
+    if (
+        attempt >= policy.total
+        or method not in policy.allowed_methods
+        or response.status_code not in policy.status_forcelist
+    ):
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return policy.parse_retry_after(retry_after)
+        except Exception:
+            pass  # Malformed header: fall back to the backoff.
+    return _backoff_delay(attempt)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Backoff before retrying after 'attempt' + 1 consecutive failures, computed
+    as urllib3 does but capped like Retry-After.
+    """
+    if attempt == 0:
+        return 0.0
+    return min(_RETRY_POLICY.backoff_factor * 2**attempt, _RETRY_AFTER_MAX)
+
+
+def _create_http_session() -> requests.Session:
+    """
+    Creates a pooled HTTP session so that consecutive requests to the same
+    provider reuse an open keep-alive connection instead of repeating the
+    TCP and TLS handshakes on every turn.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=16, max_retries=_RETRY_POLICY
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _create_http_session()
+
+
+def get_session() -> requests.Session:
+    """Returns the shared HTTP session used for all API requests."""
+    return _session
+
+
+class _Http2Response:
+    """
+    Adapts an httpx.Response to the subset of the requests.Response interface
+    used by this module, so callers and stream processing stay transport-agnostic.
+    """
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        try:
+            self._response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            # Streamed bodies are not read yet; load the error body for reporting.
+            self._response.read()
+            raise requests.exceptions.HTTPError(str(e), response=self) from e
+
+    def iter_content(self, chunk_size: int | None = None):
+        # httpx buffers iter_bytes(n) until n bytes arrive, which would hold SSE
+        # events back; yield each chunk as received, like urllib3 does.
+        return self._response.iter_bytes()
+
+    def close(self) -> None:
+        self._response.close()
+
+
+_http2_client = None
+
+
+def _get_http2_client():
+    """
+    Lazily creates the shared HTTP/2 client, or returns None when HTTP/2 is
+    disabled in settings or its optional dependencies are not installed.
+    """
+    global _http2_client
+    if not settings.get("http2_enabled", False) or httpx is None:
+        return None
+    if _http2_client is None:
+        try:
+            _http2_client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            )
+        except ImportError as e:
+            # httpx is present but the 'h2' package is not.
+            log.warning("HTTP/2 unavailable, falling back to HTTP/1.1: %s", e)
+            return None
+    return _http2_client
+
+
+# Request bodies smaller than this are sent uncompressed; gzip would not pay off.
+_COMPRESS_MIN_BYTES = 4096
+
+
+def _encode_payload(headers: dict, payload: dict) -> tuple[dict, bytes]:
+    """
+    Serializes the payload to JSON bytes exactly once for sending, instead of
+    letting the transport re-encode it with the stdlib json module.
+    Large bodies are gzipped when request compression is enabled.
+    Returns the headers to send (a copy; the caller's dict is left untouched)
+    and the request body.
+    """
+    body = fast_json.dumps(payload)
+    headers = {**headers, "Content-Type": "application/json"}
+    if settings.get("compress_requests", False) and len(body) > _COMPRESS_MIN_BYTES:
+        headers["Content-Encoding"] = "gzip"
+        body = gzip.compress(body, compresslevel=1)
+    return headers, body
+
+
+def _send_with_retries(client: "httpx.Client", request, stream: bool):
+    """
+    Sends an httpx request, retrying failed connections and retryable statuses
+    under _RETRY_POLICY so HTTP/2 behaves like the requests transport.
+    """
+    for attempt in range(_RETRY_POLICY.total + 1):
+        try:
+            response = client.send(request, stream=stream)
+        except httpx.ConnectError:
+            # Nothing was sent, so reconnecting cannot duplicate the request.
+            if attempt >= _RETRY_POLICY.connect:
+                raise
+            time.sleep(_backoff_delay(attempt))
+            continue
+        delay = _retry_delay(request.method, response, attempt)
+        if delay is None:
+            return response
+        response.close()
+        time.sleep(delay)
+    return response
+
+
+def _post(url: str, headers: dict, payload: dict, stream: bool):
+    """
+    Sends a POST request over HTTP/2 when enabled, otherwise over the pooled
+    requests session. httpx transport errors are re-raised as requests
+    exceptions so that error handling is shared between both transports.
+    """
+    headers, body = _encode_payload(headers, payload)
+    client = _get_http2_client()
+    if client is None:
+        return get_session().post(
+            url,
+            headers=headers,
+            data=body,
+            stream=stream,
+            timeout=settings["api_timeout"],
+        )
+    try:
+        request = client.build_request(
+            "POST", url, headers=headers, content=body, timeout=settings["api_timeout"]
+        )
+        return _Http2Response(_send_with_retries(client, request, stream))
+    except httpx.HTTPError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+
+def http_get(url: str, headers: dict | None = None):
+    """
+    Sends a GET request over the same transport as chat requests: the shared
+    HTTP/2 client when enabled, otherwise the pooled requests session.
+    """
+    client = _get_http2_client()
+    if client is None:
+        return get_session().get(url, headers=headers, timeout=settings["api_timeout"])
+    try:
+        request = client.build_request(
+            "GET", url, headers=headers, timeout=settings["api_timeout"]
+        )
+        return _Http2Response(_send_with_retries(client, request, stream=False))
+    except httpx.HTTPError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+
+# (mtime_ns, size) of the .env file when it was last loaded; () if it was
+# missing, None before the first load.
+_dotenv_signature: tuple | None = None
+
+
+def _load_dotenv_if_changed() -> None:
+    """Loads the .env file unless it is unchanged since the previous load."""
+    global _dotenv_signature
+    try:
+        st = os.stat(config.DOTENV_FILE)
+        signature: tuple = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = ()
+    if signature != _dotenv_signature:
+        load_dotenv(dotenv_path=config.DOTENV_FILE)
+        _dotenv_signature = signature
+
+
 def check_api_keys(engine: str):
     """
     Checks for the required API key in environment variables, loading the .env
     file if necessary, and returns the key.
     """
-    load_dotenv(dotenv_path=config.DOTENV_FILE)
+    _load_dotenv_if_changed()
 
     if engine in PROVIDER_CONFIGS:
         key_name = PROVIDER_CONFIGS[engine]["api_key_env"]
@@ -100,6 +394,55 @@ def check_api_keys(engine: str):
     return api_key
 
 
+def _error_details(response) -> str:
+    """Extracts the most useful error message from a failed HTTP response."""
+    try:
+        error_json = response.json()
+    except json.JSONDecodeError:
+        return response.text
+    if (
+        isinstance(error_json, dict)
+        and "error" in error_json
+        and "message" in error_json.get("error", {})
+    ):
+        return error_json["error"]["message"]
+    return response.text
+
+
+def _new_log_entry(url: str, headers: dict, payload: dict) -> dict:
+    """Builds the raw API log entry for a request about to be sent."""
+    return {
+        # Raw epoch-ns; formatted only when the entry is written.
+        "timestamp": time.time_ns(),
+        "request": {"url": url, "headers": headers, "payload": payload},
+    }
+
+
+def _write_log_entry(
+    log_entry: dict,
+    stream: bool,
+    response_data: dict | None,
+    error_details: str | None,
+    session_raw_logs: list | None,
+) -> None:
+    """Completes, redacts, and records a raw API log entry."""
+    if not stream:
+        if error_details:
+            log_entry["response"] = {"error": error_details}
+        else:
+            log_entry["response"] = response_data or {
+                "error": "Request failed, see logs for details."
+            }
+
+    log_entry["timestamp"] = datetime.datetime.fromtimestamp(
+        log_entry["timestamp"] / 1e9, tz=datetime.timezone.utc
+    ).isoformat()
+    safe_log_entry = redact_sensitive_info(log_entry)
+    if session_raw_logs is not None:
+        session_raw_logs.append(safe_log_entry)
+    _raw_log_writer.put(safe_log_entry)
+
+
 def make_api_request(
     url: str,
     headers: dict,
@@ -115,47 +458,33 @@ def make_api_request(
     """
     response_data = None
     error_details_for_log = None
-    log_entry = {
-        "timestamp": datetime.datetime.now().isoformat(),
-        "request": {"url": url, "headers": headers, "payload": payload},
-    }
+    # The raw log entry is only built when it will actually be written, so the
+    # default (non-debug) path does no logging bookkeeping at all.
+    log_entry = None
+    if debug_active:
+        log_entry = _new_log_entry(url, headers, payload)
     try:
-        response = requests.post(
-            url,
-            headers=headers,
-            json=payload,
-            stream=stream,
-            timeout=settings["api_timeout"],
-        )
+        response = _post(url, headers, payload, stream)
         response.raise_for_status()
         if stream:
-            log_entry["response"] = {
-                "status_code": response.status_code,
-                "streaming": True,
-            }
+            if log_entry is not None:
+                log_entry["response"] = {
+                    "status_code": response.status_code,
+                    "streaming": True,
+                }
             return response
-        response_data = response.json()
+        response_data = fast_json.loads(response.content)
         if "error" in response_data:
             error_msg = response_data["error"].get("message", "Unknown API error")
             log.error("API Error: %s", error_msg)
             raise ApiRequestError(error_msg)
         return response_data
     except requests.exceptions.HTTPError as e:
-        error_details = "No specific error message provided by the API."
-        try:
-            error_json = e.response.json()
-            if (
-                isinstance(error_json, dict)
-                and "error" in error_json
-                and "message" in error_json.get("error", {})
-            ):
-                error_details = error_json["error"]["message"]
-            else:
-                error_details = e.response.text
-        except json.JSONDecodeError:
-            error_details = e.response.text
+        error_details = _error_details(e.response)
         log.error("HTTP Request Error: %s\nDETAILS: %s", e, error_details)
         error_details_for_log = error_details
+        if e.response is not None and e.response.status_code == 429:
+            raise RateLimitedError(error_details) from e
         raise ApiRequestError(error_details) from e
     except json.JSONDecodeError as e:
         log.error("Failed to decode API response.")
@@ -166,19 +495,10 @@ def make_api_request(
         error_details_for_log = str(e)
         raise ApiRequestError(str(e)) from e
     finally:
-        if not stream:
-            if error_details_for_log:
-                log_entry["response"] = {"error": error_details_for_log}
-            else:
-                log_entry["response"] = response_data or {
-                    "error": "Request failed, see logs for details."
-                }
-
-        if debug_active:
-            safe_log_entry = redact_sensitive_info(log_entry)
-            if session_raw_logs is not None:
-                session_raw_logs.append(safe_log_entry)
-            raw_api_logger.info(json.dumps(safe_log_entry))
+        if log_entry is not None:
+            _write_log_entry(
+                log_entry, stream, response_data, error_details_for_log, session_raw_logs
+            )
 
 
 # --- Reasoning / <think>-block handling -------------------------------------
@@ -187,6 +507,28 @@ _THINK_OPEN = "<think>"
 _THINK_CLOSE = "</think>"
 _THINK_TAGS = (_THINK_OPEN, _THINK_CLOSE)
 
+# Prefix of the Server-Sent Events lines that carry a JSON payload.
+_SSE_DATA_PREFIX = b"data: "
+
+
+def _iter_sse_lines(response: requests.Response, chunk_size: int = 16384):
+    """
+    Yields raw byte lines from a streaming response.
+
+    Reads the body in large blocks and splits on newlines here, which takes
+    far fewer Python-level iterations than requests' iter_lines() with its
+    default 512-byte reads.
+    """
+    pending = b""
+    for block in response.iter_content(chunk_size=chunk_size):
+        if not block:
+            continue
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
 
 def _split_safe(text: str) -> tuple[str, str]:
     """
@@ -239,45 +581,231 @@ def _filter_think_stream(text: str, state: dict) -> tuple[str, str]:
     return "".join(visible), "".join(reasoning)
 
 
+def _openai_token_counts(response_data: dict) -> tuple[int, int, int, int]:
+    """Token counts from an OpenAI-compatible (OpenAI, Groq) response."""
+    usage = response_data.get("usage") or {}
+    # Groq/OpenAI reasoning models report reasoning tokens here.
+    details = usage.get("completion_tokens_details") or {}
+    return (
+        usage.get("prompt_tokens", 0),
+        usage.get("completion_tokens", 0),
+        details.get("reasoning_tokens", 0),
+        usage.get("total_tokens", 0),
+    )
+
+
+def _gemini_token_counts(response_data: dict) -> tuple[int, int, int, int]:
+    """Token counts from a Gemini response."""
+    usage = response_data.get("usageMetadata") or {}
+    return (
+        usage.get("promptTokenCount", 0),
+        usage.get("candidatesTokenCount", 0),
+        usage.get("cachedContentTokenCount", 0),
+        usage.get("totalTokenCount", 0),
+    )
+
+
+def _anthropic_token_counts(response_data: dict) -> tuple[int, int, int, int]:
+    """Token counts from an Anthropic response."""
+    usage = response_data.get("usage") or {}
+    p = usage.get("input_tokens", 0)
+    c = usage.get("output_tokens", 0)
+    return p, c, 0, p + c
+
+
+def _null_token_counts(response_data: dict) -> tuple[int, int, int, int]:
+    return 0, 0, 0, 0
+
+
+_TOKEN_PARSERS = {
+    "openai": _openai_token_counts,
+    "groq": _openai_token_counts,
+    "gemini": _gemini_token_counts,
+    "anthropic": _anthropic_token_counts,
+}
+
+
 def _parse_token_counts(
     engine_name: str, response_data: dict
 ) -> tuple[int, int, int, int]:
     """Parses token counts from a non-streaming API response."""
-    p, c, r, t = 0, 0, 0, 0
     if not response_data:
         return 0, 0, 0, 0
-    if engine_name in ["openai", "groq"]:
-        if "usage" in response_data:
-            usage = response_data["usage"]
-            p = usage.get("prompt_tokens", 0)
-            c = usage.get("completion_tokens", 0)
-            t = usage.get("total_tokens", 0)
-            # Groq/OpenAI reasoning models report reasoning tokens here.
-            details = usage.get("completion_tokens_details") or {}
-            r = details.get("reasoning_tokens", 0)
-    elif engine_name == "gemini":
-        usage = response_data.get("usageMetadata", {})
-        p = usage.get("promptTokenCount", 0)
-        c = usage.get("candidatesTokenCount", 0)
-        r = usage.get("cachedContentTokenCount", 0)
-        t = usage.get("totalTokenCount", 0)
-    elif engine_name == "anthropic":
-        usage = response_data.get("usage", {})
-        p = usage.get("input_tokens", 0)
-        c = usage.get("output_tokens", 0)
-        t = p + c
-    return p, c, r, t
+    return _TOKEN_PARSERS.get(engine_name, _null_token_counts)(response_data)
 
 
-def _process_stream(
-    engine: str,
-    response: requests.Response,
-    print_stream: bool = True,
-    show_reasoning: bool = False,
-    reasoning_expected: bool = False,
-) -> tuple[str, dict]:
+# --- Per-engine stream chunk extractors -------------------------------------
+#
+# Each extractor receives one decoded stream event and the running token
+# dictionary. It updates any usage counts in place and returns a
+# (content, reasoning) pair of text deltas, either of which may be None.
+# Direct indexing inside try/except avoids allocating fallback dicts per chunk.
+
+
+def _extract_openai_chunk(data: dict, tokens: dict) -> tuple[str | None, str | None]:
+    """Extracts deltas from an OpenAI-compatible (OpenAI, Groq) stream event."""
+    usage = data.get("usage")
+    if usage:
+        tokens["prompt"] = usage.get("prompt_tokens", 0)
+        tokens["completion"] = usage.get("completion_tokens", 0)
+        tokens["total"] = usage.get("total_tokens", 0)
+        details = usage.get("completion_tokens_details") or {}
+        tokens["reasoning"] = details.get("reasoning_tokens", 0)
+    try:
+        delta = data["choices"][0]["delta"]
+    except (KeyError, IndexError, TypeError):
+        return None, None
+    reasoning = delta.get("reasoning") or delta.get("reasoning_content")
+    return delta.get("content"), reasoning
+
+
+def _extract_gemini_chunk(data: dict, tokens: dict) -> tuple[str | None, str | None]:
+    """Extracts the text delta from a Gemini stream event."""
+    usage = data.get("usageMetadata")
+    if usage:
+        tokens["prompt"] = usage.get("promptTokenCount", 0)
+        tokens["completion"] = usage.get("candidatesTokenCount", 0)
+        tokens["reasoning"] = usage.get("cachedContentTokenCount", 0)
+        tokens["total"] = usage.get("totalTokenCount", 0)
+    try:
+        return data["candidates"][0]["content"]["parts"][0]["text"], None
+    except (KeyError, IndexError, TypeError):
+        return None, None
+
+
+def _extract_anthropic_chunk(
+    data: dict, tokens: dict
+) -> tuple[str | None, str | None]:
+    """Extracts the text delta from an Anthropic stream event."""
+    event_type = data.get("type")
+    if event_type == "content_block_delta":
+        delta = data.get("delta") or {}
+        if delta.get("type") == "text_delta":
+            return delta.get("text"), None
+    elif event_type == "message_start":
+        usage = (data.get("message") or {}).get("usage") or {}
+        tokens["prompt"] = usage.get("input_tokens", 0)
+    elif event_type == "message_delta":
+        tokens["completion"] = (data.get("usage") or {}).get("output_tokens", 0)
+        tokens["total"] = tokens["prompt"] + tokens["completion"]
+    return None, None
+
+
+_STREAM_EXTRACTORS = {
+    "openai": _extract_openai_chunk,
+    "groq": _extract_openai_chunk,
+    "gemini": _extract_gemini_chunk,
+    "anthropic": _extract_anthropic_chunk,
+}
+
+# --- Stream fast paths --------------------------------------------------------
+#
+# Most stream events carry nothing but the next text delta. For those, the
+# delta string is pulled straight out of the raw bytes with a regex instead of
+# materializing the whole event as a dict. A fast path returns None whenever
+# the event might carry anything else (usage, reasoning, null content), and
+# the caller then falls back to a full JSON parse.
+
+_JSON_STRING = rb'"((?:[^"\\]|\\.)*)"'
+_OPENAI_CONTENT_RE = re.compile(rb'"content"\s*:\s*' + _JSON_STRING)
+_OPENAI_USAGE_RE = re.compile(rb'"usage"\s*:\s*\{')
+_GEMINI_TEXT_RE = re.compile(rb'"text"\s*:\s*' + _JSON_STRING)
+
+
+def _is_balanced(line: bytes) -> bool:
+    """Cheap sanity check that an event is not truncated before trusting a regex."""
+    return line.count(b"{") == line.count(b"}") and line.count(b"[") == line.count(
+        b"]"
+    )
+
+
+def _decode_json_string(raw: bytes) -> str:
+    """Decodes the body of a JSON string literal, unescaping only if needed."""
+    if b"\\" not in raw:
+        return raw.decode("utf-8")
+    return fast_json.loads(b'"' + raw + b'"')
+
+
+def _fast_openai_content(line: bytes) -> str | None:
+    """Returns the content delta of a plain OpenAI-compatible text event."""
+    if (
+        b'"reasoning' in line
+        or _OPENAI_USAGE_RE.search(line)
+        or not _is_balanced(line)
+    ):
+        return None
+    match = _OPENAI_CONTENT_RE.search(line)
+    return _decode_json_string(match.group(1)) if match else None
+
+
+def _fast_gemini_text(line: bytes) -> str | None:
+    """Returns the text delta of a plain single-part Gemini event."""
+    if (
+        b'"usageMetadata"' in line
+        or b'"thought"' in line
+        or line.count(b'"text"') != 1
+        or not _is_balanced(line)
+    ):
+        return None
+    match = _GEMINI_TEXT_RE.search(line)
+    return _decode_json_string(match.group(1)) if match else None
+
+
+_STREAM_FAST_PATHS = {
+    "openai": _fast_openai_content,
+    "groq": _fast_openai_content,
+    "gemini": _fast_gemini_text,
+}
+
+
+class _StreamWriter:
     """
-    Processes a streaming API response.
+    Coalesces streamed text deltas into fewer stdout writes.
+
+    Providers emit roughly one token per event, so writing and flushing each
+    delta costs a syscall (and a terminal repaint) per token. Text is held
+    until a newline arrives, the buffer reaches 'flush_bytes', or
+    'flush_ms' has elapsed since the last flush.
+
+    There is no timer: the 'flush_ms' deadline is only checked when the next
+    delta is written, so if the model stalls, up to 'flush_bytes' of text
+    stays hidden until the next delta or the end of the stream. That keeps all
+    stdout writes on the streaming thread.
+    """
+
+    def __init__(self, flush_bytes: int, flush_ms: int) -> None:
+        self._buffer: list[str] = []
+        self._size = 0
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_ms / 1000
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        self._buffer.append(text)
+        self._size += len(text)
+        if (
+            "\n" in text
+            or self._size >= self._flush_bytes
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            sys.stdout.write("".join(self._buffer))
+            sys.stdout.flush()
+            self._buffer.clear()
+            self._size = 0
+        self._last_flush = time.monotonic()
+
+
+class _StreamProcessor:
+    """
+    Turns the SSE lines of one streamed response into printed output, the
+    final response text, and token counts. The line source is left to the
+    caller so the same parsing serves both the sync and async request paths.
 
     When 'reasoning_expected' is True (Groq reasoning models), leading content
     is buffered until the first </think> so chain-of-thought is separated from
@@ -285,171 +813,159 @@ def _process_stream(
     Groq/qwen quirk). The reasoning is shown only under /debug (show_reasoning);
     it never enters the returned response that becomes conversation history.
     """
-    full_response, p, c, r, t = "", 0, 0, 0, 0
-    think_state = {"in_think": False, "carry": ""}
-    answer_mode = False  # reasoning prefix resolved? (reasoning models only)
-    prefix_buffer = ""   # ambiguous leading content held until </think> or EOS
 
-    def _emit_answer(text: str) -> None:
+    def __init__(
+        self,
+        engine: str,
+        print_stream: bool,
+        show_reasoning: bool,
+        reasoning_expected: bool,
+    ) -> None:
+        self.extract = _STREAM_EXTRACTORS.get(engine)
+        self._fast_path = _STREAM_FAST_PATHS.get(engine)
+        self._print_stream = print_stream
+        self._show_reasoning_enabled = show_reasoning
+        self._reasoning_expected = reasoning_expected
+        # Collected as parts and joined once; += would copy the whole response per delta.
+        self._parts: list[str] = []
+        self.tokens = {"prompt": 0, "completion": 0, "reasoning": 0, "total": 0}
+        self._think_state = {"in_think": False, "carry": ""}
+        self._answer_mode = False  # reasoning prefix resolved? (reasoning models only)
+        self._prefix_buffer = ""   # ambiguous leading content held until </think> or EOS
+        self._out = _StreamWriter(
+            settings.get("stream_flush_bytes", 64), settings.get("stream_flush_ms", 30)
+        )
+
+    def _emit_answer(self, text: str) -> None:
         """Filters any stray balanced think pairs, prints, and records answer."""
-        nonlocal full_response
-        visible, think = _filter_think_stream(text, think_state)
-        if think and show_reasoning and print_stream:
-            sys.stdout.write(f"{REASONING_COLOR}{think}{RESET_COLOR}")
-        if visible and print_stream:
-            sys.stdout.write(visible)
-        if (visible or think) and print_stream:
-            sys.stdout.flush()
-        full_response += visible
+        visible, think = _filter_think_stream(text, self._think_state)
+        if think and self._show_reasoning_enabled and self._print_stream:
+            self._out.write(f"{REASONING_COLOR}{think}{RESET_COLOR}")
+        if visible and self._print_stream:
+            self._out.write(visible)
+        self._parts.append(visible)
 
-    def _show_reasoning(text: str) -> None:
-        if text and show_reasoning and print_stream:
-            sys.stdout.write(f"{REASONING_COLOR}{text}{RESET_COLOR}")
-            sys.stdout.flush()
+    def _show_reasoning(self, text: str | None) -> None:
+        if text and self._show_reasoning_enabled and self._print_stream:
+            self._out.write(f"{REASONING_COLOR}{text}{RESET_COLOR}")
 
-    try:
-        for chunk in response.iter_lines():
-            if not chunk:
-                continue
-            decoded_chunk = chunk.decode("utf-8")
-            if engine in ["openai", "groq"]:
-                if decoded_chunk.startswith("data:"):
-                    if "[DONE]" in decoded_chunk:
-                        break
-                    try:
-                        data = json.loads(decoded_chunk.split("data: ", 1)[1])
-                        choices = data.get("choices") or []
-                        delta = choices[0].get("delta", {}) if choices else {}
-
-                        reasoning_chunk = delta.get("reasoning") or delta.get(
-                            "reasoning_content"
-                        )
-                        content_chunk = delta.get("content")
-
-                        if not reasoning_expected:
-                            # Standard path: stream content directly.
-                            _show_reasoning(reasoning_chunk)
-                            if content_chunk:
-                                if print_stream:
-                                    sys.stdout.write(content_chunk)
-                                    sys.stdout.flush()
-                                full_response += content_chunk
-                        else:
-                            # Reasoning model. Reasoning may arrive as a separate
-                            # field, or inline as <think>...</think> (possibly
-                            # with the opening tag missing).
-                            if reasoning_chunk:
-                                _show_reasoning(reasoning_chunk)
-                                # Separate-field reasoning => content is clean.
-                                if not answer_mode and prefix_buffer:
-                                    _emit_answer(prefix_buffer)
-                                    prefix_buffer = ""
-                                    answer_mode = True
-                            if content_chunk:
-                                if answer_mode:
-                                    _emit_answer(content_chunk)
-                                else:
-                                    prefix_buffer += content_chunk
-                                    idx = prefix_buffer.find(_THINK_CLOSE)
-                                    if idx != -1:
-                                        reasoning_part = prefix_buffer[:idx].replace(
-                                            _THINK_OPEN, ""
-                                        )
-                                        remainder = prefix_buffer[
-                                            idx + len(_THINK_CLOSE):
-                                        ]
-                                        _show_reasoning(reasoning_part)
-                                        prefix_buffer = ""
-                                        answer_mode = True
-                                        if remainder:
-                                            _emit_answer(remainder)
-
-                        usage = data.get("usage")
-                        if usage:
-                            p = usage.get("prompt_tokens", 0)
-                            c = usage.get("completion_tokens", 0)
-                            t = usage.get("total_tokens", 0)
-                            details = usage.get("completion_tokens_details") or {}
-                            r = details.get("reasoning_tokens", 0)
-                    except (json.JSONDecodeError, IndexError):
-                        continue
-            elif engine == "gemini":
-                try:
-                    data = json.loads(decoded_chunk.split("data: ", 1)[1])
-                    if "candidates" in data:
-                        text_chunk = (
-                            data["candidates"][0]
-                            .get("content", {})
-                            .get("parts", [{}])[0]
-                            .get("text", "")
-                        )
-                        if print_stream:
-                            sys.stdout.write(text_chunk)
-                            sys.stdout.flush()
-                        full_response += text_chunk
-                    if "usageMetadata" in data:
-                        p = data["usageMetadata"].get("promptTokenCount", 0)
-                        c = data["usageMetadata"].get("candidatesTokenCount", 0)
-                        r = data["usageMetadata"].get("cachedContentTokenCount", 0)
-                        t = data["usageMetadata"].get("totalTokenCount", 0)
-                except (json.JSONDecodeError, IndexError):
-                    continue
-            elif engine == "anthropic":
-                if decoded_chunk.startswith("data:"):
-                    data_str = decoded_chunk.split("data: ", 1)[1].strip()
-                    if not data_str:
-                        continue
-                    try:
-                        data = json.loads(data_str)
-                        event_type = data.get("type")
-                        if event_type == "message_start":
-                            p = data.get("message", {}).get("usage", {}).get("input_tokens", 0)
-                        elif event_type == "content_block_delta":
-                            delta = data.get("delta", {})
-                            if delta.get("type") == "text_delta":
-                                text_chunk = delta.get("text", "")
-                                if print_stream:
-                                    sys.stdout.write(text_chunk)
-                                    sys.stdout.flush()
-                                full_response += text_chunk
-                        elif event_type == "message_delta":
-                            c = data.get("usage", {}).get("output_tokens", 0)
-                            t = p + c
-                    except json.JSONDecodeError:
-                        continue
-    except KeyboardInterrupt:
-        if print_stream:
-            # A newline is needed to move the cursor to the next line after the partial response.
-            print(f"\n{SYSTEM_MSG}--> Stream interrupted by user.{RESET_COLOR}")
-    except Exception as e:
-        if print_stream:
+    def feed(self, chunk: bytes) -> bool:
+        """Processes one SSE line. Returns False once the stream signals the end."""
+        # Providers frame each event as a "data: <json>" SSE line; anything
+        # else (blank keep-alives, "event:" lines) carries no payload.
+        if not chunk.startswith(_SSE_DATA_PREFIX):
+            return True
+        data_bytes = chunk[len(_SSE_DATA_PREFIX) :].strip()
+        if not data_bytes:
+            return True
+        if data_bytes == b"[DONE]":
+            return False
+
+        content_chunk = self._fast_path(data_bytes) if self._fast_path else None
+        if content_chunk is not None:
+            reasoning_chunk = None
+        else:
+            try:
+                data = fast_json.loads(data_bytes)
+            except json.JSONDecodeError:
+                return True
+            if not isinstance(data, dict):
+                return True
+            content_chunk, reasoning_chunk = self.extract(data, self.tokens)
+
+        if not self._reasoning_expected:
+            # Standard path: stream content directly.
+            self._show_reasoning(reasoning_chunk)
+            if content_chunk:
+                if self._print_stream:
+                    self._out.write(content_chunk)
+                self._parts.append(content_chunk)
+            return True
+
+        # Reasoning model. Reasoning may arrive as a separate field, or
+        # inline as <think>...</think> (possibly with the opening tag missing).
+        if reasoning_chunk:
+            self._show_reasoning(reasoning_chunk)
+            # Separate-field reasoning => content is clean.
+            if not self._answer_mode and self._prefix_buffer:
+                self._emit_answer(self._prefix_buffer)
+                self._prefix_buffer = ""
+                self._answer_mode = True
+        if content_chunk:
+            if self._answer_mode:
+                self._emit_answer(content_chunk)
+            else:
+                self._prefix_buffer += content_chunk
+                idx = self._prefix_buffer.find(_THINK_CLOSE)
+                if idx != -1:
+                    reasoning_part = self._prefix_buffer[:idx].replace(_THINK_OPEN, "")
+                    remainder = self._prefix_buffer[idx + len(_THINK_CLOSE) :]
+                    self._show_reasoning(reasoning_part)
+                    self._prefix_buffer = ""
+                    self._answer_mode = True
+                    if remainder:
+                        self._emit_answer(remainder)
+        return True
+
+    def interrupted(self, error: BaseException) -> None:
+        """Reports a stream cut short by the user or by a network/API error."""
+        self._out.flush()
+        if isinstance(error, KeyboardInterrupt):
+            if self._print_stream:
+                # A newline is needed to move the cursor to the next line after the partial response.
+                print(f"\n{SYSTEM_MSG}--> Stream interrupted by user.{RESET_COLOR}")
+            return
+        if self._print_stream:
             print(
-                f"\n{SYSTEM_MSG}--> Stream interrupted by network/API error: {e}{RESET_COLOR}"
+                f"\n{SYSTEM_MSG}--> Stream interrupted by network/API error: {error}{RESET_COLOR}"
             )
-        log.warning("Stream processing error: %s", e)
+        log.warning("Stream processing error: %s", error)
 
-    # No </think> ever arrived: the reasoning model answered without thinking,
-    # so the buffered prefix is the actual answer.
-    if reasoning_expected and not answer_mode and prefix_buffer:
-        if print_stream:
-            sys.stdout.write(prefix_buffer)
-            sys.stdout.flush()
-        full_response += prefix_buffer
-        prefix_buffer = ""
+    def finish(self) -> tuple[str, dict]:
+        """Flushes held-back text and returns the response text and token counts."""
+        # No </think> ever arrived: the reasoning model answered without thinking,
+        # so the buffered prefix is the actual answer.
+        if self._reasoning_expected and not self._answer_mode and self._prefix_buffer:
+            if self._print_stream:
+                self._out.write(self._prefix_buffer)
+            self._parts.append(self._prefix_buffer)
+            self._prefix_buffer = ""
 
-    # Flush any partial-tag carry held back by the answer-portion filter.
-    if think_state["carry"] and not think_state["in_think"]:
-        if print_stream:
-            sys.stdout.write(think_state["carry"])
-            sys.stdout.flush()
-        full_response += think_state["carry"]
+        # Flush any partial-tag carry held back by the answer-portion filter.
+        carry = self._think_state["carry"]
+        if carry and not self._think_state["in_think"]:
+            if self._print_stream:
+                self._out.write(carry)
+            self._parts.append(carry)
+        self._out.flush()
 
-    # Final guard: strip any complete balanced think span that slipped through
-    # (no-op on content with no think tags).
-    full_response = re.sub(r"<think>.*?</think>", "", full_response, flags=re.DOTALL)
+        # Final guard: strip any complete balanced think span that slipped through
+        # (no-op on content with no think tags).
+        full_response = re.sub(
+            r"<think>.*?</think>", "", "".join(self._parts), flags=re.DOTALL
+        )
+        return full_response, self.tokens
 
-    tokens = {"prompt": p, "completion": c, "reasoning": r, "total": t}
-    return full_response, tokens
+
+def _process_stream(
+    engine: str,
+    response: requests.Response,
+    print_stream: bool = True,
+    show_reasoning: bool = False,
+    reasoning_expected: bool = False,
+) -> tuple[str, dict]:
+    """Processes a streaming API response. See _StreamProcessor for details."""
+    processor = _StreamProcessor(engine, print_stream, show_reasoning, reasoning_expected)
+    if processor.extract is None:
+        log.warning("No stream parser for engine '%s'.", engine)
+        return "", processor.tokens
+    try:
+        for chunk in _iter_sse_lines(response):
+            if not processor.feed(chunk):
+                break
+    except (KeyboardInterrupt, Exception) as e:
+        processor.interrupted(e)
+    return processor.finish()
 
 
 def perform_chat_request(
@@ -469,7 +985,7 @@ def perform_chat_request(
     payload = engine.build_chat_payload(
         messages_or_contents, system_prompt, max_tokens, stream, model
     )
-    headers = engine.get_headers()
+    headers = engine.headers
 
     try:
         response_obj = make_api_request(
@@ -497,7 +1013,13 @@ def perform_chat_request(
             reasoning_expected=reasoning_expected,
         )
 
-    response_data = response_obj
+    return _finish_chat_response(engine, response_obj, print_stream, show_reasoning)
+
+
+def _finish_chat_response(
+    engine: AIEngine, response_data: dict, print_stream: bool, show_reasoning: bool
+) -> tuple[str, dict]:
+    """Extracts the reply text and token counts from a non-streaming response."""
     assistant_response = engine.parse_chat_response(response_data)
 
     # Reveal reasoning on non-streaming requests when /debug is active. Groq's
@@ -511,4 +1033,229 @@ def perform_chat_request(
 
     p, c, r, t = _parse_token_counts(engine.name, response_data)
     tokens = {"prompt": p, "completion": c, "reasoning": r, "total": t}
-    return assistant_response, tokens
\ No newline at end of file
+    return assistant_response, tokens
+
+
+# --- Async API ----------------------------------------------------------------
+#
+# Concurrent callers (batch jobs, model comparisons) can share one
+# httpx.AsyncClient and run requests with asyncio.gather:
+#
+#     async with create_async_client() as client:
+#         results = await asyncio.gather(
+#             *(perform_chat_request_async(..., client=client) for ... in ...)
+#         )
+
+
+def create_async_client() -> "httpx.AsyncClient":
+    """
+    Creates an httpx.AsyncClient for the async API, multiplexing requests over
+    HTTP/2 when the 'h2' package is available.
+    Raises ApiRequestError if the optional httpx dependency is not installed.
+    """
+    if httpx is None:
+        raise ApiRequestError(
+            'Async requests require httpx. Install with: pip install "aiterm[http2]"'
+        )
+    limits = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+    try:
+        return httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:
+        return httpx.AsyncClient(limits=limits)
+
+
+async def _aiter_sse_lines(response: "httpx.Response"):
+    """
+    Async counterpart of _iter_sse_lines for httpx streaming responses.
+
+    Reads chunks as they arrive: aiter_bytes(n) would hold data back until n
+    bytes were buffered and stall the token stream.
+    """
+    pending = b""
+    async for block in response.aiter_bytes():
+        if not block:
+            continue
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def _process_stream_async(
+    engine: str,
+    response: "httpx.Response",
+    print_stream: bool = True,
+    show_reasoning: bool = False,
+    reasoning_expected: bool = False,
+) -> tuple[str, dict]:
+    """Async counterpart of _process_stream."""
+    processor = _StreamProcessor(engine, print_stream, show_reasoning, reasoning_expected)
+    if processor.extract is None:
+        log.warning("No stream parser for engine '%s'.", engine)
+        return "", processor.tokens
+    try:
+        async for chunk in _aiter_sse_lines(response):
+            if not processor.feed(chunk):
+                break
+    except (KeyboardInterrupt, Exception) as e:
+        processor.interrupted(e)
+    return processor.finish()
+
+
+async def _send_with_retries_async(
+    client: "httpx.AsyncClient", request, stream: bool
+) -> "httpx.Response":
+    """Async counterpart of _send_with_retries."""
+    for attempt in range(_RETRY_POLICY.total + 1):
+        try:
+            response = await client.send(request, stream=stream)
+        except httpx.ConnectError:
+            if attempt >= _RETRY_POLICY.connect:
+                raise
+            await asyncio.sleep(_backoff_delay(attempt))
+            continue
+        delay = _retry_delay(request.method, response, attempt)
+        if delay is None:
+            return response
+        await response.aclose()
+        await asyncio.sleep(delay)
+    return response
+
+
+async def _make_api_request_async(
+    client: "httpx.AsyncClient",
+    url: str,
+    headers: dict,
+    payload: dict,
+    stream: bool = False,
+    debug_active: bool = False,
+    session_raw_logs: list | None = None,
+) -> "dict | httpx.Response":
+    """
+    Async counterpart of make_api_request over an httpx.AsyncClient.
+    Returns a dictionary for non-streaming responses or an open httpx.Response
+    for streaming. Raises ApiRequestError on failure.
+    """
+    response_data = None
+    error_details_for_log = None
+    log_entry = _new_log_entry(url, headers, payload) if debug_active else None
+    send_headers, body = _encode_payload(headers, payload)
+    try:
+        request = client.build_request(
+            "POST",
+            url,
+            headers=send_headers,
+            content=body,
+            timeout=settings["api_timeout"],
+        )
+        response = await _send_with_retries_async(client, request, stream)
+        if response.is_error:
+            if stream:
+                await response.aread()
+                await response.aclose()
+            error_details = _error_details(response)
+            log.error(
+                "HTTP Request Error: %s\nDETAILS: %s", response.status_code, error_details
+            )
+            error_details_for_log = error_details
+            if response.status_code == 429:
+                raise RateLimitedError(error_details)
+            raise ApiRequestError(error_details)
+        if stream:
+            if log_entry is not None:
+                log_entry["response"] = {
+                    "status_code": response.status_code,
+                    "streaming": True,
+                }
+            return response
+        response_data = fast_json.loads(response.content)
+        if "error" in response_data:
+            error_msg = response_data["error"].get("message", "Unknown API error")
+            log.error("API Error: %s", error_msg)
+            raise ApiRequestError(error_msg)
+        return response_data
+    except json.JSONDecodeError as e:
+        log.error("Failed to decode API response.")
+        error_details_for_log = "Failed to decode API response."
+        raise ApiRequestError("Failed to decode API response.") from e
+    except httpx.HTTPError as e:
+        log.error("Request Error: %s", e)
+        error_details_for_log = str(e)
+        raise ApiRequestError(str(e)) from e
+    finally:
+        if log_entry is not None:
+            _write_log_entry(
+                log_entry, stream, response_data, error_details_for_log, session_raw_logs
+            )
+
+
+async def perform_chat_request_async(
+    engine: AIEngine,
+    model: str,
+    messages_or_contents: list,
+    system_prompt: str | None,
+    max_tokens: int,
+    stream: bool,
+    debug_active: bool = False,
+    session_raw_logs: list | None = None,
+    print_stream: bool = True,
+    show_reasoning: bool = False,
+    client: "httpx.AsyncClient | None" = None,
+) -> tuple[str, dict]:
+    """
+    Async counterpart of perform_chat_request. Pass a shared 'client' from
+    create_async_client() to run many requests concurrently over one connection
+    pool; without one, a client is created for this request alone.
+    """
+    if client is None:
+        async with create_async_client() as own_client:
+            return await perform_chat_request_async(
+                engine,
+                model,
+                messages_or_contents,
+                system_prompt,
+                max_tokens,
+                stream,
+                debug_active=debug_active,
+                session_raw_logs=session_raw_logs,
+                print_stream=print_stream,
+                show_reasoning=show_reasoning,
+                client=own_client,
+            )
+
+    url = engine.get_chat_url(model, stream)
+    payload = engine.build_chat_payload(
+        messages_or_contents, system_prompt, max_tokens, stream, model
+    )
+
+    try:
+        response_obj = await _make_api_request_async(
+            client,
+            url,
+            engine.headers,
+            payload,
+            stream,
+            debug_active=debug_active,
+            session_raw_logs=session_raw_logs,
+        )
+    except ApiRequestError as e:
+        if not stream:
+            return f"API Error: {e}", {}
+        return "", {}
+
+    if stream:
+        reasoning_expected = engine.name == "groq" and _is_groq_reasoning_model(model)
+        try:
+            return await _process_stream_async(
+                engine.name,
+                response_obj,
+                print_stream=print_stream,
+                show_reasoning=show_reasoning,
+                reasoning_expected=reasoning_expected,
+            )
+        finally:
+            await response_obj.aclose()
+
+    return _finish_chat_response(engine, response_obj, print_stream, show_reasoning)
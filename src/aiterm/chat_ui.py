@@ -23,10 +23,13 @@ delegating all business logic to a SessionManager instance.
 
 from __future__ import annotations
 
+import contextlib
 import datetime
-import json
+import functools
 import shutil
+import signal
 import sys
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -40,14 +43,17 @@ from . import commands, config, theme_manager
 from . import settings as app_settings
 from .api_client import ApiRequestError
 from .logger import log
+from .utils import fast_json
 from .utils.formatters import (
     DIRECTOR_PROMPT,
     RESET_COLOR,
     SYSTEM_MSG,
     USER_PROMPT,
     estimate_token_count,
+    fast_token_estimate,
     format_token_string,
 )
+from .utils.log_writer import chat_log_writer
 from .utils.message_builder import extract_text_from_message
 from .utils.redaction import redact_sensitive_info
 
@@ -56,6 +62,92 @@ if TYPE_CHECKING:
     from .managers.session_manager import SessionManager
 
 
+# Simplified, fixed priority order for the multichat toolbar.
+MULTICHAT_TOOLBAR_ORDER = ("tokens", "models", "io")
+
+# The terminal width is re-queried at most this often. A SIGWINCH received
+# outside of an active prompt invalidates it immediately; while a prompt is
+# running, prompt_toolkit owns SIGWINCH, so the TTL bounds the staleness.
+TERMINAL_WIDTH_TTL_SECONDS = 2.0
+
+# Bound once at import; the maps are only ever mutated in place.
+_COMMAND_MAP = commands.COMMAND_MAP
+_MULTICHAT_COMMAND_MAP = commands.MULTICHAT_COMMAND_MAP
+
+
+def _split_command(user_input: str) -> tuple[str, str]:
+    """
+    Separates a slash command into its lowercased name and the raw remainder.
+    The remainder is only tokenized once a handler has been found, so /ai
+    prompts and unknown commands are never split word by word.
+    """
+    command_word, *rest = user_input.split(None, 1)
+    return command_word.lower(), rest[0] if rest else ""
+
+
+# Moves the cursor up one line and clears it, hiding the echoed input.
+_ERASE_PREV_LINE = "\x1b[1A\x1b[2K"
+
+
+def _erase_prev_line() -> None:
+    """
+    Erases the previously echoed input line as a single write. The flush is
+    required even though a prompt redraw usually follows: prompt_toolkit
+    writes to stdout's binary buffer, bypassing any text still pending here.
+    """
+    sys.stdout.write(_ERASE_PREV_LINE)
+    sys.stdout.flush()
+
+
+# Bumped on every terminal resize signal to invalidate cached widths.
+_resize_generation = 0
+_resize_handler_installed = False
+
+
+def _install_resize_handler() -> None:
+    """
+    Chains a SIGWINCH handler that invalidates cached terminal widths. Called
+    when a chat UI starts rather than at import, and installed only once.
+    """
+    global _resize_handler_installed
+    sigwinch = getattr(signal, "SIGWINCH", None)
+    if sigwinch is None or _resize_handler_installed:
+        return  # Windows relies on the TTL alone.
+    previous = signal.getsignal(sigwinch)
+
+    def _on_resize(signum, frame):
+        global _resize_generation
+        _resize_generation += 1
+        if callable(previous):
+            previous(signum, frame)
+
+    # Signal handlers can only be installed from the main thread.
+    with contextlib.suppress(ValueError):
+        signal.signal(sigwinch, _on_resize)
+        _resize_handler_installed = True
+
+# Toolbar style classes and the theme keys that define them.
+_TOOLBAR_STYLE_KEYS = (
+    ("bottom-toolbar", "style_bottom_toolbar_background"),
+    ("bottom-toolbar.separator", "style_bottom_toolbar_separator"),
+    ("bottom-toolbar.tokens", "style_bottom_toolbar_tokens"),
+    ("bottom-toolbar.io", "style_bottom_toolbar_io"),
+    ("bottom-toolbar.model", "style_bottom_toolbar_model"),
+    ("bottom-toolbar.persona", "style_bottom_toolbar_persona"),
+    ("bottom-toolbar.live", "style_bottom_toolbar_live"),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_toolbar_style(style_items: tuple[tuple[str, str], ...]) -> Style:
+    """
+    Parses toolbar style rules into a Style. Keyed by the rule values rather
+    than the theme object, so a reloaded or edited theme can never hit a
+    stale entry and no explicit invalidation is needed.
+    """
+    return Style.from_dict(dict(style_items))
+
+
 class BaseChatUI:
     """A base class for chat UIs containing shared logic."""
 
@@ -64,21 +156,36 @@ class BaseChatUI:
     ):
         self.session = session
         self.session_name = session_name
+        # Last queried terminal width, as (resize generation, queried at, width).
+        self._width_cache: tuple[int, float, int] | None = None
+        # Last parsed toolbar priority order, as (raw setting, parsed keys).
+        self._order_cache: tuple[str | None, tuple[str, ...]] = (None, ())
+        # Last toolbar separator seen, as (separator, its length).
+        self._separator_cache: tuple[str | None, int] = (None, 0)
+
+    def _terminal_width(self) -> int:
+        """Returns the terminal width, avoiding an ioctl on every toolbar tick."""
+        now = time.monotonic()
+        if self._width_cache is not None:
+            generation, queried_at, width = self._width_cache
+            if (
+                generation == _resize_generation
+                and now - queried_at < TERMINAL_WIDTH_TTL_SECONDS
+            ):
+                return width
+        width = shutil.get_terminal_size().columns
+        self._width_cache = (_resize_generation, now, width)
+        return width
 
     def _create_style_from_theme(self) -> Style:
         """Creates a prompt_toolkit Style object from the current theme."""
         theme = theme_manager.ACTIVE_THEME
-        style_dict = {
-            "bottom-toolbar": theme.get("style_bottom_toolbar_background", ""),
-            "bottom-toolbar.separator": theme.get("style_bottom_toolbar_separator", ""),
-            "bottom-toolbar.tokens": theme.get("style_bottom_toolbar_tokens", ""),
-            "bottom-toolbar.io": theme.get("style_bottom_toolbar_io", ""),
-            "bottom-toolbar.model": theme.get("style_bottom_toolbar_model", ""),
-            "bottom-toolbar.persona": theme.get("style_bottom_toolbar_persona", ""),
-            "bottom-toolbar.live": theme.get("style_bottom_toolbar_live", ""),
-        }
+        style_items = tuple(
+            (style_class, theme.get(theme_key, ""))
+            for style_class, theme_key in _TOOLBAR_STYLE_KEYS
+        )
         try:
-            return Style.from_dict(style_dict)
+            return _build_toolbar_style(style_items)
         except (ValueError, TypeError) as e:
             print(
                 f"{SYSTEM_MSG}--> Warning: Invalid theme style format detected: {e}{RESET_COLOR}"
@@ -86,26 +193,50 @@ class BaseChatUI:
             log.warning("Invalid theme style format: %s", e)
             return Style.from_dict({})
 
+    def _parse_toolbar_order(self, raw_order: str) -> tuple[str, ...]:
+        """
+        Splits a comma-separated priority order setting, reusing the previous
+        result while the setting is unchanged (it only changes through /set).
+        """
+        cached_raw, cached_order = self._order_cache
+        if raw_order != cached_raw:
+            cached_order = tuple(raw_order.split(","))
+            self._order_cache = (raw_order, cached_order)
+        return cached_order
+
+    def _toolbar_separator(self) -> tuple[str, int]:
+        """Returns the toolbar separator and its length, measured once per value."""
+        separator = app_settings.settings["toolbar_separator"]
+        cached_separator, sep_len = self._separator_cache
+        if separator != cached_separator:
+            sep_len = len(separator)
+            self._separator_cache = (separator, sep_len)
+        return separator, sep_len
+
     def _build_toolbar_from_components(
-        self, component_map: dict, order: list[str]
+        self, component_map: dict, order: tuple[str, ...] | list[str]
     ) -> Any | None:
         """
         Generic helper to construct the prompt_toolkit toolbar content from a
-        map of components and a priority order.
+        map of components and a priority order. Each component is an
+        (enabled, style class, text callable) tuple; the text is only built for
+        enabled components that are reached before the width runs out.
         """
-        width = shutil.get_terminal_size().columns
+        width = self._terminal_width()
         styled_parts = []
         current_length = 0
-        separator = app_settings.settings["toolbar_separator"]
-        sep_len = len(separator)
+        separator, sep_len = self._toolbar_separator()
         sep_style_str = "class:bottom-toolbar.separator"
 
         for key in order:
             if key not in component_map:
                 continue
 
-            is_enabled, style_class, text = component_map[key]
-            if not is_enabled or not text:
+            is_enabled, style_class, build_text = component_map[key]
+            if not is_enabled:
+                continue
+            text = build_text()
+            if not text:
                 continue
 
             part_len = len(text)
@@ -130,55 +261,126 @@ class SingleChatUI(BaseChatUI):
         # Pass session_name to the manager for potential use in workflows
         # (e.g., image generation logging)
         self.session.session_name = session_name
+        # Running token estimate for the history, as (history list, messages
+        # counted, last counted message, tokens). See _history_token_count.
+        self._history_token_cache: tuple[list | None, int, Any, int] = (
+            None,
+            0,
+            None,
+            0,
+        )
+        # Per-message token estimates, as id(message) -> (message, tokens).
+        # Holding the message keeps its id from being reused while cached.
+        self._message_tokens: dict[int, tuple[Any, int]] = {}
+        # Token estimate of the last system prompt seen, as (prompt, tokens).
+        self._system_prompt_tokens: tuple[str | None, int] = (None, 0)
+        # Last built toolbar, as ((buffer text, history length, live tokens
+        # shown, terminal width), parts). Periodic redraws of an idle prompt
+        # reuse it; slash commands, which may change anything else the toolbar
+        # shows, drop it.
+        self._toolbar_cache: tuple[tuple[str, int, bool, int], Any] | None = None
+        # The prompt colors are fixed at import, so the parsed prompt is reused.
+        self._ansi_prompt = ANSI(f"\n{USER_PROMPT}You: {RESET_COLOR}")
+
+    def _history_token_count(self) -> int:
+        """
+        Returns the estimated token count of the conversation history.
+
+        The toolbar polls this on every refresh, so only messages appended
+        since the previous call are estimated. When the history is replaced
+        or truncated (/undo, condensing, loading), the total is re-summed from
+        per-message counts, so only messages never seen before are estimated.
+        Counts are kept here rather than on the messages, which are sent to
+        providers as-is.
+        """
+        history = self.session.state.history
+        cached_history, seen, last_message, total = self._history_token_cache
+        known = self._message_tokens
+        if (
+            cached_history is not history
+            or seen > len(history)
+            or (seen and history[seen - 1] is not last_message)
+        ):
+            # Start a fresh map so counts for dropped messages are released.
+            seen, total = 0, 0
+            self._message_tokens = {}
+        for message in history[seen:]:
+            entry = known.get(id(message))
+            if entry is not None and entry[0] is message:
+                tokens = entry[1]
+            else:
+                tokens = estimate_token_count(extract_text_from_message(message))
+            self._message_tokens[id(message)] = (message, tokens)
+            total += tokens
+        self._history_token_cache = (
+            history,
+            len(history),
+            history[-1] if history else None,
+            total,
+        )
+        return total
 
-    def _get_bottom_toolbar_content(self) -> Any | None:
-        """Constructs the dynamic content for the prompt_toolkit bottom toolbar."""
-        # --- Live Context Token Estimation ---
+    def _live_context_tokens(self, live_buffer_text: str) -> int:
+        """Estimates the tokens the next request would send, input included."""
         base_context_tokens = 0
         full_system_prompt = self.session._assemble_full_system_prompt()
         if full_system_prompt:
-            base_context_tokens += estimate_token_count(full_system_prompt)
+            # The session hands back the same string until the prompt changes.
+            cached_prompt, cached_tokens = self._system_prompt_tokens
+            if full_system_prompt is not cached_prompt:
+                cached_tokens = estimate_token_count(full_system_prompt)
+                self._system_prompt_tokens = (full_system_prompt, cached_tokens)
+            base_context_tokens += cached_tokens
 
-        for message in self.session.state.history:
-            text_content = extract_text_from_message(message)
-            base_context_tokens += estimate_token_count(text_content)
+        base_context_tokens += self._history_token_count()
+        return base_context_tokens + fast_token_estimate(live_buffer_text)
 
+    def _get_bottom_toolbar_content(self) -> Any | None:
+        """Constructs the dynamic content for the prompt_toolkit bottom toolbar."""
         live_buffer_text = get_app().current_buffer.text
-        live_buffer_tokens = estimate_token_count(live_buffer_text)
-        total_live_tokens = base_context_tokens + live_buffer_tokens
+        settings = app_settings.settings
+        cache_key = (
+            live_buffer_text,
+            len(self.session.state.history),
+            settings["toolbar_show_live_tokens"],
+            self._terminal_width(),
+        )
+        if self._toolbar_cache is not None and self._toolbar_cache[0] == cache_key:
+            return self._toolbar_cache[1]
 
-        # --- Component Mapping ---
+        state = self.session.state
         component_map = {
             "tokens": (
                 True,
                 "class:bottom-toolbar.tokens",
-                format_token_string(self.session.state.last_turn_tokens),
+                lambda: format_token_string(state.last_turn_tokens),
             ),
             "io": (
-                app_settings.settings["toolbar_show_total_io"],
+                settings["toolbar_show_total_io"],
                 "class:bottom-toolbar.io",
-                f"Session I/O: {self.session.state.total_prompt_tokens}p / {self.session.state.total_completion_tokens}c",
+                lambda: f"Session I/O: {state.total_prompt_tokens}p / {state.total_completion_tokens}c",
             ),
             "model": (
-                app_settings.settings["toolbar_show_model"],
+                settings["toolbar_show_model"],
                 "class:bottom-toolbar.model",
-                f"Model: {self.session.state.model}",
+                lambda: f"Model: {state.model}",
             ),
             "persona": (
-                app_settings.settings["toolbar_show_persona"]
-                and self.session.state.current_persona,
+                settings["toolbar_show_persona"] and state.current_persona,
                 "class:bottom-toolbar.persona",
-                f"Persona: {self.session.state.current_persona.name if self.session.state.current_persona else ''}",
+                lambda: f"Persona: {state.current_persona.name}",
             ),
             "live": (
-                app_settings.settings["toolbar_show_live_tokens"],
+                settings["toolbar_show_live_tokens"],
                 "class:bottom-toolbar.live",
-                f"Live Context: ~{total_live_tokens}t",
+                lambda: f"Live Context: ~{self._live_context_tokens(live_buffer_text)}t",
             ),
         }
 
-        order = app_settings.settings["toolbar_priority_order"].split(",")
-        return self._build_toolbar_from_components(component_map, order)
+        order = self._parse_toolbar_order(settings["toolbar_priority_order"])
+        styled_parts = self._build_toolbar_from_components(component_map, order)
+        self._toolbar_cache = (cache_key, styled_parts)
+        return styled_parts
 
     def run(self) -> None:
         log_filename_base = (
@@ -186,6 +388,7 @@ class SingleChatUI(BaseChatUI):
             or f"chat_{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}_{self.session.state.engine.name}"
         )
         log_filepath = config.CHATLOG_DIRECTORY / f"{log_filename_base}.jsonl"
+        _install_resize_handler()
         print(
             f"Starting interactive chat with {self.session.state.engine.name.capitalize()} ({self.session.state.model})."
         )
@@ -195,33 +398,41 @@ class SingleChatUI(BaseChatUI):
 
         style = self._create_style_from_theme()
         prompt_session = PromptSession(
-            history=InMemoryHistory(self.session.state.command_history), style=style
+            history=InMemoryHistory(
+                self.session.state.command_history[-config.COMMAND_HISTORY_LIMIT :]
+            ),
+            style=style,
         )
         first_turn = not self.session.state.history
 
         try:
             while True:
+                commands.report_failed_saves()
                 toolbar_content = (
                     self._get_bottom_toolbar_content
                     if app_settings.settings["toolbar_enabled"]
                     else None
                 )
-                prompt_message = f"\n{USER_PROMPT}You: {RESET_COLOR}"
                 user_input = prompt_session.prompt(
-                    ANSI(prompt_message),
+                    self._ansi_prompt,
                     bottom_toolbar=toolbar_content,
-                    refresh_interval=0.5,
+                    # Without the live token count, the toolbar only changes
+                    # between turns, so it can be polled less often.
+                    refresh_interval=(
+                        0.5
+                        if app_settings.settings["toolbar_show_live_tokens"]
+                        else 1.0
+                    ),
                 ).strip()
 
                 if not user_input:
-                    sys.stdout.write("\x1b[1A\x1b[2K")
-                    sys.stdout.flush()
+                    _erase_prev_line()
                     continue
                 if user_input.startswith("/"):
-                    sys.stdout.write("\x1b[1A\x1b[2K")
-                    sys.stdout.flush()
+                    _erase_prev_line()
                     if self._handle_slash_command(user_input, prompt_session.history):
                         break
+                    self._toolbar_cache = None
 
                     if self.session.state.ui_refresh_needed:
                         prompt_session.style = self._create_style_from_theme()
@@ -244,15 +455,19 @@ class SingleChatUI(BaseChatUI):
             print("\nSession interrupted by user.")
         finally:
             print("\nSession ended.")
+        commands.wait_for_pending_saves()
+        commands.report_failed_saves()
+        # Cleanup reads and may rename the log, so pending turns must land first.
+        chat_log_writer.flush()
         self.session.cleanup(self.session_name, log_filepath)
 
     def _handle_slash_command(
         self, user_input: str, cli_history: InMemoryHistory
     ) -> bool:
-        parts = user_input.strip().split()
-        command_str, args = parts[0].lower(), parts[1:]
-        handler = commands.COMMAND_MAP.get(command_str)
+        command_str, rest = _split_command(user_input)
+        handler = _COMMAND_MAP.get(command_str)
         if handler:
+            args = rest.split()
             if command_str == "/save":
                 return handler(args, self.session, cli_history) or False
             result = handler(args, self.session)
@@ -273,9 +488,9 @@ class SingleChatUI(BaseChatUI):
             }
             # Redact sensitive info before writing to the user-facing log
             safe_log_entry = redact_sensitive_info(log_entry)
-            with open(log_filepath, "a", encoding="utf-8") as f:
-                f.write(json.dumps(safe_log_entry) + "\n")
-        except (OSError, IndexError) as e:
+            # Appended by a background thread, so the prompt never waits on disk.
+            chat_log_writer.put(log_filepath, fast_json.dumps(safe_log_entry) + b"\n")
+        except IndexError as e:
             log.warning("Could not write to session log file: %s", e)
 
 
@@ -290,30 +505,33 @@ class MultiChatUI(BaseChatUI):
     ):
         super().__init__(session, session_name)
         self.initial_prompt = initial_prompt
+        self._ansi_director_prompt = ANSI(f"\n{DIRECTOR_PROMPT}Director> {RESET_COLOR}")
 
     def _get_bottom_toolbar_content(self) -> Any | None:
         """Constructs the dynamic content for the prompt_toolkit bottom toolbar."""
+        state = self.session.state
+        models = self.session.models
         component_map = {
             "models": (
                 app_settings.settings["toolbar_show_model"],
                 "class:bottom-toolbar.model",
-                f"GPT: {self.session.models['openai']} | GEM: {self.session.models['gemini']}",
+                lambda: f"GPT: {models['openai']} | GEM: {models['gemini']}",
             ),
             "io": (
                 app_settings.settings["toolbar_show_total_io"],
                 "class:bottom-toolbar.io",
-                f"Session I/O: {self.session.state.total_prompt_tokens}p / {self.session.state.total_completion_tokens}c",
+                lambda: f"Session I/O: {state.total_prompt_tokens}p / {state.total_completion_tokens}c",
             ),
             "tokens": (
                 True,
                 "class:bottom-toolbar.tokens",
-                format_token_string(self.session.state.last_turn_tokens),
+                lambda: format_token_string(state.last_turn_tokens),
             ),
         }
 
-        # Simplified priority order for multichat
-        order = ["tokens", "models", "io"]
-        return self._build_toolbar_from_components(component_map, order)
+        return self._build_toolbar_from_components(
+            component_map, MULTICHAT_TOOLBAR_ORDER
+        )
 
     def run(self) -> None:
         log_filename_base = (
@@ -321,6 +539,7 @@ class MultiChatUI(BaseChatUI):
             or f"multichat_{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}"
         )
         log_filepath = config.CHATLOG_DIRECTORY / f"{log_filename_base}.jsonl"
+        _install_resize_handler()
         print(
             f"Starting interactive multi-chat. Primary: {'OpenAI' if self.session.primary_engine_name == 'openai' else self.session.primary_engine_name.capitalize()}. Log: {log_filepath.name}"
         )
@@ -328,7 +547,10 @@ class MultiChatUI(BaseChatUI):
 
         style = self._create_style_from_theme()
         prompt_session = PromptSession(
-            history=InMemoryHistory(self.session.state.command_history), style=style
+            history=InMemoryHistory(
+                self.session.state.command_history[-config.COMMAND_HISTORY_LIMIT :]
+            ),
+            style=style,
         )
 
         if self.initial_prompt:
@@ -338,25 +560,23 @@ class MultiChatUI(BaseChatUI):
 
         try:
             while True:
+                commands.report_failed_saves()
                 toolbar_content = (
                     self._get_bottom_toolbar_content
                     if app_settings.settings["toolbar_enabled"]
                     else None
                 )
-                prompt_message = f"\n{DIRECTOR_PROMPT}Director> {RESET_COLOR}"
                 user_input = prompt_session.prompt(
-                    ANSI(prompt_message),
+                    self._ansi_director_prompt,
                     bottom_toolbar=toolbar_content,
                     refresh_interval=0.5,
                 ).strip()
                 if not user_input:
-                    sys.stdout.write("\x1b[1A\x1b[2K")
-                    sys.stdout.flush()
+                    _erase_prev_line()
                     continue
 
-                if user_input.lstrip().startswith("/"):
-                    sys.stdout.write("\x1b[1A\x1b[2K")
-                    sys.stdout.flush()
+                if user_input.startswith("/"):
+                    _erase_prev_line()
                     if self._handle_slash_command(
                         user_input, prompt_session.history, log_filepath
                     ):
@@ -375,17 +595,19 @@ class MultiChatUI(BaseChatUI):
             print("\nSession interrupted.")
         finally:
             print("\nSession ended.")
+        commands.wait_for_pending_saves()
+        commands.report_failed_saves()
+        chat_log_writer.flush()
 
     def _handle_slash_command(
         self, user_input: str, cli_history: InMemoryHistory, log_filepath: Path
     ) -> bool:
-        parts = user_input.strip().split()
-        command_str, args = parts[0].lower(), parts[1:]
+        command_str, rest = _split_command(user_input)
         if command_str == "/ai":
             self.session.process_turn(user_input, log_filepath)
             return False
-        handler = commands.MULTICHAT_COMMAND_MAP.get(command_str)
+        handler = _MULTICHAT_COMMAND_MAP.get(command_str)
         if handler:
-            return handler(args, self.session, cli_history) or False
+            return handler(rest.split(), self.session, cli_history) or False
         print(f"{SYSTEM_MSG}--> Unknown command: {command_str}.{RESET_COLOR}")
         return False
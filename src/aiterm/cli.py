@@ -22,12 +22,14 @@ Main entry point for the application.
 """
 
 import argparse
+import functools
+import os
 import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
 
-from . import api_client, bootstrap, config, handlers, review
+from . import bootstrap, config
 from . import personas as persona_manager
 from .settings import settings
 from .utils.formatters import RESET_COLOR, SYSTEM_MSG
@@ -56,6 +58,10 @@ def run_chat_command(args: argparse.Namespace) -> None:
         )
         sys.exit(1)
 
+    # Imported here rather than at module level: the handler stack pulls in
+    # requests and prompt_toolkit, which '--help' and 'review' never need.
+    from . import api_client, handlers
+
     # --- Argument Validation ---
     if args.image:
         # Pre-resolve engine for validation since persona can set it.
@@ -88,13 +94,15 @@ def run_chat_command(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     if args.file:
-        for path_str in args.file:
-            if not Path(path_str).exists():
-                print(
-                    f"Error: The file or directory '{path_str}' does not exist.",
-                    file=sys.stderr,
-                )
-                sys.exit(1)
+        # Check every path up front so all missing ones are reported together.
+        missing = [path_str for path_str in args.file if not os.path.exists(path_str)]
+        for path_str in missing:
+            print(
+                f"Error: The file or directory '{path_str}' does not exist.",
+                file=sys.stderr,
+            )
+        if missing:
+            sys.exit(1)
 
     try:
         if args.load:
@@ -122,11 +130,12 @@ def run_chat_command(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
-def main() -> None:
-    """Parses arguments and orchestrates the application flow."""
-    bootstrap.ensure_project_structure()
-    load_dotenv(dotenv_path=config.DOTENV_FILE)
-
+@functools.lru_cache(maxsize=1)
+def _build_chat_parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser for chat arguments. It is cached, so the two dozen
+    argument definitions are only constructed once per process.
+    """
     chat_parent_parser = argparse.ArgumentParser(add_help=False)
     core_group = chat_parent_parser.add_argument_group("Core Execution")
     mode_group = chat_parent_parser.add_argument_group("Operation Modes")
@@ -251,7 +260,17 @@ def main() -> None:
         action="store_true",
         help="Start with session-specific debug logging enabled.",
     )
+    return chat_parent_parser
 
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the top-level parser with the chat and review subcommands. Only
+    the review command needs it, so plain chat invocations never pay for
+    copying the chat arguments into a subparser.
+    """
+    chat_parent_parser = _build_chat_parser()
     parser = argparse.ArgumentParser(
         description="Unified Command-Line AI Client for OpenAI, Gemini, Anthropic, and Groq.",
         formatter_class=CustomHelpFormatter,
@@ -274,13 +293,29 @@ def main() -> None:
         type=Path,
         help="Optional: Path to a specific file to replay directly.",
     )
+    return parser
+
+
+def _prepare_environment() -> None:
+    """
+    Creates the project directories and loads API keys. Runs only once the
+    arguments have parsed, so usage errors and help output touch no files.
+    """
+    bootstrap.ensure_project_structure()
+    load_dotenv(dotenv_path=config.DOTENV_FILE)
 
+
+def main() -> None:
+    """Parses arguments and orchestrates the application flow."""
     args_list = sys.argv[1:]
     is_review_command = len(args_list) > 0 and args_list[0] == "review"
     is_chat_command = len(args_list) > 0 and args_list[0] == "chat"
 
     if is_review_command:
-        args = parser.parse_args(args_list)
+        args = _build_parser().parse_args(args_list)
+        _prepare_environment()
+        from . import review
+
         review.main(args)
     else:
         if is_chat_command:
@@ -289,10 +324,10 @@ def main() -> None:
         # Handle `aiterm` with no arguments for interactive mode.
         if not args_list and sys.stdin.isatty():
             # Create a default args namespace for interactive mode
-            args = chat_parent_parser.parse_args([])
+            args = _build_chat_parser().parse_args([])
             args.prompt = None
             args.chat = True  # Ensure chat mode is active
-            run_chat_command(args)
         else:
-            args = chat_parent_parser.parse_args(args_list)
-            run_chat_command(args)
\ No newline at end of file
+            args = _build_chat_parser().parse_args(args_list)
+        _prepare_environment()
+        run_chat_command(args)
\ No newline at end of file
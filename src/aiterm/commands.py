@@ -25,8 +25,10 @@ manipulate the state of a SessionManager instance.
 from __future__ import annotations
 
 import json
-import os
-import tempfile
+import queue
+import sys
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, fields
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -39,9 +41,16 @@ from . import api_client, config, prompts, theme_manager, workflows
 from . import personas as persona_manager
 from .engine import get_engine
 from .logger import log
-from .managers.context_manager import Attachment, ContextManager
+from .managers.context_manager import (
+    Attachment,
+    AttachmentMap,
+    ContextManager,
+    paths_named,
+)
 from .session_state import SessionState
-from .settings import save_setting, settings
+from .settings import save_setting, save_setting_deferred, settings
+from .utils import fast_json
+from .utils.atomic_file import write_atomic
 from .utils.config_loader import get_default_model_for_engine
 from .utils.formatters import (
     ASSISTANT_PROMPT,
@@ -53,7 +62,6 @@ from .utils.formatters import (
     sanitize_filename,
 )
 from .utils.message_builder import (
-    construct_user_message,
     extract_text_from_message,
     translate_history,
 )
@@ -62,6 +70,72 @@ from .utils.ui_helpers import display_help, select_model
 if TYPE_CHECKING:
     from .managers.multichat_manager import MultiChatSession
     from .managers.session_manager import SessionManager
+    from .session_state import MultiChatSessionState
+
+
+# --- Command Argument Vocabularies ---
+# Built once at import rather than on every command invocation.
+
+# Ordered, since /engine without arguments cycles through them.
+_ENGINE_NAMES = ("openai", "gemini", "anthropic", "groq")
+_TOOLBAR_STATES = frozenset(("on", "off"))
+_TOOLBAR_COMPONENTS = {
+    "io": "toolbar_show_total_io",
+    "live": "toolbar_show_live_tokens",
+    "model": "toolbar_show_model",
+    "persona": "toolbar_show_persona",
+}
+# Settings whose change requires reloading the theme and redrawing the UI.
+_REDRAW_SETTINGS = frozenset(("active_theme", "toolbar_enabled"))
+_ASSISTANT_ROLES = frozenset(("assistant", "model"))
+_MULTICHAT_ENGINE_ALIASES = {"gpt": "openai", "gem": "gemini"}
+
+
+def _arg_string(args: list[str]) -> str:
+    """Rejoins command arguments, skipping the join for zero or one token."""
+    if not args:
+        return ""
+    if len(args) == 1:
+        return args[0]
+    return " ".join(args)
+
+
+def _parse_save_args(args: list[str]) -> tuple[str, bool, bool]:
+    """Splits /save arguments into (filename, --remember, --stay) in one pass."""
+    should_remember = should_stay = False
+    filename_parts = []
+    for arg in args:
+        if arg == "--remember":
+            should_remember = True
+        elif arg == "--stay":
+            should_stay = True
+        else:
+            filename_parts.append(arg)
+    return _arg_string(filename_parts), should_remember, should_stay
+
+
+def _write_block(parts: list[str]) -> None:
+    """Writes pre-formatted output lines to stdout as a single write."""
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+
+def _total_file_size(attachments: dict[Path, Attachment]) -> int:
+    """
+    Sums the on-disk size of the attached files. Sizes recorded when each
+    file was read are used as-is; older records without one are stat'ed,
+    skipping any that no longer exist or cannot be read.
+    """
+    total = 0
+    for path, attachment in attachments.items():
+        if attachment.size is not None:
+            total += attachment.size
+            continue
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total
 
 
 # --- Single-Chat Command Handler Functions ---
@@ -164,7 +238,7 @@ def handle_forget(args: list[str], session: SessionManager) -> None:
 def handle_max_tokens(args: list[str], session: SessionManager) -> None:
     if args and args[0].isdigit():
         session.state.max_tokens = int(args[0])
-        print(f"{SYSTEM_MSG}--> Max tokens set to: {int(args[0])}.{RESET_COLOR}")
+        print(f"{SYSTEM_MSG}--> Max tokens set to: {session.state.max_tokens}.{RESET_COLOR}")
     else:
         print(f"{SYSTEM_MSG}--> Usage: /max-tokens <number>{RESET_COLOR}")
 
@@ -186,17 +260,18 @@ def handle_clear(args: list[str], session: SessionManager) -> None:
 
 
 def handle_model(args: list[str], session: SessionManager) -> None:
-    if args:
+    refresh = args == ["--refresh"]
+    if args and not refresh:
         session.state.model = args[0]
         print(f"{SYSTEM_MSG}--> Model set to: {args[0]}.{RESET_COLOR}")
     else:
-        new_model = select_model(session.state.engine, "chat")
+        new_model = select_model(session.state.engine, "chat", refresh=refresh)
         session.state.model = new_model
         print(f"{SYSTEM_MSG}--> Model set to: {new_model}.{RESET_COLOR}")
 
 
 def handle_engine(args: list[str], session: SessionManager) -> None:
-    engines = ["openai", "gemini", "anthropic", "groq"]
+    engines = _ENGINE_NAMES
 
     if args:
         new_engine_name = args[0]
@@ -229,6 +304,8 @@ def handle_history(args: list[str], session: SessionManager) -> None:
         print("History is empty.")
         return
 
+    # Long histories are assembled first and emitted with a single write.
+    out = []
     for message in session.state.history:
         role = message.get("role")
         text_content = extract_text_from_message(message)
@@ -237,41 +314,41 @@ def handle_history(args: list[str], session: SessionManager) -> None:
             continue
 
         if role == "user":
-            print(f"\n{USER_PROMPT}You:{RESET_COLOR}\n{text_content}")
-        elif role in ["assistant", "model"]:
-            print(f"\n{ASSISTANT_PROMPT}Assistant:{RESET_COLOR}\n{text_content}")
+            out.append(f"\n{USER_PROMPT}You:{RESET_COLOR}\n{text_content}\n")
+        elif role in _ASSISTANT_ROLES:
+            out.append(f"\n{ASSISTANT_PROMPT}Assistant:{RESET_COLOR}\n{text_content}\n")
+    _write_block(out)
 
 
 def handle_state(args: list[str], session: SessionManager) -> None:
-    print(f"{SYSTEM_MSG}--- Session State ---{RESET_COLOR}")
-    persona_name = (
-        session.state.current_persona.name if session.state.current_persona else "None"
-    )
-    print(f"  Active Persona: {persona_name}")
-    print(f"  Engine: {session.state.engine.name}, Model: {session.state.model}")
-    print(f"  Max Tokens: {session.state.max_tokens or 'Default'}")
-    print(f"  Streaming: {'On' if session.state.stream_active else 'Off'}")
-    print(f"  Memory on Exit: {'On' if session.state.memory_enabled else 'Off'}")
-    print(f"  Debug Logging: {'On' if session.state.debug_active else 'Off'}")
-    print(
-        f"  Total Session I/O: {session.state.total_prompt_tokens}p / {session.state.total_completion_tokens}c"
-    )
-    print(f"  System Prompt: {'Active' if session.state.system_prompt else 'None'}")
-    if session.state.attachments:
-        total_size = sum(
-            p.stat().st_size for p in session.state.attachments if p.exists()
-        )
-        print(
-            f"  Attached Text Files: {len(session.state.attachments)} ({format_bytes(total_size)})"
+    state = session.state
+    persona_name = state.current_persona.name if state.current_persona else "None"
+    out = [
+        f"{SYSTEM_MSG}--- Session State ---{RESET_COLOR}\n"
+        f"  Active Persona: {persona_name}\n"
+        f"  Engine: {state.engine.name}, Model: {state.model}\n"
+        f"  Max Tokens: {state.max_tokens or 'Default'}\n"
+        f"  Streaming: {'On' if state.stream_active else 'Off'}\n"
+        f"  Memory on Exit: {'On' if state.memory_enabled else 'Off'}\n"
+        f"  Debug Logging: {'On' if state.debug_active else 'Off'}\n"
+        f"  Total Session I/O: {state.total_prompt_tokens}p / {state.total_completion_tokens}c\n"
+        f"  System Prompt: {'Active' if state.system_prompt else 'None'}\n"
+    ]
+    if state.attachments:
+        total_size = _total_file_size(state.attachments)
+        out.append(
+            f"  Attached Text Files: {len(state.attachments)} ({format_bytes(total_size)})\n"
         )
-    if session.state.attached_images:
-        print(f"  Attached Images: {len(session.state.attached_images)}")
-    if session.image_workflow.img_prompt_crafting:
-        print("  Image Crafting: ACTIVE")
-        if session.image_workflow.img_prompt:
-            print(f"  Current Prompt: {session.image_workflow.img_prompt[:50]}...")
-    if session.image_workflow.last_img_prompt:
-        print(f"  Last Image Prompt: {session.image_workflow.last_img_prompt[:50]}...")
+    if state.attached_images:
+        out.append(f"  Attached Images: {len(state.attached_images)}\n")
+    image_workflow = session.image_workflow
+    if image_workflow.img_prompt_crafting:
+        out.append("  Image Crafting: ACTIVE\n")
+        if image_workflow.img_prompt:
+            out.append(f"  Current Prompt: {image_workflow.img_prompt[:50]}...\n")
+    if image_workflow.last_img_prompt:
+        out.append(f"  Last Image Prompt: {image_workflow.last_img_prompt[:50]}...\n")
+    _write_block(out)
 
 
 def handle_set(args: list[str], session: SessionManager) -> None:
@@ -282,7 +359,7 @@ def handle_set(args: list[str], session: SessionManager) -> None:
         if success:
             session.state.ui_refresh_needed = True
             # Force a full redraw for settings that might affect the UI layout
-            if key in ["active_theme", "toolbar_enabled"]:
+            if key in _REDRAW_SETTINGS:
                 theme_manager.reload_theme()
                 get_app().invalidate()
     else:
@@ -303,15 +380,10 @@ def handle_toolbar(args: list[str], session: SessionManager) -> None:
         return
 
     command = args[0].lower()
-    valid_components = {
-        "io": "toolbar_show_total_io",
-        "live": "toolbar_show_live_tokens",
-        "model": "toolbar_show_model",
-        "persona": "toolbar_show_persona",
-    }
+    valid_components = _TOOLBAR_COMPONENTS
 
-    if command in ["on", "off"]:
-        success, message = save_setting("toolbar_enabled", command)
+    if command in _TOOLBAR_STATES:
+        success, message = save_setting_deferred("toolbar_enabled", command)
         print(f"{SYSTEM_MSG}--> {message}{RESET_COLOR}")
         if success:
             session.state.ui_refresh_needed = True
@@ -321,7 +393,7 @@ def handle_toolbar(args: list[str], session: SessionManager) -> None:
         if component_key in valid_components:
             setting_key = valid_components[component_key]
             current_value = settings[setting_key]
-            success, message = save_setting(setting_key, str(not current_value))
+            success, message = save_setting_deferred(setting_key, str(not current_value))
             print(f"{SYSTEM_MSG}--> {message}{RESET_COLOR}")
             if success:
                 session.state.ui_refresh_needed = True
@@ -361,55 +433,132 @@ def handle_theme(args: list[str], session: SessionManager) -> None:
         print(f"{SYSTEM_MSG}--> Error setting theme: {message}{RESET_COLOR}")
 
 
-def _save_session_to_file(session: SessionManager, filename: str) -> bool:
+# Session files are written by a single worker, so saves land in order and the
+# interpreter waits for any pending write before exiting.
+_SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aiterm-save")
+# Failure messages from background saves, printed by report_failed_saves().
+_failed_saves: queue.SimpleQueue[str] = queue.SimpleQueue()
+
+
+def _write_session_state(
+    filepath: Path, state_dict: dict, label: str, wait: bool
+) -> bool:
+    """
+    Serializes a session snapshot and hands the disk write to the save worker.
+    Encoding happens here, so the snapshot cannot change underneath the write
+    and serialization errors are reported immediately. With 'wait', the result
+    of the write is reported before returning; otherwise only failures are
+    reported, by report_failed_saves() once the prompt has returned.
+    """
+
+    def _report_failure(e: Exception) -> bool:
+        log.error("Failed to save %s state: %s", label, e)
+        print(f"{SYSTEM_MSG}--> Error saving {label}: {e}{RESET_COLOR}")
+        return False
+
+    try:
+        data = fast_json.dumps(state_dict, indent=True)
+    except TypeError as e:
+        return _report_failure(e)
+
+    future = _SAVE_EXECUTOR.submit(write_atomic, filepath, data)
+    if not wait:
+        print(f"{SYSTEM_MSG}--> Saving {label} to: {filepath}{RESET_COLOR}")
+
+        def _on_done(done: Future) -> None:
+            e = done.exception()
+            if e is not None:
+                # Runs on the save worker, likely while a prompt is active, so
+                # printing here would corrupt the prompt line.
+                log.error("Failed to save %s state: %s", label, e)
+                _failed_saves.put(f"Error saving {label}: {e}")
+
+        future.add_done_callback(_on_done)
+        return True
+    try:
+        future.result()
+    except OSError as e:
+        return _report_failure(e)
+    print(f"{SYSTEM_MSG}--> {label.capitalize()} saved to: {filepath}{RESET_COLOR}")
+    return True
+
+
+def wait_for_pending_saves() -> None:
+    """Blocks until every session write submitted so far has finished."""
+    _SAVE_EXECUTOR.submit(lambda: None).result()
+
+
+def report_failed_saves() -> None:
+    """Prints failures of background saves that have completed so far."""
+    while True:
+        try:
+            message = _failed_saves.get_nowait()
+        except queue.Empty:
+            return
+        print(f"{SYSTEM_MSG}--> {message}{RESET_COLOR}")
+
+
+def _state_fields(state: SessionState | MultiChatSessionState) -> dict:
+    """
+    Maps a session state's fields to their current values without copying
+    them. Unlike dataclasses.asdict, this does not deep-copy the history or
+    the engine; the snapshot is encoded to JSON before the save is queued, so
+    referencing live values is safe. Callers replace non-JSON fields.
+    """
+    return {f.name: getattr(state, f.name) for f in fields(state)}
+
+
+def _save_to_file(
+    state: SessionState | MultiChatSessionState,
+    filename: str,
+    label: str,
+    strip_keys: Iterable[str],
+    extra: dict,
+    wait: bool = True,
+) -> bool:
+    """
+    Shared save path for single- and multi-chat sessions. Engines named in
+    'strip_keys' are dropped, attachments are converted to JSON-friendly
+    types, and 'extra' supplies the session-specific serialized fields.
+    """
     safe_name = sanitize_filename(filename.rsplit(".", 1)[0]) + ".json"
     filepath = config.SESSIONS_DIRECTORY / safe_name
 
-    state_dict = asdict(session.state)
-    state_dict["engine_name"] = session.state.engine.name
-    del state_dict["engine"]
+    state_dict = _state_fields(state)
+    for key in strip_keys:
+        del state_dict[key]
     state_dict["attachments"] = {
-        str(k): asdict(v) for k, v in session.state.attachments.items()
+        str(k): asdict(v) for k, v in state.attachments.items()
     }
-    state_dict["persona_attachments"] = [
-        str(p) for p in session.state.persona_attachments
-    ]
-    state_dict["current_persona"] = (
-        session.state.current_persona.filename
-        if session.state.current_persona
-        else None
-    )
+    state_dict.update(extra)
 
-    temp_file_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=config.SESSIONS_DIRECTORY,
-            delete=False,
-            prefix=f"{filepath.stem}_",
-            suffix=filepath.suffix,
-        ) as f:
-            temp_file_path = f.name
-            json.dump(state_dict, f, indent=2)
-
-        os.replace(temp_file_path, filepath)
-        print(f"{SYSTEM_MSG}--> Session saved to: {filepath}{RESET_COLOR}")
-        return True
-    except (OSError, TypeError) as e:
-        log.error("Failed to save session state: %s", e)
-        print(f"{SYSTEM_MSG}--> Error saving session: {e}{RESET_COLOR}")
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        return False
+    return _write_session_state(filepath, state_dict, label, wait)
+
+
+def _save_session_to_file(
+    session: SessionManager, filename: str, wait: bool = True
+) -> bool:
+    state = session.state
+    return _save_to_file(
+        state,
+        filename,
+        "session",
+        strip_keys=("engine",),
+        extra={
+            "engine_name": state.engine.name,
+            "persona_attachments": [str(p) for p in state.persona_attachments],
+            "current_persona": (
+                state.current_persona.filename if state.current_persona else None
+            ),
+        },
+        wait=wait,
+    )
 
 
 def handle_save(
     args: list[str], session: SessionManager, cli_history: InMemoryHistory
 ) -> bool:
-    should_remember, should_stay = "--remember" in args, "--stay" in args
-    filename_parts = [arg for arg in args if arg not in ("--remember", "--stay")]
-    filename = " ".join(filename_parts)
+    filename, should_remember, should_stay = _parse_save_args(args)
     if not filename:
         print(f"{SYSTEM_MSG}--> Generating descriptive name...{RESET_COLOR}")
         filename, _ = session._perform_helper_request(
@@ -425,8 +574,11 @@ def handle_save(
             return False
         filename = sanitize_filename(filename)
 
-    session.state.command_history = cli_history.get_strings()
-    if _save_session_to_file(session, filename):
+    session.state.command_history = cli_history.get_strings()[
+        -config.COMMAND_HISTORY_LIMIT :
+    ]
+    # When staying in the session, the disk write overlaps with typing.
+    if _save_session_to_file(session, filename, wait=not should_stay):
         if not should_remember:
             session.state.exit_without_memory = True
         return not should_stay
@@ -434,7 +586,7 @@ def handle_save(
 
 
 def handle_load(args: list[str], session: SessionManager) -> bool:
-    filename = " ".join(args)
+    filename = _arg_string(args)
     if not filename:
         print(f"{SYSTEM_MSG}--> Usage: /load <filename>{RESET_COLOR}")
         return False
@@ -442,8 +594,8 @@ def handle_load(args: list[str], session: SessionManager) -> bool:
         filename += ".json"
     filepath = config.SESSIONS_DIRECTORY / filename
     try:
-        with open(filepath, encoding="utf-8") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            data = fast_json.loads(f.read())
 
         if "engine_name" not in data or "model" not in data:
             log.warning("Loaded session file %s is missing required keys.", filepath)
@@ -464,12 +616,17 @@ def handle_load(args: list[str], session: SessionManager) -> bool:
         data["engine"] = get_engine(engine_name, api_key)
 
         if "attachments" in data:
-            data["attachments"] = {
-                Path(k): Attachment(**v) for k, v in data["attachments"].items()
-            }
+            raw_attachments = data["attachments"]
+            data["attachments"] = AttachmentMap(
+                zip(
+                    map(Path, raw_attachments),
+                    [Attachment(**v) for v in raw_attachments.values()],
+                    strict=True,
+                )
+            )
 
         if "persona_attachments" in data:
-            data["persona_attachments"] = {Path(p) for p in data["persona_attachments"]}
+            data["persona_attachments"] = set(map(Path, data["persona_attachments"]))
 
         persona_filename = data.get("current_persona")
         data["current_persona"] = (
@@ -506,16 +663,14 @@ def handle_load(args: list[str], session: SessionManager) -> bool:
 
 def handle_refresh(args: list[str], session: SessionManager) -> None:
     updated_files = session.context_manager.refresh_files(
-        " ".join(args) if args else None
+        _arg_string(args) if args else None
     )
     session.state.attachments = session.context_manager.attachments
 
     if updated_files:
         filenames = ", ".join(f"'{f}'" for f in updated_files)
         system_message_text = f"[SYSTEM] The content of the following files has been refreshed: {filenames}."
-        system_message = construct_user_message(
-            session.state.engine.name, system_message_text, []
-        )
+        system_message = session.build_user_message(system_message_text)
         session.state.history.append(system_message)
 
 
@@ -524,19 +679,23 @@ def handle_files(args: list[str], session: SessionManager) -> None:
 
 
 def handle_print(args: list[str], session: SessionManager) -> None:
-    filename = " ".join(args)
+    filename = _arg_string(args)
     if not filename:
         print(f"{SYSTEM_MSG}--> Usage: /print <filename>{RESET_COLOR}")
         return
 
-    path_to_print = next(
-        (p for p in session.state.attachments if p.name == filename), None
-    )
+    paths_to_print = paths_named(session.state.attachments, filename)
 
-    if path_to_print:
-        content = session.state.attachments[path_to_print].content
-        print(f"\n{SYSTEM_MSG}--- Content of {filename} ---{RESET_COLOR}\n{content}")
-        print(f"{SYSTEM_MSG}--- End of {filename} ---{RESET_COLOR}")
+    if paths_to_print:
+        if len(paths_to_print) > 1:
+            print(
+                f"{SYSTEM_MSG}--> {len(paths_to_print)} attached files are named '{filename}'.{RESET_COLOR}"
+            )
+        for path in paths_to_print:
+            label = str(path) if len(paths_to_print) > 1 else filename
+            content = session.state.attachments[path].content
+            print(f"\n{SYSTEM_MSG}--- Content of {label} ---{RESET_COLOR}\n{content}")
+            print(f"{SYSTEM_MSG}--- End of {label} ---{RESET_COLOR}")
     else:
         print(f"{SYSTEM_MSG}--> No attached file named '{filename}'.{RESET_COLOR}")
 
@@ -545,25 +704,22 @@ def handle_attach(args: list[str], session: SessionManager) -> None:
     if not args:
         print(f"{SYSTEM_MSG}--> Usage: /attach <path_to_file_or_dir>{RESET_COLOR}")
         return
-    path_str = " ".join(args)
+    path_str = _arg_string(args)
 
-    before_paths = set(session.state.attachments.keys())
+    before_paths = set(session.state.attachments)
     session.context_manager.attach_file(path_str)
     session.state.attachments = session.context_manager.attachments
-    after_paths = set(session.state.attachments.keys())
 
-    newly_attached_paths = after_paths - before_paths
+    newly_attached_paths = session.state.attachments.keys() - before_paths
     if newly_attached_paths:
         path_names = ", ".join(f"'{p.name}'" for p in newly_attached_paths)
         system_message_text = f"[SYSTEM] The following content has been attached to the context: {path_names}."
-        system_message = construct_user_message(
-            session.state.engine.name, system_message_text, []
-        )
+        system_message = session.build_user_message(system_message_text)
         session.state.history.append(system_message)
 
 
 def handle_detach(args: list[str], session: SessionManager) -> None:
-    path_str = " ".join(args)
+    path_str = _arg_string(args)
     if not path_str:
         print(f"{SYSTEM_MSG}--> Usage: /detach <path_to_file_or_dir>{RESET_COLOR}")
         return
@@ -585,9 +741,7 @@ def handle_detach(args: list[str], session: SessionManager) -> None:
         print(f"{SYSTEM_MSG}--> Detached {display_name}.{RESET_COLOR}")
 
         system_message_text = f"[SYSTEM] The content from {display_name} has been detached from the context."
-        system_message = construct_user_message(
-            session.state.engine.name, system_message_text, []
-        )
+        system_message = session.build_user_message(system_message_text)
         session.state.history.append(system_message)
     else:
         print(
@@ -607,7 +761,7 @@ def handle_personas(args: list[str], session: SessionManager) -> None:
 
 def handle_persona(args: list[str], session: SessionManager) -> None:
     """Handles clearing, loading, and applying a persona's settings and context."""
-    name = " ".join(args)
+    name = _arg_string(args)
     if not name:
         print(f"{SYSTEM_MSG}--> Usage: /persona <name> OR /persona clear{RESET_COLOR}")
         return
@@ -627,9 +781,7 @@ def handle_persona(args: list[str], session: SessionManager) -> None:
             session.state.current_persona = None
             print(f"{SYSTEM_MSG}--> Persona cleared.{RESET_COLOR}")
             session.state.history.append(
-                construct_user_message(
-                    session.state.engine.name, "[SYSTEM] Persona cleared.", []
-                )
+                session.build_user_message("[SYSTEM] Persona cleared.")
             )
     else:
         new_persona = persona_manager.load_persona(name)
@@ -676,10 +828,8 @@ def handle_persona(args: list[str], session: SessionManager) -> None:
                 f"{SYSTEM_MSG}--> Switched to persona: '{new_persona.name}'{RESET_COLOR}"
             )
             session.state.history.append(
-                construct_user_message(
-                    session.state.engine.name,
-                    f"[SYSTEM] Persona switched to '{new_persona.name}'.",
-                    [],
+                session.build_user_message(
+                    f"[SYSTEM] Persona switched to '{new_persona.name}'."
                 )
             )
 
@@ -695,56 +845,34 @@ def handle_image(args: list[str], session: SessionManager) -> None:
 # --- Multi-Chat Command Handler Functions ---
 
 
-def _save_multichat_session_to_file(session: MultiChatSession, filename: str) -> bool:
-    safe_name = sanitize_filename(filename.rsplit(".", 1)[0]) + ".json"
-    filepath = config.SESSIONS_DIRECTORY / safe_name
-
-    state_dict = asdict(session.state)
-    state_dict["session_type"] = "multichat"
-    # Engines are not serializable, so we remove them
-    del state_dict["openai_engine"]
-    del state_dict["gemini_engine"]
-
-    # Convert non-serializable types (Path, set, Persona) to JSON-friendly types
-    state_dict["attachments"] = {
-        str(k): asdict(v) for k, v in session.state.attachments.items()
-    }
-    state_dict["openai_persona_attachments"] = [
-        str(p) for p in session.state.openai_persona_attachments
-    ]
-    state_dict["gemini_persona_attachments"] = [
-        str(p) for p in session.state.gemini_persona_attachments
-    ]
-    state_dict["openai_persona"] = (
-        session.state.openai_persona.filename if session.state.openai_persona else None
-    )
-    state_dict["gemini_persona"] = (
-        session.state.gemini_persona.filename if session.state.gemini_persona else None
+def _save_multichat_session_to_file(
+    session: MultiChatSession, filename: str, wait: bool = True
+) -> bool:
+    state = session.state
+    return _save_to_file(
+        state,
+        filename,
+        "multi-chat session",
+        # Engines are not serializable, so we remove them
+        strip_keys=("openai_engine", "gemini_engine"),
+        extra={
+            "session_type": "multichat",
+            "openai_persona_attachments": [
+                str(p) for p in state.openai_persona_attachments
+            ],
+            "gemini_persona_attachments": [
+                str(p) for p in state.gemini_persona_attachments
+            ],
+            "openai_persona": (
+                state.openai_persona.filename if state.openai_persona else None
+            ),
+            "gemini_persona": (
+                state.gemini_persona.filename if state.gemini_persona else None
+            ),
+        },
+        wait=wait,
     )
 
-    temp_file_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=config.SESSIONS_DIRECTORY,
-            delete=False,
-            prefix=f"{filepath.stem}_",
-            suffix=filepath.suffix,
-        ) as f:
-            temp_file_path = f.name
-            json.dump(state_dict, f, indent=2)
-
-        os.replace(temp_file_path, filepath)
-        print(f"{SYSTEM_MSG}--> Multi-chat session saved to: {filepath}{RESET_COLOR}")
-        return True
-    except (OSError, TypeError) as e:
-        log.error("Failed to save multi-chat session state: %s", e)
-        print(f"{SYSTEM_MSG}--> Error saving multi-chat session: {e}{RESET_COLOR}")
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        return False
-
 
 def handle_multichat_exit(
     args: list[str], session: MultiChatSession, cli_history: InMemoryHistory
@@ -775,15 +903,17 @@ def handle_multichat_history(
         print("History is empty.")
         return
 
+    out = []
     for message in session.state.shared_history:
         text_content = extract_text_from_message(message).strip()
         if not text_content:
             continue
 
         if text_content.lower().startswith("director"):
-            print(f"\n{DIRECTOR_PROMPT}{text_content}{RESET_COLOR}")
+            out.append(f"\n{DIRECTOR_PROMPT}{text_content}{RESET_COLOR}\n")
         else:
-            print(f"\n{ASSISTANT_PROMPT}{text_content}{RESET_COLOR}")
+            out.append(f"\n{ASSISTANT_PROMPT}{text_content}{RESET_COLOR}\n")
+    _write_block(out)
 
 
 def handle_multichat_debug(
@@ -840,7 +970,7 @@ def handle_multichat_model(
         return
 
     engine_alias, model_name = args[0].lower(), args[1]
-    engine_map = {"gpt": "openai", "gem": "gemini"}
+    engine_map = _MULTICHAT_ENGINE_ALIASES
 
     if engine_alias not in engine_map:
         print(f"{SYSTEM_MSG}--> Invalid engine alias. Use 'gpt' or 'gem'.{RESET_COLOR}")
@@ -860,45 +990,41 @@ def handle_multichat_model(
 def handle_multichat_state(
     args: list[str], session: MultiChatSession, cli_history: InMemoryHistory
 ) -> None:
-    print(f"{SYSTEM_MSG}--- Multi-Chat Session State ---{RESET_COLOR}")
-    gpt_p = (
-        session.state.openai_persona.name if session.state.openai_persona else "None"
-    )
-    gem_p = (
-        session.state.gemini_persona.name if session.state.gemini_persona else "None"
-    )
-    print(f"  OpenAI Persona: {gpt_p}, Model: {session.state.openai_model}")
-    print(f"  Gemini Persona: {gem_p}, Model: {session.state.gemini_model}")
-    print(f"  Max Tokens: {session.state.max_tokens or 'Default'}")
-    print(f"  Debug Logging: {'On' if session.state.debug_active else 'Off'}")
-    print(
-        f"  Total Session I/O: {session.state.total_prompt_tokens}p / {session.state.total_completion_tokens}c"
-    )
-    if session.state.attachments:
-        total_size = sum(
-            p.stat().st_size for p in session.state.attachments if p.exists()
-        )
-        print(
-            f"  Attached Text Files: {len(session.state.attachments)} ({format_bytes(total_size)})"
+    state = session.state
+    gpt_p = state.openai_persona.name if state.openai_persona else "None"
+    gem_p = state.gemini_persona.name if state.gemini_persona else "None"
+    out = [
+        f"{SYSTEM_MSG}--- Multi-Chat Session State ---{RESET_COLOR}\n"
+        f"  OpenAI Persona: {gpt_p}, Model: {state.openai_model}\n"
+        f"  Gemini Persona: {gem_p}, Model: {state.gemini_model}\n"
+        f"  Max Tokens: {state.max_tokens or 'Default'}\n"
+        f"  Debug Logging: {'On' if state.debug_active else 'Off'}\n"
+        f"  Total Session I/O: {state.total_prompt_tokens}p / {state.total_completion_tokens}c\n"
+    ]
+    if state.attachments:
+        total_size = _total_file_size(state.attachments)
+        out.append(
+            f"  Attached Text Files: {len(state.attachments)} ({format_bytes(total_size)})\n"
         )
-    if session.state.attached_images:
-        print(f"  Attached Images: {len(session.state.attached_images)}")
+    if state.attached_images:
+        out.append(f"  Attached Images: {len(state.attached_images)}\n")
+    _write_block(out)
 
 
 def handle_multichat_save(
     args: list[str], session: MultiChatSession, cli_history: InMemoryHistory
 ) -> bool:
-    should_remember, should_stay = "--remember" in args, "--stay" in args
-    filename_parts = [arg for arg in args if arg not in ("--remember", "--stay")]
-    filename = " ".join(filename_parts)
+    filename, should_remember, should_stay = _parse_save_args(args)
     if not filename:
         print(
             f"{SYSTEM_MSG}--> Usage: /save <filename> [--stay] [--remember]{RESET_COLOR}"
         )
         return False
 
-    session.state.command_history = cli_history.get_strings()
-    if _save_multichat_session_to_file(session, filename):
+    session.state.command_history = cli_history.get_strings()[
+        -config.COMMAND_HISTORY_LIMIT :
+    ]
+    if _save_multichat_session_to_file(session, filename, wait=not should_stay):
         if not should_remember:
             session.state.exit_without_memory = True
         return not should_stay
@@ -915,7 +1041,7 @@ def handle_multichat_set(
         if success:
             session.state.ui_refresh_needed = True
             # Force a full redraw for settings that might affect the UI layout
-            if key in ["active_theme", "toolbar_enabled"]:
+            if key in _REDRAW_SETTINGS:
                 theme_manager.reload_theme()
                 get_app().invalidate()
     else:
@@ -926,12 +1052,12 @@ def handle_multichat_toolbar(
     args: list[str], session: MultiChatSession, cli_history: InMemoryHistory
 ) -> None:
     """Handles toolbar configuration commands for multi-chat."""
-    if not args or args[0].lower() not in ["on", "off"]:
+    if not args or args[0].lower() not in _TOOLBAR_STATES:
         print(f"{SYSTEM_MSG}--> Usage: /toolbar [on|off]{RESET_COLOR}")
         return
 
     command = args[0].lower()
-    success, message = save_setting("toolbar_enabled", command)
+    success, message = save_setting_deferred("toolbar_enabled", command)
     print(f"{SYSTEM_MSG}--> {message}{RESET_COLOR}")
     if success:
         session.state.ui_refresh_needed = True
@@ -1026,7 +1152,7 @@ def handle_multichat_persona(
         return
 
     engine_alias, command = args[0].lower(), " ".join(args[1:])
-    engine_map = {"gpt": "openai", "gem": "gemini"}
+    engine_map = _MULTICHAT_ENGINE_ALIASES
 
     if engine_alias not in engine_map:
         print(f"{SYSTEM_MSG}--> Invalid engine alias. Use 'gpt' or 'gem'.{RESET_COLOR}")
@@ -61,6 +61,9 @@ ROTATING_LOG_FILE = LOG_DIRECTORY / "aiterm.log"
 # A "turn" consists of one user message and one assistant response.
 HISTORY_SUMMARY_THRESHOLD_TURNS = 12
 HISTORY_SUMMARY_TRIM_TURNS = 6
+# Only the most recent prompt-line entries are kept for up-arrow recall, so
+# the history copied into every new session (and saved with it) stays bounded.
+COMMAND_HISTORY_LIMIT = 1000
 
 # The size in bytes at which to warn the user about large context on first prompt.
 # 100 KB is a sensible threshold, representing a significant amount of text
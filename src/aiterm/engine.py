@@ -16,12 +16,15 @@
 
 
 import abc
+import functools
+import time
 from typing import Any
 
 import requests
 
 from .logger import log
 from .settings import settings
+from .utils.message_builder import extract_text_from_message
 
 # Configuration block for OpenAI-compatible providers
 PROVIDER_CONFIGS = {
@@ -50,6 +53,66 @@ def _is_groq_reasoning_model(model: str) -> bool:
     return any(marker in model.lower() for marker in GROQ_REASONING_MARKERS)
 
 
+# Model-id prefixes of OpenAI reasoning models, which take 'max_completion_tokens'.
+# Standard chat models and Groq models take 'max_tokens'.
+COMPLETION_TOKENS_MODEL_PREFIXES = ("o1", "o3")
+
+
+@functools.lru_cache(maxsize=64)
+def _token_limit_key(model: str) -> str:
+    """The payload key carrying the output token limit for 'model'."""
+    if model.startswith(COMPLETION_TOKENS_MODEL_PREFIXES):
+        return "max_completion_tokens"
+    return "max_tokens"
+
+
+# Fetched model lists, keyed by (engine name, API key, task) and stored as
+# (monotonic fetch time, models). Provider catalogues change on a scale of days.
+_models_cache: dict[tuple[str, str, str], tuple[float, list[str]]] = {}
+
+
+def clear_model_cache() -> None:
+    """Drops every cached model list."""
+    _models_cache.clear()
+
+
+def _cached_model_list(fetch):
+    """
+    Wraps a fetch_available_models implementation with a per-process cache
+    whose lifetime is the 'model_list_ttl' setting in seconds (0 disables it).
+    Empty results, which signal a failed fetch, are never cached.
+    """
+
+    @functools.wraps(fetch)
+    def wrapper(self: "AIEngine", task: str, refresh: bool = False) -> list[str]:
+        key = (self.name, self.api_key, task)
+        ttl = settings["model_list_ttl"]
+        cached = _models_cache.get(key)
+        if (
+            not refresh
+            and cached is not None
+            and time.monotonic() - cached[0] < ttl
+        ):
+            return list(cached[1])
+        models = fetch(self, task)
+        if models and ttl > 0:
+            _models_cache[key] = (time.monotonic(), models)
+        return list(models)
+
+    return wrapper
+
+
+def _http_get(url: str, headers: dict[str, str] | None = None) -> requests.Response:
+    """
+    Issues a GET on the connection pool shared with chat requests (HTTP/2 when
+    enabled), so model listings reuse an open connection to the provider.
+    """
+    # Local import: api_client imports this module at load time.
+    from .api_client import http_get
+
+    return http_get(url, headers=headers)
+
+
 class AIEngine(abc.ABC):
     """Abstract base class for an AI engine provider."""
 
@@ -67,6 +130,14 @@ class AIEngine(abc.ABC):
         """Get the HTTP headers required for requests to this engine."""
         pass
 
+    @functools.cached_property
+    def headers(self) -> dict[str, str]:
+        """
+        The engine's HTTP headers, built once per instance since the API key
+        never changes after construction. Shared across requests; do not mutate.
+        """
+        return self.get_headers()
+
     @abc.abstractmethod
     def get_chat_url(self, model: str, stream: bool) -> str:
         """Get the API endpoint URL for chat completions."""
@@ -90,8 +161,11 @@ class AIEngine(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def fetch_available_models(self, task: str) -> list[str]:
-        """Fetch a list of available models for a given task."""
+    def fetch_available_models(self, task: str, refresh: bool = False) -> list[str]:
+        """
+        Fetch a list of available models for a given task. Implementations
+        are wrapped with _cached_model_list; 'refresh' bypasses the cache.
+        """
         pass
 
 
@@ -126,9 +200,12 @@ class OpenAICompatibleEngine(AIEngine):
         stream: bool,
         model: str,
     ) -> dict[str, Any]:
-        all_messages = messages.copy()
+        # The history is only copied when a system message must be prepended;
+        # the payload is serialized, never mutated, so sharing the list is safe.
         if system_prompt:
-            all_messages.insert(0, {"role": "system", "content": system_prompt})
+            all_messages = [{"role": "system", "content": system_prompt}, *messages]
+        else:
+            all_messages = messages
 
         payload = {"model": model, "messages": all_messages, "stream": stream}
 
@@ -142,30 +219,21 @@ class OpenAICompatibleEngine(AIEngine):
             payload["reasoning_format"] = "parsed"
 
         if max_tokens:
-            # Newer OpenAI reasoning models use 'max_completion_tokens'.
-            # Standard chat models and Groq defaults to 'max_tokens'.
-            if model.startswith("o1") or model.startswith("o3"):
-                payload["max_completion_tokens"] = max_tokens
-            else:
-                payload["max_tokens"] = max_tokens
+            payload[_token_limit_key(model)] = max_tokens
         return payload
 
     def parse_chat_response(self, response_data: dict[str, Any]) -> str:
-        # Local import to break circular dependency: engine -> utils -> engine
-        from .utils.message_builder import extract_text_from_message
-
         if "choices" in response_data and response_data["choices"]:
             message = response_data["choices"][0].get("message")
             if message:
                 return extract_text_from_message(message)
         return ""
 
+    @_cached_model_list
     def fetch_available_models(self, task: str) -> list[str]:
         try:
             url = f"{self.config['base_url']}/models"
-            response = requests.get(
-                url, headers=self.get_headers(), timeout=settings["api_timeout"]
-            )
+            response = _http_get(url, headers=self.headers)
             response.raise_for_status()
             model_list = response.json().get("data", [])
             model_ids = [m["id"] for m in model_list]
@@ -193,6 +261,11 @@ class OpenAICompatibleEngine(AIEngine):
 class GeminiEngine(AIEngine):
     """AI Engine implementation for Google Gemini."""
 
+    def __init__(self, api_key: str):
+        super().__init__(api_key)
+        # Chat URLs embed the API key; built once per (model, stream) pair.
+        self._chat_urls: dict[tuple[str, bool], str] = {}
+
     @property
     def name(self) -> str:
         return "gemini"
@@ -201,9 +274,14 @@ class GeminiEngine(AIEngine):
         return {"Content-Type": "application/json"}
 
     def get_chat_url(self, model: str, stream: bool) -> str:
-        if stream:
-            return f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?key={self.api_key}&alt=sse"
-        return f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={self.api_key}"
+        url = self._chat_urls.get((model, stream))
+        if url is None:
+            if stream:
+                url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?key={self.api_key}&alt=sse"
+            else:
+                url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={self.api_key}"
+            self._chat_urls[(model, stream)] = url
+        return url
 
     def build_chat_payload(
         self,
@@ -222,6 +300,11 @@ class GeminiEngine(AIEngine):
 
     def parse_chat_response(self, response_data: dict[str, Any]) -> str:
         """Safely extracts text from a Gemini API response."""
+        try:
+            # Fast path: nearly every response (and stream chunk) carries text.
+            return response_data["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            pass
         try:
             # Check for content and parts before accessing them
             candidate = response_data.get("candidates", [{}])[0]
@@ -250,10 +333,11 @@ class GeminiEngine(AIEngine):
             )
             return ""
 
+    @_cached_model_list
     def fetch_available_models(self, task: str) -> list[str]:
         try:
             url = f"https://generativelanguage.googleapis.com/v1beta/models?key={self.api_key}"
-            response = requests.get(url, timeout=settings["api_timeout"])
+            response = _http_get(url)
             response.raise_for_status()
             model_list = response.json().get("models", [])
             return sorted(
@@ -311,15 +395,14 @@ class AnthropicEngine(AIEngine):
                 return block.get("text", "")
         return ""
 
+    @_cached_model_list
     def fetch_available_models(self, task: str) -> list[str]:
         # Anthropic doesn't have an endpoint for image generation models
         if task != "chat":
             return []
         try:
             url = "https://api.anthropic.com/v1/models"
-            response = requests.get(
-                url, headers=self.get_headers(), timeout=settings["api_timeout"]
-            )
+            response = _http_get(url, headers=self.headers)
             response.raise_for_status()
             model_list = response.json().get("data", [])
             return sorted([m["id"] for m in model_list if "id" in m])
@@ -328,8 +411,23 @@ class AnthropicEngine(AIEngine):
         return []
 
 
+_engines: dict[tuple[str, str], AIEngine] = {}
+
+
 def get_engine(engine_name: str, api_key: str) -> AIEngine:
-    """Factory function to get an engine instance by name."""
+    """
+    Returns the engine instance for a name and API key. Engines hold no
+    per-session state, so one instance is shared by every caller.
+    """
+    key = (engine_name, api_key)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = _engines[key] = _new_engine(engine_name, api_key)
+    return engine
+
+
+def _new_engine(engine_name: str, api_key: str) -> AIEngine:
+    """Factory function to build an engine instance by name."""
     if engine_name in PROVIDER_CONFIGS:
         return OpenAICompatibleEngine(engine_name, api_key)
     if engine_name == "gemini":
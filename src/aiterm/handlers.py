@@ -18,6 +18,7 @@
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from . import api_client, config, workflows
@@ -25,9 +26,10 @@ from . import personas as persona_manager
 from .chat_ui import MultiChatUI, SingleChatUI
 from .commands import handle_load
 from .engine import get_engine
-from .managers.context_manager import ContextManager
+from .managers.context_manager import Attachment, ContextManager
 from .managers.multichat_manager import MultiChatSession
 from .managers.session_manager import SessionManager
+from .personas import Persona
 from .session_state import MultiChatSessionState, SessionState
 from .settings import settings
 from .utils.config_loader import resolve_config_precedence
@@ -36,6 +38,18 @@ from .utils.formatters import RESET_COLOR, SYSTEM_MSG, format_bytes
 from .utils.ui_helpers import select_model
 
 
+def _persona_owned_paths(
+    attachments: dict[Path, Attachment], persona: Persona | None
+) -> set[Path]:
+    """
+    Returns the attached paths that were listed directly by 'persona'. Looks up
+    each persona entry rather than stringifying every attachment.
+    """
+    if not persona or not persona.attachments:
+        return set()
+    return {path for path in map(Path, persona.attachments) if path in attachments}
+
+
 def handle_chat(initial_prompt: str | None, args: argparse.Namespace) -> None:
     """Handles both single-shot and interactive chat sessions."""
     # --- Phase 4: Centralized Session Setup ---
@@ -43,19 +57,21 @@ def handle_chat(initial_prompt: str | None, args: argparse.Namespace) -> None:
     config_params = resolve_config_precedence(args)
     p = config_params  # Alias for brevity
 
-    # 2. Prepare engine and context
-    api_key = api_client.check_api_keys(p["engine_name"])
-    engine_instance = get_engine(p["engine_name"], api_key)
-
-    persona_attachment_path_strs = set(p["persona"].attachments if p["persona"] else [])
+    # 2. Prepare engine and context. Reading the attachments is independent of
+    # the key check (which may parse .env), so the two run concurrently.
     all_files_to_process = list(p["files_arg"] or [])
     all_files_to_process.extend(p["persona"].attachments if p["persona"] else [])
 
-    context_manager = ContextManager(
-        files_arg=all_files_to_process,
-        memory_enabled=p["memory_enabled"],
-        exclude_arg=p["exclude_arg"],
-    )
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        context_future = executor.submit(
+            ContextManager,
+            files_arg=all_files_to_process,
+            memory_enabled=p["memory_enabled"],
+            exclude_arg=p["exclude_arg"],
+        )
+        api_key = api_client.check_api_keys(p["engine_name"])
+        context_manager = context_future.result()
+    engine_instance = get_engine(p["engine_name"], api_key)
 
     # 3. Assemble the system prompt
     initial_system_prompt = None
@@ -67,11 +83,9 @@ def handle_chat(initial_prompt: str | None, args: argparse.Namespace) -> None:
     # The memory content is now handled by the SessionManager, not pre-baked here.
     final_system_prompt = initial_system_prompt
 
-    persona_attachments_set = {
-        path
-        for path in context_manager.attachments
-        if str(path) in persona_attachment_path_strs
-    }
+    persona_attachments_set = _persona_owned_paths(
+        context_manager.attachments, p["persona"]
+    )
 
     # 4. Create the complete SessionState object
     state = SessionState(
@@ -96,8 +110,7 @@ def handle_chat(initial_prompt: str | None, args: argparse.Namespace) -> None:
 
     # Check for large context size and warn the user.
     total_attachment_bytes = sum(
-        len(attachment.content.encode("utf-8"))
-        for attachment in session.state.attachments.values()
+        attachment.byte_size for attachment in session.state.attachments.values()
     )
 
     if total_attachment_bytes > config.LARGE_ATTACHMENT_THRESHOLD_BYTES:
@@ -200,16 +213,8 @@ def handle_multichat_session(
     )
 
     # Determine which attachments belong to which persona for later management
-    gpt_persona_files = set(
-        p
-        for p in context_manager.attachments
-        if persona_gpt and str(p) in persona_gpt.attachments
-    )
-    gem_persona_files = set(
-        p
-        for p in context_manager.attachments
-        if persona_gem and str(p) in persona_gem.attachments
-    )
+    gpt_persona_files = _persona_owned_paths(context_manager.attachments, persona_gpt)
+    gem_persona_files = _persona_owned_paths(context_manager.attachments, persona_gem)
 
     # Determine models, respecting persona overrides (by engine slot)
     openai_model = args.model
@@ -15,15 +15,64 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
+import atexit
+import errno
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from . import config
 
 
+def _skip_unused_record_fields() -> None:
+    """
+    Stops LogRecord from collecting attributes the format string never uses.
+    Clearing _srcfile skips the per-record stack walk for the caller's file
+    and line number, as recommended in the logging HOWTO's optimization notes.
+    """
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    A RotatingFileHandler that opens its file on the first record rather than
+    at import, so invocations that never log skip the open entirely. An
+    unwritable log directory still raises OSError here, so setup_logger() can
+    fall back to the console. If the file itself cannot be opened later, the
+    error is reported once and the handler is silenced instead of printing a
+    traceback for every record.
+    """
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+        log_dir = os.path.dirname(self.baseFilename)
+        if not os.access(log_dir, os.W_OK | os.X_OK):
+            raise PermissionError(
+                errno.EACCES, "Log directory is not writable", log_dir
+            )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            try:
+                self.stream = self._open()
+            except OSError as e:
+                print(
+                    f"CRITICAL: Could not create log file {self.baseFilename}: {e}",
+                    file=sys.stderr,
+                )
+                self.setLevel(logging.CRITICAL + 1)
+                return
+        super().emit(record)
+
+
 def setup_logger():
     """Configures and returns a project-wide logger."""
+    _skip_unused_record_fields()
     logger = logging.getLogger("aiterm")
     logger.setLevel(logging.INFO)
     logger.propagate = True
@@ -42,7 +91,7 @@ def setup_logger():
     try:
         # Rotating file handler for persistent logs
         # Rotates when the log reaches 1MB, keeping up to 5 backup logs.
-        file_handler = RotatingFileHandler(
+        file_handler = _LazyRotatingFileHandler(
             config.ROTATING_LOG_FILE,
             maxBytes=1024 * 1024,
             backupCount=5,
@@ -63,7 +112,15 @@ def setup_logger():
 
     if not logger.handlers:
         logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        # File writes and rotation checks happen on a listener thread, so
+        # logging from the request or streaming path only enqueues a record.
+        queue_handler = QueueHandler(queue.SimpleQueue())
+        listener = QueueListener(
+            queue_handler.queue, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(queue_handler)
 
     return logger
 
@@ -24,16 +24,20 @@ import mimetypes
 import os
 import tarfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
 from .. import config
 from ..logger import log
+from ..utils.atomic_file import write_atomic
 from ..utils.file_processor import (
+    SUPPORTED_ARCHIVE_EXTENSIONS,
+    SUPPORTED_EXTENSIONLESS_FILENAMES,
     SUPPORTED_IMAGE_MIMETYPES,
-    is_supported_archive_file,
-    is_supported_image_file,
+    SUPPORTED_TEXT_EXTENSIONS,
     is_supported_text_file,
 )
 from ..utils.formatters import RESET_COLOR, SYSTEM_MSG, format_bytes
@@ -45,6 +49,297 @@ class Attachment:
 
     content: str
     mtime: float
+    # Size on disk when the content was read; None for attachments saved
+    # before sizes were recorded.
+    size: int | None = None
+
+    @property
+    def byte_size(self) -> int:
+        """
+        The UTF-8 encoded size of the content. ASCII text, the common case,
+        is measured without encoding since its byte and character counts match.
+        """
+        content = self.content
+        return len(content) if content.isascii() else len(content.encode("utf-8"))
+
+
+class AttachmentMap(dict):
+    """
+    A Path -> Attachment mapping that also indexes its keys by file name, so
+    commands addressing an attachment by basename avoid a scan of every path.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self._by_name: dict[str, list[Path]] = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, path: Path, attachment: Attachment) -> None:
+        if path not in self:
+            self._by_name.setdefault(path.name, []).append(path)
+        super().__setitem__(path, attachment)
+
+    def __delitem__(self, path: Path) -> None:
+        super().__delitem__(path)
+        self._unindex(path)
+
+    def _unindex(self, path: Path) -> None:
+        paths = self._by_name[path.name]
+        paths.remove(path)
+        if not paths:
+            del self._by_name[path.name]
+
+    def pop(self, path: Path, *default: Any) -> Any:
+        if path in self:
+            self._unindex(path)
+        return super().pop(path, *default)
+
+    def popitem(self) -> tuple[Path, Attachment]:
+        path, attachment = super().popitem()
+        self._unindex(path)
+        return path, attachment
+
+    def setdefault(self, path: Path, default: Any = None) -> Any:
+        if path not in self:
+            self[path] = default
+        return self[path]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        incoming = dict(*args, **kwargs)
+        by_name = self._by_name
+        for path in incoming:
+            if path not in self:
+                by_name.setdefault(path.name, []).append(path)
+        # Bulk-insert at C level rather than via __setitem__ per item.
+        super().update(incoming)
+
+    def __ior__(self, other: Any) -> "AttachmentMap":
+        self.update(other)
+        return self
+
+    def __or__(self, other: Any) -> "AttachmentMap":
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_name.clear()
+
+    def copy(self) -> "AttachmentMap":
+        return AttachmentMap(self)
+
+    def __reduce__(self) -> tuple:
+        # Rebuild from the items alone; the default dict-subclass protocol
+        # would restore the index and then re-add every key to it.
+        return (AttachmentMap, (dict(self),))
+
+    def paths_named(self, name: str) -> list[Path]:
+        """Returns the attached paths whose file name is 'name', in attach order."""
+        return list(self._by_name.get(name, ()))
+
+
+def paths_named(attachments: dict[Path, Attachment], name: str) -> list[Path]:
+    """Looks up attachments by file name, using the index when one is kept."""
+    if isinstance(attachments, AttachmentMap):
+        return attachments.paths_named(name)
+    return [p for p in attachments if p.name == name]
+
+
+# Refreshes touching more files than this re-read them on a thread pool.
+REFRESH_PARALLEL_THRESHOLD = 8
+REFRESH_MAX_WORKERS = 8
+
+
+def _reread_if_modified(
+    path: Path, known_mtime: float
+) -> tuple[str, float, int] | OSError | None:
+    """
+    Re-reads 'path' if it changed since 'known_mtime'. Returns the new
+    (content, mtime, size), None if unchanged, or the OSError raised while
+    reading.
+    """
+    try:
+        st = path.stat()
+        if st.st_mtime > known_mtime:
+            content = path.read_text(encoding="utf-8", errors="ignore")
+            return content, st.st_mtime, st.st_size
+        return None
+    except OSError as e:
+        return e
+
+
+# Initial loads of more files than this read them on a thread pool.
+LOAD_PARALLEL_THRESHOLD = 8
+LOAD_MAX_WORKERS = 8
+
+
+def _read_text_file(filepath: Path) -> Attachment | None:
+    try:
+        st = filepath.stat()
+        content = filepath.read_text(encoding="utf-8", errors="ignore")
+        return Attachment(content=content, mtime=st.st_mtime, size=st.st_size)
+    except OSError as e:
+        log.warning("Could not read file %s: %s", filepath, e)
+        return None
+
+
+def _read_image_file(filepath: Path) -> dict[str, Any] | None:
+    # Check the type first so unsupported images are never read.
+    mimetype, _ = mimetypes.guess_type(filepath)
+    if mimetype not in SUPPORTED_IMAGE_MIMETYPES:
+        return None
+    try:
+        with open(filepath, "rb") as image_file:
+            encoded_string = base64.b64encode(image_file.read()).decode("ascii")
+        return {"type": "image", "data": encoded_string, "mime_type": mimetype}
+    except OSError as e:
+        log.warning("Could not read image file %s: %s", filepath, e)
+        return None
+
+
+def _read_zip_file(zip_path: Path, excluded_names: set[str]) -> Attachment | None:
+    try:
+        with zipfile.ZipFile(zip_path, "r") as z:
+            zip_content_parts = []
+            for info in z.infolist():
+                if info.is_dir():
+                    continue
+                filename = info.filename
+                entry_path = Path(filename)
+                if entry_path.name in excluded_names:
+                    continue
+                if is_supported_text_file(entry_path):
+                    # Opening by ZipInfo skips the per-entry name lookup.
+                    content = z.read(info).decode("utf-8", errors="ignore")
+                    zip_content_parts.append(
+                        f"--- FILE (from {zip_path.name}): {filename} ---\n{content}"
+                    )
+            if zip_content_parts:
+                st = zip_path.stat()
+                return Attachment(
+                    content="\n\n".join(zip_content_parts),
+                    mtime=st.st_mtime,
+                    size=st.st_size,
+                )
+    except (OSError, RuntimeError, zipfile.BadZipFile) as e:
+        # RuntimeError covers encrypted entries and unsupported compression.
+        log.warning("Could not process zip file %s: %s", zip_path, e)
+    return None
+
+
+def _read_tar_file(tar_path: Path, excluded_names: set[str]) -> Attachment | None:
+    try:
+        # Stream mode reads members in archive order without building the
+        # full member index up front; extractfile() serves the current one.
+        with tarfile.open(tar_path, "r|*") as t:
+            tar_content_parts = []
+            for member in t:
+                if not member.isfile() or Path(member.name).name in excluded_names:
+                    continue
+                if is_supported_text_file(Path(member.name)):
+                    file_obj = t.extractfile(member)
+                    if file_obj:
+                        content = file_obj.read().decode("utf-8", errors="ignore")
+                        tar_content_parts.append(
+                            f"--- FILE (from {tar_path.name}): {member.name} ---\n{content}"
+                        )
+            if tar_content_parts:
+                st = tar_path.stat()
+                return Attachment(
+                    content="\n\n".join(tar_content_parts),
+                    mtime=st.st_mtime,
+                    size=st.st_size,
+                )
+    except (OSError, tarfile.TarError) as e:
+        log.warning("Could not process tar file %s: %s", tar_path, e)
+    return None
+
+
+# Source kind by lowercased file extension, so a file is classified with one
+# dict lookup instead of a predicate call per kind.
+_SOURCE_KINDS: dict[str, str] = {
+    **{ext: "text" for ext in SUPPORTED_TEXT_EXTENSIONS},
+    **{
+        ext: "image"
+        for mimetype in SUPPORTED_IMAGE_MIMETYPES
+        for ext in mimetypes.guess_all_extensions(mimetype)
+    },
+    **{ext: "tar" for ext in SUPPORTED_ARCHIVE_EXTENSIONS},
+    ".zip": "zip",
+}
+
+
+def _source_kind(path: Path) -> str | None:
+    """Classifies a file as 'text', 'image', 'zip' or 'tar'; None if unsupported."""
+    suffix = path.suffix
+    if suffix:
+        return _SOURCE_KINDS.get(suffix.lower())
+    if path.name.lower() in SUPPORTED_EXTENSIONLESS_FILENAMES:
+        return "text"
+    return None
+
+
+def _read_source(
+    path: Path, excluded_names: set[str]
+) -> Attachment | dict[str, Any] | None:
+    """
+    Reads one attachable file. Text files and archives yield an Attachment,
+    images an image-data dict, and unsupported or unreadable files None.
+    Safe to call from worker threads: it touches no shared state.
+    """
+    kind = _source_kind(path)
+    if kind == "text":
+        return _read_text_file(path)
+    if kind == "image":
+        return _read_image_file(path)
+    if kind == "zip":
+        return _read_zip_file(path, excluded_names)
+    if kind == "tar":
+        return _read_tar_file(path, excluded_names)
+    return None
+
+
+def _read_sources(
+    sources: list[Path], excluded_names: set[str]
+) -> list[Attachment | dict[str, Any] | None]:
+    """
+    Reads each source with _read_source, returning results in source order.
+    Batches above LOAD_PARALLEL_THRESHOLD are read on a thread pool.
+    """
+    if len(sources) > LOAD_PARALLEL_THRESHOLD:
+        # File reads, decompression and base64 release the GIL.
+        with ThreadPoolExecutor(max_workers=LOAD_MAX_WORKERS) as pool:
+            return list(pool.map(_read_source, sources, repeat(excluded_names)))
+    return [_read_source(path, excluded_names) for path in sources]
+
+
+def _walk_directory(dir_path: Path, exclusion_paths: set[Path]) -> list[Path]:
+    """
+    Lists the supported files under 'dir_path' in walk order, minus excluded
+    paths, so unsupported files never reach the readers.
+    """
+    # The walk compares normalized path strings, so excluded subtrees are
+    # pruned without building a Path for every directory entry.
+    excluded = {os.path.normpath(p) for p in exclusion_paths}
+    files_found = []
+    for root, dirs, files in os.walk(dir_path, topdown=True):
+        if excluded:
+            dirs[:] = [
+                d
+                for d in dirs
+                if os.path.normpath(os.path.join(root, d)) not in excluded
+            ]
+        for name in files:
+            file_name = os.path.join(root, name)
+            if excluded and os.path.normpath(file_name) in excluded:
+                continue
+            file_path = Path(file_name)
+            if _source_kind(file_path) is not None:
+                files_found.append(file_path)
+    return files_found
 
 
 class ContextManager:
@@ -57,7 +352,7 @@ class ContextManager:
         exclude_arg: list[str] | None,
     ):
         self.memory_content: str | None = None
-        self.attachments: dict[Path, Attachment] = {}
+        self.attachments: dict[Path, Attachment] = AttachmentMap()
         self.image_data: list[dict[str, Any]] = []
 
         self._process_files(files_arg, memory_enabled, exclude_arg)
@@ -74,7 +369,9 @@ class ContextManager:
     def _write_memory_file(self, content: str) -> None:
         """Writes content to the persistent memory file."""
         try:
-            config.PERSISTENT_MEMORY_FILE.write_text(content.strip(), encoding="utf-8")
+            write_atomic(
+                config.PERSISTENT_MEMORY_FILE, content.strip().encode("utf-8")
+            )
         except OSError as e:
             log.error("Failed to write to persistent memory file: %s", e)
 
@@ -96,23 +393,16 @@ class ContextManager:
 
         exclusion_paths = {Path(p).expanduser() for p in exclusions}
 
+        sources: list[Path] = []
         for p_str in paths:
             try:
                 path_obj = Path(p_str).expanduser()
                 if path_obj in exclusion_paths or not path_obj.exists():
                     continue
                 if path_obj.is_file():
-                    if is_supported_archive_file(path_obj):
-                        if path_obj.suffix.lower() == ".zip":
-                            self._process_zip_file(path_obj, exclusion_paths)
-                        else:
-                            self._process_tar_file(path_obj, exclusion_paths)
-                    elif is_supported_text_file(path_obj):
-                        self._process_text_file(path_obj)
-                    elif is_supported_image_file(path_obj):
-                        self._process_image_file(path_obj)
+                    sources.append(path_obj)
                 elif path_obj.is_dir():
-                    self._process_directory(path_obj, exclusion_paths)
+                    sources.extend(_walk_directory(path_obj, exclusion_paths))
             except PermissionError:
                 log.warning("Permission denied for initial path argument: %s", p_str)
                 print(
@@ -124,94 +414,20 @@ class ContextManager:
                     f"{SYSTEM_MSG}--> Error processing path '{p_str}'. Skipping.{RESET_COLOR}"
                 )
 
-    def _process_text_file(self, filepath: Path) -> None:
-        try:
-            content = filepath.read_text(encoding="utf-8", errors="ignore")
-            mtime = filepath.stat().st_mtime
-            self.attachments[filepath] = Attachment(content=content, mtime=mtime)
-        except OSError as e:
-            log.warning("Could not read file %s: %s", filepath, e)
-
-    def _process_image_file(self, filepath: Path) -> None:
-        try:
-            with open(filepath, "rb") as image_file:
-                encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-                mimetype, _ = mimetypes.guess_type(filepath)
-                if mimetype in SUPPORTED_IMAGE_MIMETYPES:
-                    self.image_data.append(
-                        {"type": "image", "data": encoded_string, "mime_type": mimetype}
-                    )
-        except OSError as e:
-            log.warning("Could not read image file %s: %s", filepath, e)
-
-    def _process_zip_file(self, zip_path: Path, exclusion_paths: set[Path]) -> None:
-        try:
-            with zipfile.ZipFile(zip_path, "r") as z:
-                zip_content_parts = []
-                for filename in z.namelist():
-                    if filename.endswith("/") or Path(filename).name in {
-                        p.name for p in exclusion_paths
-                    }:
-                        continue
-                    if is_supported_text_file(Path(filename)):
-                        with z.open(filename) as f:
-                            content = f.read().decode("utf-8", errors="ignore")
-                            zip_content_parts.append(
-                                f"--- FILE (from {zip_path.name}): {filename} ---\n{content}"
-                            )
-                if zip_content_parts:
-                    content = "\n\n".join(zip_content_parts)
-                    mtime = zip_path.stat().st_mtime
-                    self.attachments[zip_path] = Attachment(
-                        content=content, mtime=mtime
-                    )
-        except (OSError, zipfile.BadZipFile) as e:
-            log.warning("Could not process zip file %s: %s", zip_path, e)
-
-    def _process_tar_file(self, tar_path: Path, exclusion_paths: set[Path]) -> None:
-        try:
-            with tarfile.open(tar_path, "r:*") as t:
-                tar_content_parts = []
-                for member in t.getmembers():
-                    if not member.isfile() or Path(member.name).name in {
-                        p.name for p in exclusion_paths
-                    }:
-                        continue
-                    if is_supported_text_file(Path(member.name)):
-                        file_obj = t.extractfile(member)
-                        if file_obj:
-                            content = file_obj.read().decode("utf-8", errors="ignore")
-                            tar_content_parts.append(
-                                f"--- FILE (from {tar_path.name}): {member.name} ---\n{content}"
-                            )
-                if tar_content_parts:
-                    content = "\n\n".join(tar_content_parts)
-                    mtime = tar_path.stat().st_mtime
-                    self.attachments[tar_path] = Attachment(
-                        content=content, mtime=mtime
-                    )
-        except (OSError, tarfile.TarError) as e:
-            log.warning("Could not process tar file %s: %s", tar_path, e)
+        self._load_sources(sources, {p.name for p in exclusion_paths})
 
-    def _process_directory(self, dir_path: Path, exclusion_paths: set[Path]) -> None:
-        for root, dirs, files in os.walk(dir_path, topdown=True):
-            root_path = Path(root).expanduser()
-            dirs[:] = [
-                d for d in dirs if (root_path / d).expanduser() not in exclusion_paths
-            ]
-            for name in files:
-                file_path = (root_path / name).expanduser()
-                if file_path in exclusion_paths:
-                    continue
-                if is_supported_text_file(file_path):
-                    self._process_text_file(file_path)
-                elif is_supported_image_file(file_path):
-                    self._process_image_file(file_path)
-                elif is_supported_archive_file(file_path):
-                    if file_path.suffix.lower() == ".zip":
-                        self._process_zip_file(file_path, exclusion_paths)
-                    else:
-                        self._process_tar_file(file_path, exclusion_paths)
+    def _load_sources(self, sources: list[Path], excluded_names: set[str]) -> None:
+        """
+        Reads every source file and stores the results in walk order. Merging
+        stays on this thread even when the reads run on a pool.
+        """
+        for path, result in zip(
+            sources, _read_sources(sources, excluded_names), strict=True
+        ):
+            if isinstance(result, Attachment):
+                self.attachments[path] = result
+            elif result is not None:
+                self.image_data.append(result)
 
     def refresh_files(self, search_term: str | None) -> list[str]:
         if not self.attachments:
@@ -225,26 +441,34 @@ class ContextManager:
             print(f"{SYSTEM_MSG}--> No files matching '{search_term}'.{RESET_COLOR}")
             return []
 
+        known_mtimes = [self.attachments[p].mtime for p in paths_to_refresh]
+        if len(paths_to_refresh) > REFRESH_PARALLEL_THRESHOLD:
+            # File reads release the GIL, so threads overlap the disk latency.
+            with ThreadPoolExecutor(max_workers=REFRESH_MAX_WORKERS) as pool:
+                results = list(
+                    pool.map(_reread_if_modified, paths_to_refresh, known_mtimes)
+                )
+        else:
+            results = list(map(_reread_if_modified, paths_to_refresh, known_mtimes))
+
         updated, removed = [], []
-        for path in paths_to_refresh:
-            try:
-                current_mtime = path.stat().st_mtime
-                if current_mtime > self.attachments[path].mtime:
-                    self.attachments[path].content = path.read_text(
-                        encoding="utf-8", errors="ignore"
-                    )
-                    self.attachments[path].mtime = current_mtime
-                    updated.append(path.name)
-            except FileNotFoundError:
+        for path, outcome in zip(paths_to_refresh, results, strict=True):
+            if outcome is None:
+                continue
+            if isinstance(outcome, FileNotFoundError):
                 removed.append(path.name)
                 del self.attachments[path]
-            except PermissionError:
+            elif isinstance(outcome, PermissionError):
                 log.warning("Permission denied while refreshing %s.", path)
                 print(
                     f"{SYSTEM_MSG}--> Permission denied on '{path.name}'. Could not refresh.{RESET_COLOR}"
                 )
-            except OSError as e:
-                log.warning("Could not refresh file %s: %s", path, e)
+            elif isinstance(outcome, OSError):
+                log.warning("Could not refresh file %s: %s", path, outcome)
+            else:
+                attachment = self.attachments[path]
+                attachment.content, attachment.mtime, attachment.size = outcome
+                updated.append(path.name)
 
         if updated:
             print(f"{SYSTEM_MSG}--> Refreshed: {', '.join(updated)}{RESET_COLOR}")
@@ -285,9 +509,10 @@ class ContextManager:
             current_level = file_tree
             for part in relative_parts[:-1]:
                 current_level = current_level.setdefault(part, {})
-            current_level[relative_parts[-1]] = (
-                path.stat().st_size if path.exists() else 0
-            )
+            size = self.attachments[path].size
+            if size is None:
+                size = path.stat().st_size if path.exists() else 0
+            current_level[relative_parts[-1]] = size
 
         def _print_tree(subtree: dict, prefix: str = ""):
             items = sorted(subtree.items())
@@ -319,12 +544,21 @@ class ContextManager:
                 )
                 return
 
-            # Use a temporary instance to process just the new path
-            temp_context = ContextManager(
-                files_arg=[str(path)], memory_enabled=False, exclude_arg=[]
-            )
-            if temp_context.attachments:
-                self.attachments.update(temp_context.attachments)
+            if path.is_dir():
+                sources = _walk_directory(path, set())
+            else:
+                sources = [path] if path.is_file() else []
+            # /attach only adds text; images are skipped rather than encoded.
+            sources = [p for p in sources if _source_kind(p) not in (None, "image")]
+            new_attachments = {
+                p: result
+                for p, result in zip(
+                    sources, _read_sources(sources, set()), strict=True
+                )
+                if result is not None
+            }
+            if new_attachments:
+                self.attachments.update(new_attachments)
                 print(
                     f"{SYSTEM_MSG}--> Attached content from: {path.name}{RESET_COLOR}"
                 )
@@ -356,7 +590,7 @@ class ContextManager:
         except (OSError, RuntimeError):
             # Fallback for simple filenames that aren't valid paths on their own.
             # We will match by name only in this case.
-            paths_to_remove = [p for p in self.attachments if p.name == path_str]
+            paths_to_remove = paths_named(self.attachments, path_str)
             if not paths_to_remove:
                 return []
         else:
@@ -369,7 +603,7 @@ class ContextManager:
 
         if not paths_to_remove:
             # Final fallback if path resolution worked but found no matches (e.g., empty dir)
-            paths_to_remove = [p for p in self.attachments if p.name == path_str]
+            paths_to_remove = paths_named(self.attachments, path_str)
             if not paths_to_remove:
                 return []
 
@@ -22,9 +22,7 @@ for an interactive multi-chat session.
 
 from __future__ import annotations
 
-import json
-import queue
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -34,12 +32,14 @@ from .. import settings as app_settings
 from ..logger import log
 from ..prompts import CONTINUATION_PROMPT
 from ..session_state import MultiChatSessionState
+from ..utils import fast_json
 from ..utils.formatters import (
     ASSISTANT_PROMPT,
     RESET_COLOR,
     SYSTEM_MSG,
     clean_ai_response_text,
 )
+from ..utils.log_writer import chat_log_writer
 from ..utils.message_builder import (
     construct_assistant_message,
     construct_user_message,
@@ -50,6 +50,12 @@ if TYPE_CHECKING:
     from ..engine import AIEngine
     from .context_manager import ContextManager
 
+# The secondary engine's request runs on one long-lived worker while the
+# primary streams, instead of starting a new thread every broadcast turn.
+_SECONDARY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="aiterm-multichat"
+)
+
 
 class MultiChatSession:
     """Manages the state and logic for an interactive multi-chat session."""
@@ -76,6 +82,9 @@ class MultiChatSession:
             "gem": "gemini",
             "gemini": "gemini",
         }
+        # Per engine: (number of history messages translated, the last of
+        # them, their translation). See _translated_history.
+        self._translation_cache: dict[str, tuple[int, dict | None, list]] = {}
 
     def _assemble_full_system_prompt(self, engine_name: str) -> str | None:
         """Constructs the complete system prompt for a given engine."""
@@ -110,14 +119,36 @@ class MultiChatSession:
 
         return "\n\n---\n\n".join(prompt_parts) if prompt_parts else None
 
+    def _translated_history(self, engine_name: str, user_msg: dict) -> list:
+        """
+        Returns the shared history plus 'user_msg' in 'engine_name''s format.
+        Each message translates independently, so the translated history is
+        kept per engine and only messages appended since the previous turn are
+        translated. It is rebuilt when the history was rewritten (cleared,
+        forgotten or loaded), which the last translated message detects.
+        """
+        history = self.state.shared_history
+        count, last_msg, translated = self._translation_cache.get(
+            engine_name, (0, None, [])
+        )
+        if count > len(history) or (count and history[count - 1] is not last_msg):
+            count, translated = 0, []
+        if count < len(history):
+            translated.extend(translate_history(history[count:], engine_name))
+        self._translation_cache[engine_name] = (
+            len(history),
+            history[-1] if history else None,
+            translated,
+        )
+        return translated + translate_history((user_msg,), engine_name)
+
     def _secondary_worker(
         self,
         engine: AIEngine,
         model: str,
         history: list,
         system_prompt: str | None,
-        result_queue: queue.Queue,
-    ):
+    ) -> dict:
         srl_list = self.state.session_raw_logs if self.state.debug_active else None
         try:
             text, tokens = api_client.perform_chat_request(
@@ -131,14 +162,10 @@ class MultiChatSession:
                 session_raw_logs=srl_list,
             )
             cleaned = clean_ai_response_text(engine.name, text)
-            result_queue.put(
-                {"engine_name": engine.name, "text": cleaned, "tokens": tokens}
-            )
+            return {"engine_name": engine.name, "text": cleaned, "tokens": tokens}
         except Exception as e:
             log.error("Secondary worker failed: %s", e)
-            result_queue.put(
-                {"engine_name": engine.name, "text": f"Error: {e}", "tokens": {}}
-            )
+            return {"engine_name": engine.name, "text": f"Error: {e}", "tokens": {}}
 
     def process_turn(
         self, prompt_text: str, log_filepath: Path, is_first_turn: bool = False
@@ -158,9 +185,7 @@ class MultiChatSession:
                 user_msg_text,
                 self.state.attached_images if is_first_turn else [],
             )
-            current_history = translate_history(
-                self.state.shared_history + [user_msg], target_engine_name
-            )
+            current_history = self._translated_history(target_engine_name, user_msg)
             engine, model = (
                 self.engines[target_engine_name],
                 self.models[target_engine_name],
@@ -200,25 +225,18 @@ class MultiChatSession:
                 user_msg_text,
                 self.state.attached_images if is_first_turn else [],
             )
-            result_queue = queue.Queue()
-            history_primary = translate_history(
-                self.state.shared_history + [user_msg], primary_engine.name
-            )
-            history_secondary = translate_history(
-                self.state.shared_history + [user_msg], secondary_engine.name
+            history_primary = self._translated_history(primary_engine.name, user_msg)
+            history_secondary = self._translated_history(
+                secondary_engine.name, user_msg
             )
 
-            thread = threading.Thread(
-                target=self._secondary_worker,
-                args=(
-                    secondary_engine,
-                    self.models[secondary_engine.name],
-                    history_secondary,
-                    self._assemble_full_system_prompt(secondary_engine_name),
-                    result_queue,
-                ),
+            secondary_future = _SECONDARY_EXECUTOR.submit(
+                self._secondary_worker,
+                secondary_engine,
+                self.models[secondary_engine.name],
+                history_secondary,
+                self._assemble_full_system_prompt(secondary_engine_name),
             )
-            thread.start()
 
             print(f"\n{ASSISTANT_PROMPT}[{'OpenAI' if primary_engine.name == 'openai' else primary_engine.name.capitalize()}]: {RESET_COLOR}", end="", flush=True)
             primary_raw, primary_tokens = api_client.perform_chat_request(
@@ -231,8 +249,7 @@ class MultiChatSession:
                 session_raw_logs=srl_list,
             )
             print("\n")
-            thread.join()
-            secondary_result = result_queue.get()
+            secondary_result = secondary_future.result()
             print(f"{ASSISTANT_PROMPT}[{'OpenAI' if secondary_result['engine_name'] == 'openai' else secondary_result['engine_name'].capitalize()}]: {RESET_COLOR}{secondary_result['text']}")
             secondary_tokens = secondary_result.get("tokens", {})
 
@@ -264,8 +281,7 @@ class MultiChatSession:
     def _log_multichat_turn(
         self, log_filepath: Path, history_slice: list[dict]
     ) -> None:
-        try:
-            with open(log_filepath, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"history_slice": history_slice}) + "\n")
-        except OSError as e:
-            log.warning("Could not write to multi-chat session log file: %s", e)
+        # Appended by a background thread, so the next prompt never waits on disk.
+        chat_log_writer.put(
+            log_filepath, fast_json.dumps({"history_slice": history_slice}) + b"\n"
+        )
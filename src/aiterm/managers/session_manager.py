@@ -37,9 +37,10 @@ from ..utils.formatters import (
     sanitize_filename,
 )
 from ..utils.message_builder import (
+    UserMessageBuilder,
     construct_assistant_message,
-    construct_user_message,
     extract_text_from_message,
+    make_user_message_builder,
 )
 from .context_manager import ContextManager
 
@@ -57,6 +58,24 @@ class SessionManager:
         self.image_workflow = workflows.ImageGenerationWorkflow(self)
         # This will be set by the UI upon running the session.
         self.session_name: str | None = None
+        # Last assembled system prompt, as (inputs signature, prompt).
+        self._system_prompt_cache: tuple[tuple | None, str | None] = (None, None)
+        # User-message constructor for the active engine, as (engine name, builder).
+        self._user_message_builder: tuple[str | None, UserMessageBuilder | None] = (
+            None,
+            None,
+        )
+
+    def build_user_message(
+        self, text: str, image_data: list[dict] | None = None
+    ) -> dict:
+        """Constructs a user message in the active engine's format."""
+        engine_name = self.state.engine.name
+        cached_name, builder = self._user_message_builder
+        if builder is None or cached_name != engine_name:
+            builder = make_user_message_builder(engine_name)
+            self._user_message_builder = (engine_name, builder)
+        return builder(text, image_data or [])
 
     # --- Core Orchestration Methods ---
 
@@ -73,10 +92,8 @@ class SessionManager:
                 self.image_workflow._generate_image_from_session(final_prompt)
             return False
 
-        user_msg = construct_user_message(
-            self.state.engine.name,
-            user_input,
-            self.state.attached_images if first_turn else [],
+        user_msg = self.build_user_message(
+            user_input, self.state.attached_images if first_turn else []
         )
         messages = list(self.state.history) + [user_msg]
         srl_list = self.state.session_raw_logs if self.state.debug_active else None
@@ -146,9 +163,7 @@ class SessionManager:
     def handle_single_shot(self, prompt: str) -> None:
         """Executes a single, non-interactive chat request."""
         messages = [
-            construct_user_message(
-                self.state.engine.name, prompt, self.state.attached_images
-            )
+            self.build_user_message(prompt, self.state.attached_images)
         ]
         response, tokens = api_client.perform_chat_request(
             self.state.engine,
@@ -172,7 +187,23 @@ class SessionManager:
     # --- Internal Helper Methods ---
 
     def _assemble_full_system_prompt(self) -> str | None:
-        """Constructs the complete system prompt from state."""
+        """
+        Constructs the complete system prompt from state.
+        The toolbar asks for it on every refresh, so the result is reused for as
+        long as the persona prompt, memory, and attachments are unchanged.
+        """
+        signature = (
+            self.state.system_prompt,
+            self.context_manager.memory_content,
+            tuple(
+                (path, attachment.content)
+                for path, attachment in self.state.attachments.items()
+            ),
+        )
+        cached_signature, cached_prompt = self._system_prompt_cache
+        if signature == cached_signature:
+            return cached_prompt
+
         prompt_parts = []
         # 1. Add the base system prompt from the current persona or initial args.
         if self.state.system_prompt:
@@ -193,7 +224,9 @@ class SessionManager:
             prompt_parts.append(
                 "--- ATTACHED FILES ---\n" + "\n\n".join(attachment_texts)
             )
-        return "\n\n".join(prompt_parts) if prompt_parts else None
+        full_prompt = "\n\n".join(prompt_parts) if prompt_parts else None
+        self._system_prompt_cache = (signature, full_prompt)
+        return full_prompt
 
     def _condense_chat_history(self) -> None:
         """Summarizes the beginning of a long chat history to save tokens."""
@@ -209,10 +242,8 @@ class SessionManager:
         )
 
         if summary_text:
-            summary_message = construct_user_message(
-                self.state.engine.name,
-                f"[PREVIOUSLY DISCUSSED]:\n{summary_text.strip()}",
-                [],
+            summary_message = self.build_user_message(
+                f"[PREVIOUSLY DISCUSSED]:\n{summary_text.strip()}"
             )
             self.state.history = [summary_message] + remaining_history
             print(f"{SYSTEM_MSG}--> History condensed successfully.{RESET_COLOR}")
@@ -223,7 +254,7 @@ class SessionManager:
         """Executes a request to a helper model for internal tasks."""
         helper_model_key = f"helper_model_{self.state.engine.name}"
         task_model = app_settings.settings[helper_model_key]
-        messages = [construct_user_message(self.state.engine.name, prompt_text, [])]
+        messages = [self.build_user_message(prompt_text)]
         response, tokens = api_client.perform_chat_request(
             engine=self.state.engine,
             model=task_model,
@@ -26,6 +26,7 @@ from typing import Any
 
 from . import config
 from .logger import log
+from .utils.fs_cache import json_dir_signature
 
 # Constants for the default persona
 DEFAULT_PERSONA_NAME = "aiterm_assistant"
@@ -151,15 +152,24 @@ def load_persona(name: str) -> Persona | None:
         return None
 
 
-def list_personas() -> list[Persona]:
-    """Lists all valid personas found in the personas directory."""
-    personas: list[Persona] = []
-    if not config.PERSONAS_DIRECTORY.exists():
-        return []
+# Last listing, as (directory signature, sorted personas).
+_personas_cache: tuple[tuple | None, list[Persona]] = (None, [])
 
-    for file_path in config.PERSONAS_DIRECTORY.glob("*.json"):
-        persona = load_persona(file_path.name)
-        if persona:
-            personas.append(persona)
 
-    return sorted(personas, key=lambda p: p.name)
\ No newline at end of file
+def list_personas() -> list[Persona]:
+    """
+    Lists all valid personas found in the personas directory.
+    Files are only re-read when the directory's JSON files have changed.
+    """
+    global _personas_cache
+    signature = json_dir_signature(config.PERSONAS_DIRECTORY)
+    cached_signature, personas = _personas_cache
+    if signature != cached_signature:
+        personas = []
+        for filename, _size, _mtime in signature:
+            persona = load_persona(filename)
+            if persona:
+                personas.append(persona)
+        personas.sort(key=lambda p: p.name)
+        _personas_cache = (signature, personas)
+    return list(personas)
\ No newline at end of file
@@ -28,7 +28,7 @@ from typing import Any
 
 from . import personas as persona_manager
 from .engine import AIEngine
-from .managers.context_manager import Attachment
+from .managers.context_manager import Attachment, AttachmentMap
 
 
 @dataclass
@@ -45,7 +45,7 @@ class SessionState:
     memory_enabled: bool
 
     # Fields with default values follow.
-    attachments: dict[Path, Attachment] = field(default_factory=dict)
+    attachments: dict[Path, Attachment] = field(default_factory=AttachmentMap)
     # Tracks which attachments were added by a persona, to be removed on switch.
     persona_attachments: set[Path] = field(default_factory=set)
     attached_images: list[dict[str, Any]] = field(default_factory=list)
@@ -79,7 +79,7 @@ class MultiChatSessionState:
     # Fields with default values follow.
     openai_persona: persona_manager.Persona | None = None
     gemini_persona: persona_manager.Persona | None = None
-    attachments: dict[Path, Attachment] = field(default_factory=dict)
+    attachments: dict[Path, Attachment] = field(default_factory=AttachmentMap)
     openai_persona_attachments: set[Path] = field(default_factory=set)
     gemini_persona_attachments: set[Path] = field(default_factory=set)
     attached_images: list[dict[str, Any]] = field(default_factory=list)
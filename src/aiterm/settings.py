@@ -14,9 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import atexit
 import json
 import os
 import tempfile
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -40,6 +42,8 @@ def _get_default_settings() -> dict[str, Any]:
         # --- General ---
         "default_engine": "gemini",
         "api_timeout": 120,
+        "http2_enabled": False,
+        "compress_requests": False,
         "active_theme": "default",
         # --- Models ---
         "default_gemini_model": "gemini-flash-latest",
@@ -51,8 +55,11 @@ def _get_default_settings() -> dict[str, Any]:
         "helper_model_openai": "gpt-4o-mini",
         "helper_model_groq": "llama-3.1-8b-instant",
         "helper_model_anthropic": "claude-haiku-4-5",
+        "model_list_ttl": 3600,
         # --- Behavior ---
         "stream": True,
+        "stream_flush_bytes": 64,
+        "stream_flush_ms": 30,
         "memory_enabled": True,
         "default_max_tokens": 4096,
         "summary_max_tokens": 4096,
@@ -84,16 +91,15 @@ def _load_settings() -> dict[str, Any]:
         return defaults
 
 
-def save_setting(key: str, value: str) -> tuple[bool, str]:
+def _convert_setting(key: str, value: str) -> tuple[bool, Any]:
     """
-    Saves a single setting to the JSON file after type conversion.
-    Returns a tuple of (success_boolean, message_string).
+    Validates 'key' and converts 'value' to the type of its default.
+    Returns (True, converted_value) or (False, error_message).
     """
     default_settings = _get_default_settings()
     if key not in default_settings:
         return False, f"Unknown setting: '{key}'."
 
-    current_settings = _load_settings()
     original_type = type(default_settings.get(key))
     converted_value: Any = value
 
@@ -109,17 +115,26 @@ def save_setting(key: str, value: str) -> tuple[bool, str]:
             converted_value = int(value)
     except ValueError as e:
         return False, f"Error: {e}"
+    return True, converted_value
+
 
-    current_settings[key] = converted_value
+def _write_settings(updates: dict[str, Any]) -> None:
+    """
+    Merges 'updates' into the settings file with a single atomic write.
+    Raises OSError or TypeError on failure.
+    """
+    default_settings = _get_default_settings()
+    current_settings = _load_settings()
+    current_settings.update(updates)
 
     user_settings_to_save = {
         k: v for k, v in current_settings.items() if k in default_settings
     }
 
+    _ensure_dir_exists(config.CONFIG_DIR)
+    # Atomic write: write to a temporary file then rename
+    temp_file_path = None
     try:
-        _ensure_dir_exists(config.CONFIG_DIR)
-        # Atomic write: write to a temporary file then rename
-        temp_file_path = None
         # Use tempfile in the same directory to ensure rename is atomic (on same filesystem)
         with tempfile.NamedTemporaryFile(
             mode="w",
@@ -134,15 +149,103 @@ def save_setting(key: str, value: str) -> tuple[bool, str]:
 
         # The replace operation is atomic and works cross-platform (overwrites if exists)
         os.replace(temp_file_path, config.SETTINGS_FILE)
-
-        settings[key] = converted_value
-        return True, f"Setting '{key}' updated to '{converted_value}'."
-    except (OSError, TypeError) as e:
-        log.error("Failed to save settings: %s", e)
+    except (OSError, TypeError):
         # Cleanup the temporary file if it still exists on error
         if temp_file_path and os.path.exists(temp_file_path):
             os.remove(temp_file_path)
-        return False, f"Error saving settings file: {e}"
+        raise
+
+
+def save_setting(key: str, value: str) -> tuple[bool, str]:
+    """
+    Saves a single setting to the JSON file after type conversion.
+    Returns a tuple of (success_boolean, message_string).
+    """
+    global _flush_error
+    ok, converted_value = _convert_setting(key, value)
+    if not ok:
+        return False, converted_value
+
+    with _pending_lock:
+        # Fold in any deferred changes so they are written in the same pass.
+        try:
+            _write_settings({**_pending_settings, key: converted_value})
+        except (OSError, TypeError) as e:
+            log.error("Failed to save settings: %s", e)
+            return False, f"Error saving settings file: {e}"
+        _pending_settings.clear()
+        _cancel_flush_timer()
+        _flush_error = None
+        settings[key] = converted_value
+    return True, f"Setting '{key}' updated to '{converted_value}'."
+
+
+# --- Deferred Saving ---
+# Interactive commands such as /toolbar toggle can fire several times in quick
+# succession; their changes are applied in memory at once and written together.
+SETTINGS_FLUSH_DELAY = 0.5
+
+_pending_settings: dict[str, Any] = {}
+_pending_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+# Set when a deferred write fails; the changes stay pending and are retried.
+_flush_error: str | None = None
+
+
+def _cancel_flush_timer() -> None:
+    """Cancels the scheduled flush, if any. Caller must hold _pending_lock."""
+    global _flush_timer
+    if _flush_timer is not None:
+        _flush_timer.cancel()
+        _flush_timer = None
+
+
+def save_setting_deferred(key: str, value: str) -> tuple[bool, str]:
+    """
+    Validates and applies a setting immediately in memory, and schedules it to
+    be written to the JSON file together with any other pending changes.
+    Returns a tuple of (success_boolean, message_string).
+    """
+    global _flush_timer
+    ok, converted_value = _convert_setting(key, value)
+    if not ok:
+        return False, converted_value
+
+    with _pending_lock:
+        _pending_settings[key] = converted_value
+        settings[key] = converted_value
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(SETTINGS_FLUSH_DELAY, flush_settings)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+        message = f"Setting '{key}' updated to '{converted_value}'."
+        if _flush_error is not None:
+            message += f" Warning: settings file could not be saved: {_flush_error}"
+    return True, message
+
+
+def flush_settings() -> None:
+    """
+    Writes any deferred setting changes to the JSON file. On failure they stay
+    pending, so the next deferred change or exit retries the write, and the
+    error is reported by the next save_setting_deferred() call.
+    """
+    global _flush_error
+    with _pending_lock:
+        _cancel_flush_timer()
+        if not _pending_settings:
+            return
+        try:
+            _write_settings(_pending_settings)
+        except (OSError, TypeError) as e:
+            log.error("Failed to save settings: %s", e)
+            _flush_error = str(e)
+            return
+        _flush_error = None
+        _pending_settings.clear()
+
+
+atexit.register(flush_settings)
 
 
 settings: dict[str, Any] = _load_settings()
\ No newline at end of file
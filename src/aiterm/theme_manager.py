@@ -18,12 +18,14 @@
 Manages the loading and application of color themes.
 """
 
+import functools
 import json
 from importlib import resources
 
 from . import config
 from .logger import log
 from .settings import settings
+from .utils.fs_cache import json_dir_signature
 
 USER_THEMES_DIR = config.CONFIG_DIR / "themes"
 
@@ -80,11 +82,10 @@ def get_theme(name: str) -> dict:
     return theme
 
 
-def list_themes() -> dict[str, str]:
-    """Lists all available themes from both packaged and user directories."""
+@functools.lru_cache(maxsize=1)
+def _packaged_theme_descriptions() -> dict[str, str]:
+    """Reads the descriptions of the themes shipped with the package."""
     themes = {}
-
-    # Load packaged themes first
     try:
         theme_files = resources.files("aiterm.themes")
         for item in theme_files.iterdir():
@@ -94,20 +95,43 @@ def list_themes() -> dict[str, str]:
                 themes[theme_name] = content.get("description", "No description.")
     except (ModuleNotFoundError, FileNotFoundError):
         log.warning("Could not list packaged themes.")
+    return themes
+
+
+# Last user theme listing, as (directory signature, descriptions).
+_user_themes_cache: tuple[tuple | None, dict[str, str]] = (None, {})
+
 
-    # Load user themes, overwriting packaged themes with the same name
-    if USER_THEMES_DIR.exists():
-        for theme_path in USER_THEMES_DIR.glob("*.json"):
-            theme_name = theme_path.stem
+def _user_theme_descriptions() -> dict[str, str]:
+    """
+    Reads the descriptions of the user's themes, re-reading files only when
+    the themes directory's JSON files have changed.
+    """
+    global _user_themes_cache
+    signature = json_dir_signature(USER_THEMES_DIR)
+    cached_signature, themes = _user_themes_cache
+    if signature != cached_signature:
+        themes = {}
+        for filename, _size, _mtime in signature:
+            theme_name = filename[:-5]
             content = _load_user_theme(theme_name)
             themes[theme_name] = content.get("description", "No description.")
+        _user_themes_cache = (signature, themes)
+    return themes
+
 
+def list_themes() -> dict[str, str]:
+    """Lists all available themes from both packaged and user directories."""
+    themes = dict(_packaged_theme_descriptions())
+    # User themes overwrite packaged themes with the same name.
+    themes.update(_user_theme_descriptions())
     return dict(sorted(themes.items()))
 
 
 def reload_theme() -> None:
     """Re-loads the active theme from settings into the global variable."""
     global ACTIVE_THEME
+    _packaged_theme_descriptions.cache_clear()
     ACTIVE_THEME = load_active_theme()
 
 
@@ -0,0 +1,48 @@
+# aiterm/utils/atomic_file.py
+# aiterm: A command-line interface for interacting with AI models.
+# Copyright (C) 2025-2026 Dank A. Saurus
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Crash-safe file replacement: data is written to a temporary file in the
+target's directory and renamed over the target, so readers never observe a
+truncated or half-written file.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Atomically replaces 'path' with 'data'. The temporary file is removed if
+    anything fails; the original error is re-raised.
+    """
+    temp_file_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="wb",
+            dir=path.parent,
+            delete=False,
+            prefix=f"{path.stem}_",
+            suffix=path.suffix,
+        ) as f:
+            temp_file_path = f.name
+            f.write(data)
+        os.replace(temp_file_path, path)
+    except OSError:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
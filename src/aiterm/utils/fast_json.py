@@ -0,0 +1,52 @@
+# aiterm/utils/fast_json.py
+# aiterm: A command-line interface for interacting with AI models.
+# Copyright (C) 2025-2026 Dank A. Saurus
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+JSON helpers for hot paths. Uses orjson when the optional 'speedups' extra is
+installed and falls back to the standard library json module otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Parses a JSON document from str or bytes.
+    Raises json.JSONDecodeError on invalid input with either backend, since
+    orjson.JSONDecodeError is a subclass of it.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serializes an object to UTF-8 encoded JSON bytes: compact by default, or
+    indented by two spaces for human-readable files. Unsupported types raise
+    TypeError with either backend (orjson.JSONEncodeError subclasses it).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,42 @@
+# aiterm/utils/fs_cache.py
+# aiterm: A command-line interface for interacting with AI models.
+# Copyright (C) 2025-2026 Dank A. Saurus
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Helpers for caching data derived from small, read-mostly directories such as
+the personas and user themes directories.
+"""
+
+import os
+from pathlib import Path
+
+
+def json_dir_signature(directory: Path) -> tuple[tuple[str, int, int], ...]:
+    """
+    Returns a fingerprint of the *.json files in a directory: a sorted
+    (name, size, mtime_ns) entry per file, gathered in one scandir pass.
+    Any file being added, removed, or rewritten changes the result. Returns
+    an empty tuple if the directory does not exist.
+    """
+    signature = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+    return tuple(sorted(signature))
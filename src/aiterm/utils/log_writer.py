@@ -0,0 +1,141 @@
+# aiterm/utils/log_writer.py
+# aiterm: A command-line interface for interacting with AI models.
+# Copyright (C) 2025-2026 Dank A. Saurus
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Background writers for log files, keeping disk I/O off the interactive turn
+loop and the request path.
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from ..logger import log
+
+
+class BackgroundWriter:
+    """
+    Hands queued items to _write() from a background daemon thread.
+
+    The thread starts with the first item. Each cycle writes everything queued
+    so far; with an 'interval', it first waits up to that many seconds for
+    'batch_size' items to accumulate. Subclasses implement _write().
+    """
+
+    def __init__(
+        self, thread_name: str, batch_size: int = 1, interval: float = 0.0
+    ) -> None:
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread_name = thread_name
+        self._batch_size = batch_size
+        self._interval = interval
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _put(self, item: Any) -> None:
+        self._queue.put(item)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name=self._thread_name, daemon=True
+                    )
+                    self._thread.start()
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Blocks until every item queued so far has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            self._write_batch(self._drain())
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _drain(self) -> list:
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._interval
+            while len(batch) < self._batch_size and not isinstance(
+                batch[-1], threading.Event
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            batch.extend(self._drain())
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list) -> None:
+        items = [item for item in batch if not isinstance(item, threading.Event)]
+        try:
+            if items:
+                self._write(items)
+        except Exception as e:
+            log.warning("Background log write failed: %s", e)
+        finally:
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write(self, items: list) -> None:
+        raise NotImplementedError
+
+
+class AppendWriter(BackgroundWriter):
+    """
+    Appends lines to files from a background daemon thread.
+
+    Each drain cycle groups whatever has been queued by file path and writes
+    each file's lines with a single write() call.
+    """
+
+    def __init__(self) -> None:
+        super().__init__("aiterm-log-writer")
+
+    def put(self, path: Path, line: bytes) -> None:
+        """Queues a newline-terminated, UTF-8 encoded line for 'path'."""
+        self._put((path, line))
+
+    def _write(self, items: list) -> None:
+        pending: dict[Path, list[bytes]] = {}
+        for path, line in items:
+            pending.setdefault(path, []).append(line)
+        for path, lines in pending.items():
+            try:
+                with open(path, "ab") as f:
+                    f.write(b"".join(lines))
+            except OSError as e:
+                log.warning("Could not write to session log file: %s", e)
+
+
+chat_log_writer = AppendWriter()
+atexit.register(chat_log_writer.flush)
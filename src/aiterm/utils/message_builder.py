@@ -19,17 +19,21 @@ Handles the construction and parsing of API-specific message formats
 for different AI providers (e.g., OpenAI vs. Gemini).
 """
 
+from collections.abc import Callable, Iterable
 from typing import Any
 
+UserMessageBuilder = Callable[[str, list[dict[str, Any]]], dict[str, Any]]
+
 
 def translate_history(
-    history: list[dict[str, Any]], target_engine: str
+    history: Iterable[dict[str, Any]], target_engine: str
 ) -> list[dict[str, Any]]:
     """
     Translates a conversation history to the target engine's format,
     handling role mapping for multi-chat sessions.
     """
     translated = []
+    build_user_message = make_user_message_builder(target_engine)
     for msg in history:
         role = msg.get("role")
         if role not in ["user", "assistant", "model"]:
@@ -40,7 +44,7 @@ def translate_history(
 
         if role == "user":
             # User (Director) messages are always from the user.
-            translated.append(construct_user_message(target_engine, text_content, []))
+            translated.append(build_user_message(text_content, []))
         elif role in ["assistant", "model"]:
             # If a source_engine is present, it's a multi-chat turn.
             if source_engine:
@@ -57,9 +61,7 @@ def translate_history(
                     labeled_content = (
                         f"[{other_engine_name}'s Response]: {text_content}"
                     )
-                    translated.append(
-                        construct_user_message(target_engine, labeled_content, [])
-                    )
+                    translated.append(build_user_message(labeled_content, []))
             else:
                 # Standard single-chat history, just translate the role.
                 translated.append(
@@ -69,42 +71,71 @@ def translate_history(
     return translated
 
 
+def _openai_user_message(
+    text: str, image_data: list[dict[str, Any]]
+) -> dict[str, Any]:
+    content: list[dict[str, Any]] = [{"type": "text", "text": text}]
+    for img in image_data:
+        content.append(
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{img['mime_type']};base64,{img['data']}"
+                },
+            }
+        )
+    return {"role": "user", "content": content}
+
+
+def _anthropic_user_message(
+    text: str, image_data: list[dict[str, Any]]
+) -> dict[str, Any]:
+    content: list[dict[str, Any]] = [{"type": "text", "text": text}]
+    for img in image_data:
+        content.append(
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": img["mime_type"],
+                    "data": img["data"]
+                }
+            }
+        )
+    return {"role": "user", "content": content}
+
+
+def _gemini_user_message(
+    text: str, image_data: list[dict[str, Any]]
+) -> dict[str, Any]:
+    content: list[dict[str, Any]] = [{"text": text}]
+    for img in image_data:
+        content.append(
+            {"inline_data": {"mime_type": img["mime_type"], "data": img["data"]}}
+        )
+    return {"role": "user", "parts": content}
+
+
+_USER_MESSAGE_BUILDERS: dict[str, UserMessageBuilder] = {
+    "openai": _openai_user_message,
+    "groq": _openai_user_message,
+    "anthropic": _anthropic_user_message,
+}
+
+
+def make_user_message_builder(engine_name: str) -> UserMessageBuilder:
+    """
+    Returns the user-message constructor for an engine, so callers that build
+    several messages for the same engine can resolve the format once.
+    """
+    return _USER_MESSAGE_BUILDERS.get(engine_name, _gemini_user_message)
+
+
 def construct_user_message(
     engine_name: str, text: str, image_data: list[dict[str, Any]]
 ) -> dict[str, Any]:
     """Constructs a user message in the format expected by the specified engine."""
-    content: list[dict[str, Any]] = []
-    if engine_name in ["openai", "anthropic", "groq"]:
-        content.append({"type": "text", "text": text})
-        for img in image_data:
-            if engine_name in ["openai", "groq"]:
-                content.append(
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:{img['mime_type']};base64,{img['data']}"
-                        },
-                    }
-                )
-            else:  # anthropic
-                content.append(
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": img["mime_type"],
-                            "data": img["data"]
-                        }
-                    }
-                )
-        return {"role": "user", "content": content}
-    else:  # Gemini
-        content.append({"text": text})
-        for img in image_data:
-            content.append(
-                {"inline_data": {"mime_type": img["mime_type"], "data": img["data"]}}
-            )
-        return {"role": "user", "parts": content}
+    return make_user_message_builder(engine_name)(text, image_data)
 
 
 def construct_assistant_message(engine_name: str, text: str) -> dict[str, Any]:
@@ -18,7 +18,7 @@
 Centralized utility for redacting sensitive information from data structures.
 """
 
-import copy
+import functools
 import re
 from typing import Any
 
@@ -27,51 +27,78 @@ OPENAI_KEY_PATTERN = re.compile(r"sk-(proj-)?\w{20,}")
 GEMINI_KEY_PATTERN = re.compile(r"AIzaSy[A-Za-z0-9\-_]{20,}")
 ANTHROPIC_KEY_PATTERN = re.compile(r"sk-ant-[A-Za-z0-9\-_]+")
 GROQ_KEY_PATTERN = re.compile(r"gsk_[A-Za-z0-9]{20,}")
+# Regex for API keys passed as URL query parameters (e.g. Gemini's ?key=...).
+URL_KEY_PATTERN = re.compile(r"key=([^&]+)")
 
-# A set of dictionary keys whose values should always be redacted.
-SENSITIVE_KEYS = {"api_key", "key", "token", "authorization", "x-api-key"}
+# Dictionary keys whose values should always be redacted.
+SENSITIVE_KEYS = frozenset({"api_key", "key", "token", "authorization", "x-api-key"})
+
+
+@functools.lru_cache(maxsize=2048)
+def _is_sensitive(key: str) -> bool:
+    """
+    Returns True if a dictionary key names a sensitive value (case-insensitive).
+    Log entries repeat the same handful of keys, so decisions are memoized.
+    """
+    return key.lower() in SENSITIVE_KEYS
+
+
+def _redact_string(text: str) -> str:
+    """Applies pattern-based redaction to a single string."""
+    text = URL_KEY_PATTERN.sub("key=[REDACTED]", text)
+    text = OPENAI_KEY_PATTERN.sub("[REDACTED_OPENAI_KEY]", text)
+    text = GEMINI_KEY_PATTERN.sub("[REDACTED_GEMINI_KEY]", text)
+    text = ANTHROPIC_KEY_PATTERN.sub("[REDACTED_ANTHROPIC_KEY]", text)
+    text = GROQ_KEY_PATTERN.sub("[REDACTED_GROQ_KEY]", text)
+    return text
 
 
 def redact_sensitive_info(data: Any) -> Any:
     """
-    Recursively traverses a dict or list to redact sensitive information.
-    This function is non-destructive and returns a new, redacted object.
+    Traverses a dict or list to redact sensitive information.
+    This function is non-destructive and returns a new, redacted object; the
+    containers are rebuilt in a single pass, so no upfront deep copy is needed.
+    The walk uses an explicit stack rather than recursion, so deeply nested
+    payloads cost no Python call frames per level.
     It redacts:
     1. Values of keys found in the SENSITIVE_KEYS set (case-insensitive).
     2. String values that match known API key patterns or URL key parameters.
     """
+    result = [data]
+    # Each entry is (source container, redacted copy under construction).
+    stack: list[tuple[Any, Any]] = []
 
-    def _redact_recursive(sub_data: Any) -> Any:
-        """Inner recursive function that operates on parts of the copied data."""
-        if isinstance(sub_data, dict):
-            new_dict = {}
-            for key, value in sub_data.items():
+    def _visit(value: Any, target: Any, slot: Any) -> None:
+        """Stores the redacted form of 'value' at target[slot]."""
+        if isinstance(value, dict):
+            copy: Any = {}
+            stack.append((value, copy))
+        elif isinstance(value, (list, tuple)):
+            copy = [None] * len(value)
+            stack.append((value, copy))
+        elif isinstance(value, str):
+            # Rule 3: Apply pattern-based redaction to all strings
+            copy = _redact_string(value)
+        else:
+            copy = value
+        target[slot] = copy
+
+    _visit(data, result, 0)
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
                 # Rule 1: Check for sensitive key names (case-insensitive)
-                if key.lower() in SENSITIVE_KEYS:
+                if isinstance(key, str) and _is_sensitive(key):
                     # Rule 1a: Special format for Authorization header
                     if key == "Authorization":
-                        new_dict[key] = "Bearer [REDACTED]"
+                        target[key] = "Bearer [REDACTED]"
                     else:
-                        new_dict[key] = "[REDACTED]"
+                        target[key] = "[REDACTED]"
                 else:
-                    # Rule 2: If key is not sensitive, recurse on the value
-                    new_dict[key] = _redact_recursive(value)
-            return new_dict
-
-        if isinstance(sub_data, list):
-            return [_redact_recursive(item) for item in sub_data]
-
-        if isinstance(sub_data, str):
-            # Rule 3: Apply pattern-based redaction to all strings
-            sub_data = re.sub(r"key=([^&]+)", "key=[REDACTED]", sub_data)
-            sub_data = OPENAI_KEY_PATTERN.sub("[REDACTED_OPENAI_KEY]", sub_data)
-            sub_data = GEMINI_KEY_PATTERN.sub("[REDACTED_GEMINI_KEY]", sub_data)
-            sub_data = ANTHROPIC_KEY_PATTERN.sub("[REDACTED_ANTHROPIC_KEY]", sub_data)
-            sub_data = GROQ_KEY_PATTERN.sub("[REDACTED_GROQ_KEY]", sub_data)
-            return sub_data
-
-        return sub_data
-
-    # Start with a deepcopy to ensure the original data is not mutated
-    data_copy = copy.deepcopy(data)
-    return _redact_recursive(data_copy)
\ No newline at end of file
+                    # Rule 2: If key is not sensitive, redact the value
+                    _visit(value, target, key)
+        else:
+            for index, value in enumerate(source):
+                _visit(value, target, index)
+    return result[0]
@@ -31,8 +31,11 @@ if TYPE_CHECKING:
     from ..engine import AIEngine
 
 
-def select_model(engine: "AIEngine", task: str) -> str:
-    """Allows the user to select a model or use the default."""
+def select_model(engine: "AIEngine", task: str, refresh: bool = False) -> str:
+    """
+    Allows the user to select a model or use the default. With 'refresh', the
+    model list is re-fetched even if a cached copy is still fresh.
+    """
     default_model = ""
     if task == "chat":
         default_model = get_default_model_for_engine(engine.name)
@@ -46,7 +49,7 @@ def select_model(engine: "AIEngine", task: str) -> str:
         return default_model
 
     print("Fetching available models...")
-    models = engine.fetch_available_models(task)
+    models = engine.fetch_available_models(task, refresh=refresh)
     if not models:
         print(f"Using default: {default_model}")
         return default_model
@@ -103,6 +106,7 @@ Interactive Chat Commands:
   /load <filename>  Load a session, replacing the current one.
   /engine [name]    Switch AI engine (openai/gemini). Translates history.
   /model [name]     Select a new model for the current engine.
+                    Use '/model --refresh' to re-fetch the model list.
   /persona <name>   Switch to a different persona. Use `/persona clear` to remove.
   /personas         List all available personas.
   /image [prompt]   Initiate the image generation workflow.
@@ -181,10 +181,10 @@ def fake_fs():
 @pytest.fixture
 def mock_requests_post(mocker):
     """
-    A fixture that mocks `requests.post` to prevent actual network calls.
-    Returns the mock object for customization within tests.
+    A fixture that mocks the shared API session's `post` to prevent actual
+    network calls. Returns the mock object for customization within tests.
     """
-    return mocker.patch("requests.post")
+    return mocker.patch("aiterm.api_client._session.post")
 
 
 @pytest.fixture
@@ -323,8 +323,8 @@ def mock_streaming_response_factory():
 
     def _create_mock_response(chunks):
         response = MagicMock(spec=requests.Response)
-        byte_chunks = [c.encode("utf-8") for c in chunks]
-        response.iter_lines.return_value = iter(byte_chunks)
+        byte_chunks = [f"{c}\n".encode() for c in chunks]
+        response.iter_content.return_value = iter(byte_chunks)
         response.status_code = 200
         return response
 
@@ -332,16 +332,19 @@ def mock_streaming_response_factory():
 
 
 @pytest.fixture
-def mock_chat_ui(mock_session_manager):
+def mock_chat_ui(mock_session_manager, mocker):
     """Provides a SingleChatUI instance with a mocked session manager."""
+    # Keep run() from replacing the test process's SIGWINCH handler.
+    mocker.patch("aiterm.chat_ui._install_resize_handler")
     return SingleChatUI(
         session_manager=mock_session_manager, session_name="test_ui_session"
     )
 
 
 @pytest.fixture
-def mock_multichat_ui(mock_multichat_session):
+def mock_multichat_ui(mock_multichat_session, mocker):
     """Provides a MultiChatUI instance with a mocked session."""
+    mocker.patch("aiterm.chat_ui._install_resize_handler")
     return MultiChatUI(
         session=mock_multichat_session,
         session_name="test_multi_ui",
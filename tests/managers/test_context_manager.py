@@ -3,7 +3,9 @@
 Tests for the ContextManager class in aiterm/managers/context_manager.py.
 """
 
+import copy
 import os
+import pickle
 import tarfile
 import zipfile
 from io import BytesIO
@@ -11,7 +13,13 @@ from pathlib import Path
 
 import pytest
 from aiterm import config
-from aiterm.managers.context_manager import ContextManager
+from aiterm.managers.context_manager import (
+    Attachment,
+    AttachmentMap,
+    ContextManager,
+    _read_image_file,
+    _source_kind,
+)
 
 
 @pytest.fixture
@@ -89,6 +97,29 @@ class TestContextManager:
         assert len(cm.image_data) == 1
         assert cm.image_data[0]["mime_type"] == "image/png"
 
+    def test_init_parallel_load_matches_sequential(self, setup_fake_fs, mocker):
+        """Tests that pooled loading stores the same results in the same order."""
+        sequential = ContextManager(
+            files_arg=[str(setup_fake_fs)], memory_enabled=False, exclude_arg=None
+        )
+        mocker.patch("aiterm.managers.context_manager.LOAD_PARALLEL_THRESHOLD", 1)
+        parallel = ContextManager(
+            files_arg=[str(setup_fake_fs)], memory_enabled=False, exclude_arg=None
+        )
+
+        assert parallel.attachments == sequential.attachments
+        assert parallel.image_data == sequential.image_data
+
+        ordered = [
+            setup_fake_fs / "main.py",
+            setup_fake_fs / "archive.zip",
+            setup_fake_fs / "README.md",
+        ]
+        cm = ContextManager(
+            files_arg=[str(p) for p in ordered], memory_enabled=False, exclude_arg=None
+        )
+        assert list(cm.attachments) == ordered
+
     def test_init_with_memory_enabled(self, setup_fake_fs):
         """Tests that persistent memory is loaded when enabled."""
         cm = ContextManager(files_arg=None, memory_enabled=True, exclude_arg=None)
@@ -110,6 +141,17 @@ class TestContextManager:
         assert setup_fake_fs / "build" / "output.txt" not in cm.attachments
         assert setup_fake_fs / "main.py" in cm.attachments
 
+    def test_init_with_relative_exclusions(self, setup_fake_fs, monkeypatch):
+        """Tests that relative exclusions prune a walk started from '.'."""
+        monkeypatch.chdir(setup_fake_fs)
+        cm = ContextManager(
+            files_arg=["."], memory_enabled=False, exclude_arg=["./build", "utils"]
+        )
+
+        assert Path("main.py") in cm.attachments
+        assert not any(p.parts[0] in ("build", "utils") for p in cm.attachments)
+        assert cm.image_data == []
+
     def test_process_zip_file(self, setup_fake_fs):
         """Tests that zip files are correctly processed."""
         zip_path_str = str(setup_fake_fs / "archive.zip")
@@ -123,6 +165,23 @@ class TestContextManager:
         assert "zipped_file.txt" in attachment.content
         assert "ignored.dat" not in attachment.content
 
+    def test_process_zip_file_skips_dirs_and_excluded_names(self, setup_fake_fs):
+        """Tests that directory entries and excluded names are left out of zips."""
+        zip_path = setup_fake_fs / "multi.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("docs/", "")
+            zf.writestr("docs/keep.md", "kept")
+            zf.writestr("docs/secret.txt", "hidden")
+
+        cm = ContextManager(
+            files_arg=[str(zip_path)],
+            memory_enabled=False,
+            exclude_arg=["secret.txt"],
+        )
+
+        content = cm.attachments[zip_path].content
+        assert content == "--- FILE (from multi.zip): docs/keep.md ---\nkept"
+
     def test_process_tar_file(self, setup_fake_fs):
         """Tests that tar.gz files are correctly processed."""
         tar_path_str = str(setup_fake_fs / "archive.tar.gz")
@@ -135,6 +194,31 @@ class TestContextManager:
         assert "tarred content" in attachment.content
         assert "tarred_file.txt" in attachment.content
 
+    def test_process_tar_file_reads_members_in_order_with_exclusions(
+        self, setup_fake_fs
+    ):
+        """Tests that every member is read sequentially and excluded names skipped."""
+        tar_path = setup_fake_fs / "multi.tar"
+        with tarfile.open(tar_path, "w") as tf:
+            for name, data in (
+                ("a/first.txt", b"one"),
+                ("a/secret.txt", b"hidden"),
+                ("b/second.py", b"two"),
+            ):
+                info = tarfile.TarInfo(name=name)
+                info.size = len(data)
+                tf.addfile(info, BytesIO(data))
+
+        cm = ContextManager(
+            files_arg=[str(tar_path)],
+            memory_enabled=False,
+            exclude_arg=["secret.txt"],
+        )
+
+        content = cm.attachments[tar_path].content
+        assert content.index("one") < content.index("two")
+        assert "hidden" not in content
+
     def test_process_image_file(self, setup_fake_fs):
         """Tests that image files are correctly processed and added to image_data."""
         img_path_str = str(setup_fake_fs / "utils" / "logo.png")
@@ -147,6 +231,17 @@ class TestContextManager:
         # Check that the text attachments are empty
         assert not cm.attachments
 
+    def test_read_image_file_skips_unsupported_type_without_reading(
+        self, setup_fake_fs, mocker
+    ):
+        """Tests that an unsupported image type is rejected before any I/O."""
+        mock_open = mocker.patch("builtins.open")
+
+        result = _read_image_file(setup_fake_fs / "utils" / "data.bin")
+
+        mock_open.assert_not_called()
+        assert result is None
+
     def test_refresh_files_modified(self, setup_fake_fs):
         """Tests that refresh_files re-reads a modified file."""
         main_py_path = setup_fake_fs / "main.py"
@@ -160,6 +255,7 @@ class TestContextManager:
         updated_files = cm.refresh_files(None)
         assert updated_files == ["main.py"]
         assert cm.attachments[main_py_path].content == "print('updated')"
+        assert cm.attachments[main_py_path].size == len("print('updated')")
 
     def test_refresh_files_deleted(self, setup_fake_fs):
         """Tests that refresh_files removes a deleted file from context."""
@@ -174,6 +270,21 @@ class TestContextManager:
         cm.refresh_files(None)
         assert main_py_path not in cm.attachments
 
+    def test_refresh_files_parallel(self, setup_fake_fs, mocker):
+        """Tests that large refreshes use the thread pool and keep attach order."""
+        mocker.patch("aiterm.managers.context_manager.REFRESH_PARALLEL_THRESHOLD", 1)
+        paths = [setup_fake_fs / "main.py", setup_fake_fs / "README.md"]
+        cm = ContextManager(
+            files_arg=[str(p) for p in paths], memory_enabled=False, exclude_arg=None
+        )
+        for path in paths:
+            cm.attachments[path].mtime = 0.0
+        paths[1].unlink()
+
+        updated_files = cm.refresh_files(None)
+        assert updated_files == ["main.py"]
+        assert paths[1] not in cm.attachments
+
     def test_attach_file(self, setup_fake_fs):
         """Tests adding a file after initialization."""
         cm = ContextManager(files_arg=[], memory_enabled=False, exclude_arg=None)
@@ -186,6 +297,17 @@ class TestContextManager:
         assert Path(readme_path_str) in cm.attachments
         assert "# Project" in cm.attachments[Path(readme_path_str)].content
 
+    def test_attach_directory_skips_images(self, setup_fake_fs, mocker):
+        """Tests that attaching a directory adds its text without encoding images."""
+        cm = ContextManager(files_arg=[], memory_enabled=False, exclude_arg=None)
+        mock_b64 = mocker.patch("aiterm.managers.context_manager.base64.b64encode")
+
+        cm.attach_file(str(setup_fake_fs / "utils"))
+
+        assert list(cm.attachments) == [setup_fake_fs / "utils" / "helpers.py"]
+        assert cm.image_data == []
+        mock_b64.assert_not_called()
+
     def test_detach_file_by_name(self, setup_fake_fs):
         """Tests detaching a file by its base name."""
         cm = ContextManager(
@@ -235,3 +357,95 @@ class TestContextManager:
         # Check for byte formatting
         assert "(14.00 B)" in captured  # main.py
         assert "(18.00 B)" in captured  # helpers.py
+
+    def test_list_files_uses_recorded_size(self, setup_fake_fs, capsys, mocker):
+        """Tests that list_files reads sizes from attachments, not the disk."""
+        main_py_path = setup_fake_fs / "main.py"
+        cm = ContextManager(
+            files_arg=[str(main_py_path)], memory_enabled=False, exclude_arg=None
+        )
+        assert cm.attachments[main_py_path].size == 14
+        mock_stat = mocker.patch.object(Path, "stat")
+
+        cm.list_files()
+
+        mock_stat.assert_not_called()
+        assert "(14.00 B)" in capsys.readouterr().out
+
+    def test_list_files_stats_attachments_without_size(self, setup_fake_fs, capsys):
+        """Tests that attachments loaded without a size fall back to stat()."""
+        main_py_path = setup_fake_fs / "main.py"
+        cm = ContextManager(files_arg=None, memory_enabled=False, exclude_arg=None)
+        cm.attachments[main_py_path] = Attachment(content="stale", mtime=0.0)
+
+        cm.list_files()
+
+        assert "(14.00 B)" in capsys.readouterr().out
+
+    def test_attachment_map_name_index_tracks_mutations(self):
+        """Tests that the basename index follows every way the map is mutated."""
+        a, b, c = Path("/x/a.py"), Path("/y/a.py"), Path("/x/c.py")
+        attachments = AttachmentMap({a: Attachment("1", 0.0)})
+        attachments.update({b: Attachment("2", 0.0), c: Attachment("3", 0.0)})
+        attachments[a] = Attachment("1b", 1.0)  # Re-assignment must not duplicate
+        assert attachments.paths_named("a.py") == [a, b]
+
+        del attachments[a]
+        attachments.pop(c)
+        assert attachments.paths_named("a.py") == [b]
+        assert attachments.paths_named("c.py") == []
+
+        attachments.clear()
+        assert attachments.paths_named("a.py") == []
+
+    def test_attachment_map_copies_keep_index(self):
+        """Tests that copies and merges rebuild the index instead of sharing it."""
+        a, b = Path("/x/a.py"), Path("/y/a.py")
+        attachments = AttachmentMap({a: Attachment("1", 0.0)})
+
+        for clone in (
+            copy.deepcopy(attachments),
+            copy.copy(attachments),
+            attachments.copy(),
+            pickle.loads(pickle.dumps(attachments)),
+        ):
+            assert isinstance(clone, AttachmentMap)
+            assert clone.paths_named("a.py") == [a]
+            clone[b] = Attachment("2", 0.0)
+            assert clone.paths_named("a.py") == [a, b]
+        assert attachments.paths_named("a.py") == [a]
+
+        merged = attachments | {b: Attachment("2", 0.0)}
+        assert isinstance(merged, AttachmentMap)
+        assert merged.paths_named("a.py") == [a, b]
+
+        attachments |= {b: Attachment("2", 0.0)}
+        assert attachments.paths_named("a.py") == [a, b]
+
+    def test_attachment_byte_size(self):
+        """Tests that byte_size reports the UTF-8 size for ASCII and non-ASCII text."""
+        assert Attachment(content="hello", mtime=0.0).byte_size == 5
+        assert Attachment(content="h\u00e9llo \u2713", mtime=0.0).byte_size == len(
+            "h\u00e9llo \u2713".encode("utf-8")
+        )
+
+
+@pytest.mark.parametrize(
+    "name, kind",
+    [
+        ("main.py", "text"),
+        ("NOTES.MD", "text"),
+        ("Dockerfile", "text"),
+        (".gitignore", "text"),
+        ("logo.png", "image"),
+        ("photo.JPG", "image"),
+        ("bundle.zip", "zip"),
+        ("backup.tar.gz", "tar"),
+        ("src.tgz", "tar"),
+        ("data.bin", None),
+        ("unknownfile", None),
+    ],
+)
+def test_source_kind(name, kind):
+    """Tests that files are classified by a single extension lookup."""
+    assert _source_kind(Path("/x") / name) == kind
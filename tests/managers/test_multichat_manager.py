@@ -5,9 +5,15 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.aiterm.engine import AIEngine
+from src.aiterm.managers import multichat_manager
 from src.aiterm.managers.context_manager import ContextManager
 from src.aiterm.managers.multichat_manager import MultiChatSession
 from src.aiterm.session_state import MultiChatSessionState
+from src.aiterm.utils.message_builder import (
+    construct_assistant_message,
+    construct_user_message,
+    translate_history,
+)
 
 
 @pytest.fixture
@@ -43,10 +49,8 @@ def mock_multichat_session(mock_multichat_session_state, mock_context_manager):
 @pytest.mark.usefixtures("mock_settings_patcher")
 class TestMultiChatManager:
     @patch("src.aiterm.managers.multichat_manager.api_client.perform_chat_request")
-    @patch("src.aiterm.managers.multichat_manager.threading.Thread")
     def test_process_turn_broadcast(
         self,
-        mock_thread_class,
         mock_perform_chat,
         mock_multichat_session,
         mocker,
@@ -59,28 +63,12 @@ class TestMultiChatManager:
         )
         mock_multichat_session.primary_engine_name = "openai"
 
-        # Mock API responses
-        mock_perform_chat.return_value = (
-            "OpenAI response.",
-            {"prompt": 10, "completion": 5},
-        )
-        # Mock the secondary worker's behavior
-        mock_thread_instance = mock_thread_class.return_value
-
-        def mock_secondary_worker_target(*args, **kwargs):
-            q = kwargs["args"][-1]
-            q.put(
-                {
-                    "engine_name": "gemini",
-                    "text": "Gemini response.",
-                    "tokens": {"prompt": 12, "completion": 6},
-                }
-            )
-
-        mock_thread_instance.start = lambda: mock_secondary_worker_target(
-            args=mock_thread_class.call_args.kwargs["args"]
-        )
-        mock_thread_instance.join = lambda: None
+        # Mock API responses; the secondary (Gemini) request runs on the worker.
+        responses = {
+            "openai": ("OpenAI response.", {"prompt": 10, "completion": 5}),
+            "gemini": ("Gemini response.", {"prompt": 12, "completion": 6}),
+        }
+        mock_perform_chat.side_effect = lambda engine, *a, **k: responses[engine.name]
 
         mock_multichat_session.process_turn("Hello world", Path("/fake/log.jsonl"))
 
@@ -139,9 +127,8 @@ class TestMultiChatManager:
         assert mock_multichat_session.state.total_completion_tokens == 1
 
     @patch("src.aiterm.managers.multichat_manager.api_client.perform_chat_request")
-    @patch("src.aiterm.managers.multichat_manager.threading.Thread")
     def test_secondary_worker_api_error(
-        self, mock_thread_class, mock_perform_chat, mock_multichat_session, mocker
+        self, mock_perform_chat, mock_multichat_session, mocker
     ):
         """Tests that an API error in the secondary worker is handled."""
         mocker.patch(
@@ -150,23 +137,12 @@ class TestMultiChatManager:
         )
         mock_multichat_session.primary_engine_name = "openai"
 
-        mock_perform_chat.return_value = ("OK", {"prompt": 1, "completion": 1})
-
-        def mock_secondary_worker_target(*args, **kwargs):
-            q = kwargs["args"][-1]
-            q.put(
-                {
-                    "engine_name": "gemini",
-                    "text": "Error: API key invalid",
-                    "tokens": {},
-                }
-            )
-
-        mock_thread_instance = mock_thread_class.return_value
-        mock_thread_instance.start = lambda: mock_secondary_worker_target(
-            args=mock_thread_class.call_args.kwargs["args"]
-        )
-        mock_thread_instance.join = lambda: None
+        def fake_chat_request(engine, *args, **kwargs):
+            if engine.name == "gemini":
+                raise RuntimeError("API key invalid")
+            return ("OK", {"prompt": 1, "completion": 1})
+
+        mock_perform_chat.side_effect = fake_chat_request
 
         mock_multichat_session.process_turn("test", Path("/fake/log.jsonl"))
 
@@ -174,11 +150,67 @@ class TestMultiChatManager:
             mock_multichat_session.state.shared_history[2]
         )
 
+    def test_translated_history_matches_full_translation(self, mock_multichat_session):
+        """Tests that incremental translation equals translating from scratch."""
+        history = mock_multichat_session.state.shared_history
+        user_msg = construct_user_message("openai", "Director to All: next", [])
+        history.extend(
+            [
+                construct_user_message("openai", "Director to All: hi", []),
+                {**construct_assistant_message("openai", "A"), "source_engine": "openai"},
+                {**construct_assistant_message("openai", "B"), "source_engine": "gemini"},
+            ]
+        )
+        for engine in ("openai", "gemini"):
+            assert mock_multichat_session._translated_history(
+                engine, user_msg
+            ) == translate_history(history + [user_msg], engine)
+
+        history.append(construct_user_message("openai", "Director to All: more", []))
+        assert mock_multichat_session._translated_history(
+            "gemini", user_msg
+        ) == translate_history(history + [user_msg], "gemini")
+
+    def test_translated_history_only_translates_new_messages(
+        self, mocker, mock_multichat_session
+    ):
+        """Tests that earlier turns are not re-translated on later turns."""
+        history = mock_multichat_session.state.shared_history
+        history.append(construct_user_message("openai", "first", []))
+        user_msg = construct_user_message("openai", "next", [])
+        mock_multichat_session._translated_history("gemini", user_msg)
+
+        spy = mocker.spy(multichat_manager, "translate_history")
+        history.append(construct_user_message("openai", "second", []))
+        mock_multichat_session._translated_history("gemini", user_msg)
+
+        translated_inputs = [call.args[0] for call in spy.call_args_list]
+        assert translated_inputs == [history[1:], (user_msg,)]
+
+    def test_translated_history_rebuilds_after_rewrite(self, mock_multichat_session):
+        """Tests that a replaced history is translated from scratch."""
+        state = mock_multichat_session.state
+        user_msg = construct_user_message("openai", "next", [])
+        state.shared_history.extend(
+            [construct_user_message("openai", t, []) for t in ("a", "b", "c")]
+        )
+        mock_multichat_session._translated_history("openai", user_msg)
+
+        state.shared_history = [construct_user_message("openai", t, []) for t in "xyzw"]
+        result = mock_multichat_session._translated_history("openai", user_msg)
+
+        assert result == translate_history(
+            state.shared_history + [user_msg], "openai"
+        )
+
     def test_log_multichat_turn(self, mocker, mock_multichat_session):
         """Tests that a turn is correctly logged to a file."""
-        mock_open = mocker.patch("builtins.open", mocker.mock_open())
+        mock_writer = mocker.patch(
+            "src.aiterm.managers.multichat_manager.chat_log_writer"
+        )
         mock_multichat_session._log_multichat_turn(
             Path("/fake.jsonl"), [{"role": "user"}]
         )
-        mock_open.assert_called_with(Path("/fake.jsonl"), "a", encoding="utf-8")
-        mock_open().write.assert_called_once()
\ No newline at end of file
+        mock_writer.put.assert_called_once_with(
+            Path("/fake.jsonl"), b'{"history_slice":[{"role":"user"}]}\n'
+        )
\ No newline at end of file
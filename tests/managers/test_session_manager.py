@@ -41,6 +41,20 @@ class TestSessionManager:
         assert mock_session_manager.state.total_completion_tokens == 20
         assert mock_session_manager.state.last_turn_tokens["total"] == 30
 
+    def test_build_user_message_follows_engine_switch(
+        self, mock_session_manager, mock_openai_session_state
+    ):
+        """Tests that the cached builder is re-resolved after the engine changes."""
+        assert mock_session_manager.build_user_message("hi") == {
+            "role": "user",
+            "parts": [{"text": "hi"}],
+        }
+        mock_session_manager.state.engine = mock_openai_session_state.engine
+        assert mock_session_manager.build_user_message("hi") == {
+            "role": "user",
+            "content": [{"type": "text", "text": "hi"}],
+        }
+
     def test_take_turn_delegates_to_image_workflow(self, mocker, mock_session_manager):
         """
         Tests that user input is passed to the image workflow if it's active,
@@ -223,3 +237,19 @@ class TestSessionManager:
         assert "Single shot response." in captured.out
         # Token usage should be printed to stderr
         assert "[P:5/C:10/R:0/T:15]" in captured.err
+
+    def test_assemble_full_system_prompt_is_reused_until_inputs_change(
+        self, mock_session_manager
+    ):
+        """Tests that the assembled prompt is cached and rebuilt on change."""
+        mock_session_manager.state.system_prompt = "Be brief."
+        mock_session_manager.context_manager.memory_content = "User likes tea."
+
+        first = mock_session_manager._assemble_full_system_prompt()
+        assert mock_session_manager._assemble_full_system_prompt() is first
+        assert "User likes tea." in first
+
+        mock_session_manager.context_manager.memory_content = "User likes coffee."
+        second = mock_session_manager._assemble_full_system_prompt()
+        assert second is not first
+        assert "User likes coffee." in second
@@ -1,8 +1,10 @@
 # tests/test_api_client.py
 
+import asyncio
+import gzip
 import json
 import logging
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import requests
@@ -63,10 +65,30 @@ def test_check_api_keys_missing_anthropic(monkeypatch, mocker):
     assert "ANTHROPIC_API_KEY" in str(excinfo.value)
 
 
+def test_check_api_keys_reloads_dotenv_only_when_changed(
+    monkeypatch, mocker, tmp_path
+):
+    """Tests that .env is re-parsed only after the file changes on disk."""
+    dotenv_file = tmp_path / ".env"
+    dotenv_file.write_text("GEMINI_API_KEY=a\n")
+    mocker.patch("aiterm.api_client.config.DOTENV_FILE", dotenv_file)
+    monkeypatch.setattr(api_client, "_dotenv_signature", None)
+    monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+    mock_load = mocker.patch("aiterm.api_client.load_dotenv")
+
+    check_api_keys("gemini")
+    check_api_keys("gemini")
+    assert mock_load.call_count == 1
+
+    dotenv_file.write_text("GEMINI_API_KEY=a\nOPENAI_API_KEY=b\n")
+    check_api_keys("gemini")
+    assert mock_load.call_count == 2
+
+
 def test_make_api_request_success(mocker, mock_settings):
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("aiterm.api_client._session.post")
     mock_response = MagicMock()
-    mock_response.json.return_value = {"success": True}
+    mock_response.content = b'{"success": true}'
     mock_post.return_value = mock_response
 
     response = make_api_request("http://test.com", {}, {})
@@ -76,7 +98,7 @@ def test_make_api_request_success(mocker, mock_settings):
 
 
 def test_make_api_request_streaming_success(mocker, mock_settings):
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("aiterm.api_client._session.post")
     mock_response = MagicMock(spec=requests.Response)
     mock_response.status_code = 200  # Add status_code to the mock
     mock_post.return_value = mock_response
@@ -84,15 +106,334 @@ def test_make_api_request_streaming_success(mocker, mock_settings):
     response = make_api_request("http://test.com", {}, {}, stream=True)
     assert response is mock_response
     mock_post.assert_called_once_with(
-        "http://test.com", headers={}, json={}, stream=True, timeout=10
+        "http://test.com",
+        headers={"Content-Type": "application/json"},
+        data=b"{}",
+        stream=True,
+        timeout=10,
     )
     mock_response.raise_for_status.assert_called_once()
 
 
+def test_make_api_request_reuses_shared_session(mocker, mock_settings):
+    """Tests that consecutive requests go through the same pooled session."""
+    mock_post = mocker.patch("aiterm.api_client._session.post")
+    mock_post.return_value.content = b'{"success": true}'
+
+    make_api_request("http://test.com", {}, {})
+    make_api_request("http://test.com", {}, {})
+
+    assert mock_post.call_count == 2
+    assert api_client.get_session() is api_client._session
+    assert isinstance(
+        api_client.get_session().get_adapter("https://api.openai.com"),
+        requests.adapters.HTTPAdapter,
+    )
+
+
+@pytest.fixture
+def mock_httpx(mocker):
+    """Installs a fake httpx module and enables the HTTP/2 transport."""
+    fake_httpx = MagicMock()
+    fake_httpx.HTTPError = type("HTTPError", (Exception,), {})
+    fake_httpx.HTTPStatusError = type("HTTPStatusError", (fake_httpx.HTTPError,), {})
+    fake_httpx.ConnectError = type("ConnectError", (fake_httpx.HTTPError,), {})
+    mocker.patch("aiterm.api_client.httpx", fake_httpx)
+    mocker.patch("aiterm.api_client._http2_client", None)
+    mocker.patch(
+        "aiterm.api_client.settings", {"api_timeout": 10, "http2_enabled": True}
+    )
+    return fake_httpx
+
+
+def test_make_api_request_http2_transport(mocker, mock_httpx):
+    """Tests that requests are sent through the HTTP/2 client when enabled."""
+    mock_session_post = mocker.patch("aiterm.api_client._session.post")
+    client = mock_httpx.Client.return_value
+    client.send.return_value.content = b'{"success": true}'
+
+    response = make_api_request("https://test.com", {}, {"a": 1})
+
+    assert response == {"success": True}
+    mock_session_post.assert_not_called()
+    mock_httpx.Client.assert_called_once()
+    assert mock_httpx.Client.call_args.kwargs["http2"] is True
+    client.build_request.assert_called_once_with(
+        "POST",
+        "https://test.com",
+        headers={"Content-Type": "application/json"},
+        content=b'{"a":1}',
+        timeout=10,
+    )
+
+
+def test_make_api_request_http2_transport_error(mock_httpx):
+    """Tests that httpx transport errors surface as ApiRequestError."""
+    client = mock_httpx.Client.return_value
+    client.send.side_effect = mock_httpx.HTTPError("Connection reset")
+
+    with pytest.raises(ApiRequestError, match="Connection reset"):
+        make_api_request("https://test.com", {}, {})
+
+
+def test_http_get_uses_http2_client(mocker, mock_httpx):
+    """Tests that GET requests share the HTTP/2 client when it is enabled."""
+    mock_session_get = mocker.patch("aiterm.api_client._session.get")
+    client = mock_httpx.Client.return_value
+    client.send.return_value.content = b'{"data": []}'
+
+    response = api_client.http_get("https://test.com/models", {"X": "1"})
+
+    assert response.content == b'{"data": []}'
+    client.build_request.assert_called_once_with(
+        "GET", "https://test.com/models", headers={"X": "1"}, timeout=10
+    )
+    mock_session_get.assert_not_called()
+
+
+def test_http_get_transport_error(mock_httpx):
+    """Tests that httpx GET errors surface as requests exceptions."""
+    mock_httpx.Client.return_value.send.side_effect = mock_httpx.HTTPError("reset")
+
+    with pytest.raises(requests.exceptions.ConnectionError, match="reset"):
+        api_client.http_get("https://test.com/models")
+
+
+def test_http2_response_adapter_iter_content():
+    """Tests that the HTTP/2 adapter yields raw byte blocks like requests."""
+    raw_response = MagicMock()
+    raw_response.iter_bytes.return_value = iter([b"data: one\n", b"data: two\n"])
+    adapter = api_client._Http2Response(raw_response)
+    assert list(adapter.iter_content(chunk_size=1024)) == [
+        b"data: one\n",
+        b"data: two\n",
+    ]
+    raw_response.iter_bytes.assert_called_once_with()
+
+
+def test_http2_response_streams_lines_as_chunks_arrive():
+    """Tests that each SSE line is yielded before the next chunk is read."""
+    events = []
+
+    def iter_bytes(*args):
+        assert not args, "a chunk size makes httpx buffer the stream"
+        for chunk in (b"data: one\n", b"data: two\n", b"data: [DONE]\n"):
+            events.append(("read", chunk))
+            yield chunk
+
+    raw_response = MagicMock()
+    raw_response.iter_bytes.side_effect = iter_bytes
+    adapter = api_client._Http2Response(raw_response)
+
+    for line in api_client._iter_sse_lines(adapter):
+        events.append(("line", line))
+
+    assert events == [
+        ("read", b"data: one\n"),
+        ("line", b"data: one"),
+        ("read", b"data: two\n"),
+        ("line", b"data: two"),
+        ("read", b"data: [DONE]\n"),
+        ("line", b"data: [DONE]"),
+    ]
+
+
+def test_perform_chat_request_async_gathers_requests(mock_httpx, mock_openai_engine):
+    """Tests that concurrent async chat requests share one client."""
+    client = MagicMock()
+    response = MagicMock(is_error=False, status_code=200)
+    response.content = json.dumps(
+        {
+            "choices": [{"message": {"content": "Hi"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+        }
+    ).encode()
+    client.send = AsyncMock(return_value=response)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                api_client.perform_chat_request_async(
+                    mock_openai_engine, "gpt", [], None, 100, False, client=client
+                )
+                for _ in range(3)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert client.send.await_count == 3
+    assert results[0] == (
+        "Hi",
+        {"prompt": 1, "completion": 2, "reasoning": 0, "total": 3},
+    )
+
+
+def test_perform_chat_request_async_streaming(mock_httpx, mock_openai_engine):
+    """Tests async stream processing and that the response is closed."""
+
+    async def aiter_bytes():
+        yield b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n'
+        yield b'data: {"choices": [{"delta": {"content": "lo"}}]}\ndata: [DONE]\n'
+
+    response = MagicMock(is_error=False, status_code=200)
+    response.aiter_bytes = aiter_bytes
+    response.aclose = AsyncMock()
+    client = MagicMock()
+    client.send = AsyncMock(return_value=response)
+
+    text, _ = asyncio.run(
+        api_client.perform_chat_request_async(
+            mock_openai_engine, "gpt", [], None, 100, True, print_stream=False, client=client
+        )
+    )
+
+    assert text == "Hello"
+    response.aclose.assert_awaited_once()
+
+
+def test_perform_chat_request_async_streams_deltas_incrementally(
+    mocker, mock_httpx, mock_openai_engine
+):
+    """Tests that each async delta is processed before the next chunk is read."""
+    events = []
+
+    async def aiter_bytes(*args):
+        assert not args, "a chunk size makes httpx buffer the stream"
+        for text in ("Hel", "lo"):
+            events.append(("read", text))
+            yield b'data: {"choices": [{"delta": {"content": "%s"}}]}\n' % text.encode()
+        yield b"data: [DONE]\n"
+
+    feed = api_client._StreamProcessor.feed
+
+    def recording_feed(self, chunk):
+        result = feed(self, chunk)
+        if self._parts:
+            events.append(("text", "".join(self._parts)))
+        return result
+
+    mocker.patch.object(api_client._StreamProcessor, "feed", recording_feed)
+    response = MagicMock(is_error=False, status_code=200)
+    response.aiter_bytes = aiter_bytes
+    response.aclose = AsyncMock()
+    client = MagicMock()
+    client.send = AsyncMock(return_value=response)
+
+    text, _ = asyncio.run(
+        api_client.perform_chat_request_async(
+            mock_openai_engine, "gpt", [], None, 100, True, print_stream=False, client=client
+        )
+    )
+
+    assert text == "Hello"
+    assert events[:4] == [
+        ("read", "Hel"),
+        ("text", "Hel"),
+        ("read", "lo"),
+        ("text", "Hello"),
+    ]
+
+
+def test_perform_chat_request_async_http_error(mock_httpx, mock_openai_engine):
+    """Tests that HTTP error statuses are reported like the sync path."""
+    response = MagicMock(is_error=True, status_code=429)
+    response.json.return_value = {"error": {"message": "Slow down"}}
+    client = MagicMock()
+    client.send = AsyncMock(return_value=response)
+
+    with pytest.raises(api_client.RateLimitedError, match="Slow down"):
+        asyncio.run(
+            api_client._make_api_request_async(client, "https://test.com", {}, {})
+        )
+
+
+def test_create_async_client_requires_httpx(mocker):
+    """Tests that the async API reports the missing optional dependency."""
+    mocker.patch("aiterm.api_client.httpx", None)
+    with pytest.raises(ApiRequestError, match="httpx"):
+        api_client.create_async_client()
+
+
+def _http2_response(status_code, headers=None):
+    response = MagicMock(status_code=status_code, headers=headers or {})
+    response.content = b'{"success": true}'
+    return response
+
+
+def test_http2_post_retries_transient_statuses(mocker, mock_httpx):
+    """Tests that HTTP/2 POSTs follow the same status retry policy as requests."""
+    mock_sleep = mocker.patch("aiterm.api_client.time.sleep")
+    client = mock_httpx.Client.return_value
+    client.build_request.return_value = MagicMock(method="POST")
+    busy = _http2_response(503)
+    limited = _http2_response(429, {"Retry-After": "3600"})
+    client.send.side_effect = [busy, limited, _http2_response(200)]
+
+    assert make_api_request("https://test.com", {}, {}) == {"success": True}
+
+    assert client.send.call_count == 3
+    busy.close.assert_called_once()
+    limited.close.assert_called_once()
+    # The first retry is immediate; Retry-After is capped.
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [
+        0.0,
+        api_client._RETRY_AFTER_MAX,
+    ]
+
+
+def test_http2_post_gives_up_after_retry_budget(mocker, mock_httpx):
+    """Tests that the last retryable response is returned once retries run out."""
+    mocker.patch("aiterm.api_client.time.sleep")
+    client = mock_httpx.Client.return_value
+    client.build_request.return_value = MagicMock(method="POST")
+    client.send.return_value = _http2_response(503)
+
+    response = api_client._send_with_retries(
+        client, client.build_request.return_value, stream=False
+    )
+
+    assert response.status_code == 503
+    assert client.send.call_count == api_client._RETRY_POLICY.total + 1
+
+
+def test_http2_get_reconnects_but_skips_status_retries(mocker, mock_httpx):
+    """Tests that connection failures are retried and GET statuses are not."""
+    mocker.patch("aiterm.api_client.time.sleep")
+    client = mock_httpx.Client.return_value
+    client.build_request.return_value = MagicMock(method="GET")
+    client.send.side_effect = [mock_httpx.ConnectError("refused"), _http2_response(503)]
+
+    response = api_client.http_get("https://test.com/models")
+
+    assert response.status_code == 503
+    assert client.send.call_count == 2
+
+
+def test_async_request_retries_rate_limit(mocker, mock_httpx):
+    """Tests that async requests retry a 429 before reporting it."""
+    mock_sleep = mocker.patch("aiterm.api_client.asyncio.sleep", new=AsyncMock())
+    limited = MagicMock(is_error=True, status_code=429, headers={"Retry-After": "2"})
+    limited.aclose = AsyncMock()
+    ok = MagicMock(is_error=False, status_code=200)
+    ok.content = b'{"success": true}'
+    client = MagicMock()
+    client.build_request.return_value = MagicMock(method="POST")
+    client.send = AsyncMock(side_effect=[limited, ok])
+
+    result = asyncio.run(
+        api_client._make_api_request_async(client, "https://test.com", {}, {})
+    )
+
+    assert result == {"success": True}
+    limited.aclose.assert_awaited_once()
+    mock_sleep.assert_awaited_once_with(2)
+
+
 def test_make_api_request_api_error_in_payload(mocker, mock_settings):
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("aiterm.api_client._session.post")
     mock_response = MagicMock()
-    mock_response.json.return_value = {"error": {"message": "API Error Occurred"}}
+    mock_response.content = b'{"error": {"message": "API Error Occurred"}}'
     mock_post.return_value = mock_response
 
     with pytest.raises(ApiRequestError, match="API Error Occurred"):
@@ -101,7 +442,7 @@ def test_make_api_request_api_error_in_payload(mocker, mock_settings):
 
 def test_make_api_request_http_error_with_json(mocker, mock_settings):
     """Test that an HTTP error with a valid JSON body is handled correctly."""
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("aiterm.api_client._session.post")
     mock_response = MagicMock()
     mock_response.json.return_value = {"error": {"message": "Invalid API key"}}
 
@@ -117,7 +458,7 @@ def test_make_api_request_http_error_with_json(mocker, mock_settings):
 
 def test_make_api_request_http_error_with_non_json(mocker, mock_settings):
     """Test that an HTTP error with a non-JSON body is handled."""
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("aiterm.api_client._session.post")
     mock_response = MagicMock()
     mock_response.json.side_effect = json.JSONDecodeError("msg", "doc", 0)
     mock_response.text = "Internal Server Error"
@@ -132,10 +473,50 @@ def test_make_api_request_http_error_with_non_json(mocker, mock_settings):
         make_api_request("http://test.com", {}, {})
 
 
+def test_make_api_request_rate_limited(mocker, mock_settings):
+    """Tests that a 429 that survives retries raises RateLimitedError."""
+    mock_post = mocker.patch("aiterm.api_client._session.post")
+    mock_response = MagicMock()
+    mock_response.status_code = 429
+    mock_response.json.return_value = {"error": {"message": "Rate limit reached"}}
+    http_error = requests.exceptions.HTTPError()
+    http_error.response = mock_response
+    mock_response.raise_for_status.side_effect = http_error
+    mock_post.return_value = mock_response
+
+    with pytest.raises(api_client.RateLimitedError, match="Rate limit reached"):
+        make_api_request("http://test.com", {}, {})
+
+
+def test_session_retries_transient_statuses():
+    """Tests that the shared session's adapter retries 429/5xx POSTs."""
+    retry = api_client.get_session().get_adapter("https://").max_retries
+    assert retry.total == 4
+    assert 429 in retry.status_forcelist
+    assert 503 in retry.status_forcelist
+    assert "POST" in retry.allowed_methods
+    assert retry.raise_on_status is False
+
+
+def test_session_does_not_retry_read_failures():
+    """Tests that a sent POST is not resent after a read timeout."""
+    retry = api_client.get_session().get_adapter("https://").max_retries
+    assert retry.read == 0
+    assert retry.connect > 0
+
+
+def test_session_caps_retry_after():
+    """Tests that a long Retry-After header cannot stall the client."""
+    retry = api_client.get_session().get_adapter("https://").max_retries
+    assert retry.parse_retry_after("3") == 3
+    assert retry.parse_retry_after("3600") == api_client._RETRY_AFTER_MAX
+    assert retry.new().parse_retry_after("3600") == api_client._RETRY_AFTER_MAX
+
+
 def test_make_api_request_connection_error(mocker, mock_settings):
     """Test that a generic RequestException is caught and wrapped."""
     mocker.patch(
-        "requests.post",
+        "aiterm.api_client._session.post",
         side_effect=requests.exceptions.RequestException("Connection failed"),
     )
     with pytest.raises(ApiRequestError, match="Connection failed"):
@@ -144,9 +525,9 @@ def test_make_api_request_connection_error(mocker, mock_settings):
 
 def test_make_api_request_success_with_bad_json(mocker, mock_settings):
     """Test handling of a 200 OK response with an invalid JSON body."""
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("aiterm.api_client._session.post")
     mock_response = MagicMock()
-    mock_response.json.side_effect = json.JSONDecodeError("msg", "doc", 0)
+    mock_response.content = b"<html>Bad Gateway</html>"
     mock_post.return_value = mock_response
 
     with pytest.raises(ApiRequestError, match="Failed to decode API response."):
@@ -156,7 +537,7 @@ def test_make_api_request_success_with_bad_json(mocker, mock_settings):
 def test_make_api_request_logs_on_failure(mocker, mock_settings, fake_fs):
     """Test that the request is logged even when an exception occurs."""
     mocker.patch(
-        "requests.post",
+        "aiterm.api_client._session.post",
         side_effect=requests.exceptions.RequestException("Connection failed"),
     )
     # Mock the log file path
@@ -185,6 +566,82 @@ def test_make_api_request_logs_on_failure(mocker, mock_settings, fake_fs):
     assert "Connection failed" in session_logs[0]["response"]["error"]
 
 
+def test_make_api_request_skips_logging_when_debug_inactive(mocker, mock_settings):
+    """Tests that no redaction or raw logging work is done when debug is off."""
+    mock_post = mocker.patch("aiterm.api_client._session.post")
+    mock_post.return_value.content = b'{"success": true}'
+    mock_redact = mocker.patch("aiterm.api_client.redact_sensitive_info")
+    mock_writer = mocker.patch("aiterm.api_client._raw_log_writer")
+
+    session_logs = []
+    make_api_request("http://test.com", {}, {}, session_raw_logs=session_logs)
+
+    mock_redact.assert_not_called()
+    mock_writer.put.assert_not_called()
+    assert session_logs == []
+
+
+def test_make_api_request_log_timestamp_is_utc_iso(mocker, mock_settings):
+    """Tests that the raw log timestamp is formatted as a UTC ISO string on write."""
+    mock_post = mocker.patch("aiterm.api_client._session.post")
+    mock_post.return_value.content = b'{"success": true}'
+    mocker.patch("aiterm.api_client.time.time_ns", return_value=1_700_000_000_000_000_000)
+    mocker.patch("aiterm.api_client._raw_log_writer")
+
+    session_logs = []
+    make_api_request(
+        "http://test.com", {}, {}, debug_active=True, session_raw_logs=session_logs
+    )
+
+    assert session_logs[0]["timestamp"] == "2023-11-14T22:13:20+00:00"
+
+
+def test_raw_log_writer_batches_entries(mocker):
+    """Tests that queued raw log entries are written as one NDJSON batch."""
+    mock_raw_logger = mocker.patch("aiterm.api_client.raw_api_logger")
+    writer = api_client._RawLogWriter(batch_size=16, interval=60.0)
+
+    writer.put({"n": 1})
+    writer.put({"n": 2})
+    writer.flush()
+
+    mock_raw_logger.info.assert_called_once_with('{"n": 1}\n{"n": 2}')
+
+
+def test_make_api_request_compresses_large_payload(mocker):
+    """Tests that large payloads are gzipped when compress_requests is enabled."""
+    mocker.patch(
+        "aiterm.api_client.settings", {"api_timeout": 10, "compress_requests": True}
+    )
+    mock_post = mocker.patch("aiterm.api_client._session.post")
+    mock_post.return_value.content = b'{"success": true}'
+    payload = {"messages": [{"role": "user", "content": "x" * 10_000}]}
+    headers = {"Authorization": "Bearer k"}
+
+    make_api_request("https://test.com", headers, payload)
+
+    kwargs = mock_post.call_args.kwargs
+    assert kwargs["headers"]["Content-Encoding"] == "gzip"
+    assert kwargs["headers"]["Authorization"] == "Bearer k"
+    assert json.loads(gzip.decompress(kwargs["data"])) == payload
+    assert "Content-Encoding" not in headers  # Caller's headers are untouched.
+
+
+def test_make_api_request_small_payload_not_compressed(mocker):
+    """Tests that small payloads are sent as plain JSON even with compression on."""
+    mocker.patch(
+        "aiterm.api_client.settings", {"api_timeout": 10, "compress_requests": True}
+    )
+    mock_post = mocker.patch("aiterm.api_client._session.post")
+    mock_post.return_value.content = b'{"success": true}'
+
+    make_api_request("https://test.com", {}, {"messages": []})
+
+    kwargs = mock_post.call_args.kwargs
+    assert kwargs["data"] == b'{"messages":[]}'
+    assert "Content-Encoding" not in kwargs["headers"]
+
+
 def test_setup_raw_logger_os_error(mocker, caplog):
     """Tests that the raw logger setup handles an OSError during file handler creation."""
     mocker.patch(
@@ -228,6 +685,16 @@ def test_parse_token_counts_anthropic(mock_anthropic_chat_response):
     assert t == 36
 
 
+def test_parse_token_counts_unknown_engine(mock_openai_chat_response):
+    """Tests that an engine without a token parser reports zero usage."""
+    assert api_client._parse_token_counts("unknown", mock_openai_chat_response) == (
+        0,
+        0,
+        0,
+        0,
+    )
+
+
 def test_process_stream_openai(mock_streaming_response_factory):
     """Tests successful processing of an OpenAI stream."""
     openai_stream_chunks = [
@@ -277,6 +744,103 @@ def test_process_stream_anthropic(mock_streaming_response_factory):
     assert tokens == {"prompt": 10, "completion": 5, "reasoning": 0, "total": 15}
 
 
+def test_process_stream_ignores_non_data_lines(mock_streaming_response_factory):
+    """Tests that SSE 'event:' lines and empty data lines are skipped."""
+    anthropic_stream_chunks = [
+        "event: message_start",
+        'data: {"type": "message_start", "message": {"usage": {"input_tokens": 3}}}',
+        "",
+        "event: content_block_delta",
+        'data: {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}',
+        "data: ",
+        'data: {"type": "message_delta", "usage": {"output_tokens": 1}}',
+    ]
+    mock_response = mock_streaming_response_factory(anthropic_stream_chunks)
+    full_text, tokens = api_client._process_stream(
+        "anthropic", mock_response, print_stream=False
+    )
+    assert full_text == "Hi"
+    assert tokens == {"prompt": 3, "completion": 1, "reasoning": 0, "total": 4}
+
+
+def test_process_stream_gemini_missing_fields(mock_streaming_response_factory):
+    """Tests that Gemini events lacking text parts are skipped without error."""
+    gemini_stream_chunks = [
+        'data: {"candidates": [{"content": {"parts": [{"text": "Hi"}]}}]}',
+        'data: {"candidates": [{"finishReason": "STOP"}]}',
+        'data: {"candidates": []}',
+        'data: {"usageMetadata": {"promptTokenCount": 2, "candidatesTokenCount": 1, "totalTokenCount": 3}}',
+    ]
+    mock_response = mock_streaming_response_factory(gemini_stream_chunks)
+    full_text, tokens = api_client._process_stream(
+        "gemini", mock_response, print_stream=False
+    )
+    assert full_text == "Hi"
+    assert tokens == {"prompt": 2, "completion": 1, "reasoning": 0, "total": 3}
+
+
+def test_process_stream_unknown_engine(mock_streaming_response_factory):
+    """Tests that an engine without a stream extractor yields an empty result."""
+    mock_response = mock_streaming_response_factory(['data: {"text": "Hi"}'])
+    full_text, tokens = api_client._process_stream(
+        "unknown", mock_response, print_stream=False
+    )
+    assert full_text == ""
+    assert tokens == {"prompt": 0, "completion": 0, "reasoning": 0, "total": 0}
+
+
+def test_stream_writer_coalesces_small_deltas(mocker):
+    """Tests that small deltas are buffered until a size or newline boundary."""
+    mock_stdout = mocker.patch("aiterm.api_client.sys.stdout")
+    writer = api_client._StreamWriter(flush_bytes=8, flush_ms=60_000)
+    writer.write("ab")
+    writer.write("cd")
+    mock_stdout.write.assert_not_called()
+    writer.write("efgh")  # Reaches the size threshold.
+    mock_stdout.write.assert_called_once_with("abcdefgh")
+    writer.write("x\n")  # Newline forces a flush.
+    mock_stdout.write.assert_called_with("x\n")
+    writer.write("tail")
+    writer.flush()
+    mock_stdout.write.assert_called_with("tail")
+    assert mock_stdout.write.call_count == 3
+
+
+def test_stream_writer_flushes_after_interval(mocker):
+    """Tests that a delta arriving after 'flush_ms' flushes the held text."""
+    mock_stdout = mocker.patch("aiterm.api_client.sys.stdout")
+    mock_time = mocker.patch("aiterm.api_client.time.monotonic", return_value=10.0)
+    writer = api_client._StreamWriter(flush_bytes=1024, flush_ms=30)
+
+    writer.write("ab")
+    mock_time.return_value = 10.02  # Within the interval: still held.
+    writer.write("cd")
+    mock_stdout.write.assert_not_called()
+
+    mock_time.return_value = 10.05  # Past the interval since the last flush.
+    writer.write("ef")
+    mock_stdout.write.assert_called_once_with("abcdef")
+
+    mock_time.return_value = 10.06
+    writer.write("gh")  # The interval restarts from the flush.
+    mock_stdout.write.assert_called_once()
+
+
+def test_fast_openai_content_extracts_plain_deltas():
+    """Tests the regex fast path for OpenAI-compatible text deltas."""
+    line = b'{"choices":[{"index":0,"delta":{"content":"Say \\"hi\\"\\n\xc3\xa9"}}],"usage":null}'
+    assert api_client._fast_openai_content(line) == 'Say "hi"\n\u00e9'
+
+
+def test_fast_openai_content_defers_to_full_parse():
+    """Tests that events which may carry more than text are left to json parsing."""
+    usage_line = b'{"choices":[],"usage":{"prompt_tokens":1}}'
+    reasoning_line = b'{"choices":[{"delta":{"content":"","reasoning":"hmm"}}]}'
+    null_line = b'{"choices":[{"delta":{"content":null}}]}'
+    for line in (usage_line, reasoning_line, null_line):
+        assert api_client._fast_openai_content(line) is None
+
+
 def test_process_stream_malformed_json(mock_streaming_response_factory, capsys):
     """Tests that a malformed JSON chunk in a stream is skipped gracefully."""
     openai_stream_chunks = [
@@ -292,15 +856,29 @@ def test_process_stream_malformed_json(mock_streaming_response_factory, capsys):
     assert full_text == "Hello"
 
 
+def test_iter_sse_lines_reassembles_split_lines():
+    """Tests that lines split across read blocks are reassembled."""
+    response = MagicMock(spec=requests.Response)
+    response.iter_content.return_value = iter(
+        [b"data: he", b"llo\r\n\ndata: wor", b"", b"ld\ndata: tail"]
+    )
+    assert list(api_client._iter_sse_lines(response)) == [
+        b"data: hello\r",
+        b"",
+        b"data: world",
+        b"data: tail",
+    ]
+
+
 def test_process_stream_request_exception(mocker, caplog):
     """Tests that a RequestException during stream iteration is handled."""
 
-    def iter_lines_with_error(*args, **kwargs):
-        yield b'data: {"candidates": [{"content": {"parts": [{"text": "Hello"}]}}]}'
+    def iter_content_with_error(*args, **kwargs):
+        yield b'data: {"candidates": [{"content": {"parts": [{"text": "Hello"}]}}]}\n'
         raise requests.exceptions.RequestException("Network hiccup")
 
     mock_response = MagicMock(spec=requests.Response)
-    mock_response.iter_lines.side_effect = iter_lines_with_error
+    mock_response.iter_content.side_effect = iter_content_with_error
 
     with caplog.at_level(logging.WARNING):
         full_text, _ = api_client._process_stream(
@@ -313,12 +891,12 @@ def test_process_stream_request_exception(mocker, caplog):
 def test_process_stream_keyboard_interrupt(mock_streaming_response_factory):
     """Tests that a KeyboardInterrupt during streaming is handled gracefully."""
 
-    def iter_lines_with_interrupt(*args, **kwargs):
-        yield b'data: {"choices": [{"delta": {"content": "Hello"}}]}'
+    def iter_content_with_interrupt(*args, **kwargs):
+        yield b'data: {"choices": [{"delta": {"content": "Hello"}}]}\n'
         raise KeyboardInterrupt
 
     mock_response = MagicMock(spec=requests.Response)
-    mock_response.iter_lines.side_effect = iter_lines_with_interrupt
+    mock_response.iter_content.side_effect = iter_content_with_interrupt
 
     full_text, tokens = api_client._process_stream(
         "openai", mock_response, print_stream=False
@@ -11,9 +11,10 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
-from aiterm import commands, config
+from aiterm import chat_ui, commands, config
 from aiterm.api_client import ApiRequestError
 from aiterm.personas import Persona
+from aiterm.utils.log_writer import chat_log_writer
 from prompt_toolkit.history import InMemoryHistory
 from prompt_toolkit.styles import Style
 
@@ -41,6 +42,21 @@ class TestSingleChatUI:
         assert not style.style_rules
         assert "Invalid theme style format" in caplog.text
 
+    def test_create_style_from_theme_is_memoized(self, mocker, mock_chat_ui):
+        """Tests that identical theme styles reuse one parsed Style object."""
+        mocker.patch(
+            "aiterm.chat_ui.theme_manager.ACTIVE_THEME",
+            {"style_bottom_toolbar_background": "bg:#222 #eee"},
+        )
+        first = mock_chat_ui._create_style_from_theme()
+        assert mock_chat_ui._create_style_from_theme() is first
+
+        mocker.patch(
+            "aiterm.chat_ui.theme_manager.ACTIVE_THEME",
+            {"style_bottom_toolbar_background": "bg:#333 #ddd"},
+        )
+        assert mock_chat_ui._create_style_from_theme() is not first
+
     def test_get_bottom_toolbar_content_full(
         self, mocker, mock_chat_ui, mock_prompt_toolkit_app
     ):
@@ -106,6 +122,177 @@ class TestSingleChatUI:
         assert "Model: gemini-1.5-flash" not in content_text
         assert "Session I/O" not in content_text
 
+    def test_get_bottom_toolbar_content_skips_disabled_live_tokens(
+        self, mocker, mock_chat_ui, mock_prompt_toolkit_app
+    ):
+        """Tests that context tokens are not estimated when the live component is off."""
+        mocker.patch(
+            "aiterm.chat_ui.app_settings.settings",
+            {
+                "toolbar_show_total_io": True,
+                "toolbar_show_model": True,
+                "toolbar_show_persona": False,
+                "toolbar_show_live_tokens": False,
+                "toolbar_priority_order": "tokens,live,model,io",
+                "toolbar_separator": " | ",
+            },
+        )
+        mocker.patch(
+            "shutil.get_terminal_size", return_value=os.terminal_size((120, 24))
+        )
+        live_tokens = mocker.spy(mock_chat_ui, "_live_context_tokens")
+
+        content = mock_chat_ui._get_bottom_toolbar_content()
+        content_text = "".join([part[1] for part in content])
+
+        assert "Live Context" not in content_text
+        assert "Model: gemini-1.5-flash" in content_text
+        live_tokens.assert_not_called()
+
+    def test_get_bottom_toolbar_content_reused_while_idle(
+        self, mocker, mock_chat_ui, mock_prompt_toolkit_app
+    ):
+        """Tests that periodic redraws of an idle prompt reuse the toolbar."""
+        mocker.patch(
+            "aiterm.chat_ui.app_settings.settings",
+            {
+                "toolbar_show_total_io": True,
+                "toolbar_show_model": True,
+                "toolbar_show_persona": False,
+                "toolbar_show_live_tokens": True,
+                "toolbar_priority_order": "tokens,live,model,io",
+                "toolbar_separator": " | ",
+            },
+        )
+        mock_time = mocker.patch("aiterm.chat_ui.time.monotonic", return_value=100.0)
+        build = mocker.spy(mock_chat_ui, "_build_toolbar_from_components")
+        live_tokens = mocker.spy(mock_chat_ui, "_live_context_tokens")
+        mock_prompt_toolkit_app["app"].current_buffer.text = "draft"
+
+        first = mock_chat_ui._get_bottom_toolbar_content()
+        # Idle refresh ticks, well past prompt_toolkit's refresh interval.
+        for tick in range(1, 4):
+            mock_time.return_value = 100.0 + tick
+            assert mock_chat_ui._get_bottom_toolbar_content() is first
+        assert build.call_count == 1
+        assert live_tokens.call_count == 1
+
+        # Typing rebuilds it...
+        mock_prompt_toolkit_app["app"].current_buffer.text = "draft more"
+        mock_chat_ui._get_bottom_toolbar_content()
+        assert build.call_count == 2
+
+        # ...and so does a finished turn.
+        mock_chat_ui.session.state.history.append({"role": "user", "content": "hi"})
+        mock_chat_ui._get_bottom_toolbar_content()
+        assert build.call_count == 3
+
+    def test_terminal_width_is_cached_until_resize_or_ttl(self, mocker, mock_chat_ui):
+        """Tests that the width is re-queried only after a resize or the TTL."""
+        get_size = mocker.patch(
+            "shutil.get_terminal_size", return_value=os.terminal_size((80, 24))
+        )
+        mock_time = mocker.patch("aiterm.chat_ui.time.monotonic", return_value=10.0)
+
+        assert mock_chat_ui._terminal_width() == 80
+        assert mock_chat_ui._terminal_width() == 80
+        assert get_size.call_count == 1
+
+        mocker.patch("aiterm.chat_ui._resize_generation", 99)
+        get_size.return_value = os.terminal_size((100, 24))
+        assert mock_chat_ui._terminal_width() == 100
+        assert get_size.call_count == 2
+
+        mock_time.return_value = 20.0
+        mock_chat_ui._terminal_width()
+        assert get_size.call_count == 3
+
+    def test_resize_handler_installed_once_and_chained(self, mocker):
+        """Tests that the SIGWINCH handler is installed once and chains."""
+        previous = MagicMock()
+        mocker.patch.object(chat_ui, "_resize_handler_installed", False)
+        mocker.patch.object(chat_ui, "_resize_generation", 0)
+        mocker.patch("aiterm.chat_ui.signal.getsignal", return_value=previous)
+        install = mocker.patch("aiterm.chat_ui.signal.signal")
+
+        chat_ui._install_resize_handler()
+        chat_ui._install_resize_handler()
+        install.assert_called_once()
+
+        handler = install.call_args.args[1]
+        handler(28, None)
+        assert chat_ui._resize_generation == 1
+        previous.assert_called_once_with(28, None)
+
+    def test_resize_handler_outside_main_thread(self, mocker):
+        """Tests that failing to install from a worker thread is tolerated."""
+        mocker.patch.object(chat_ui, "_resize_handler_installed", False)
+        mocker.patch("aiterm.chat_ui.signal.signal", side_effect=ValueError)
+
+        chat_ui._install_resize_handler()
+        assert chat_ui._resize_handler_installed is False
+
+    def test_parse_toolbar_order_reuses_parsed_tuple(self, mock_chat_ui):
+        """Tests that the priority order is re-split only when the setting changes."""
+        first = mock_chat_ui._parse_toolbar_order("tokens,live,model")
+        assert first == ("tokens", "live", "model")
+        assert mock_chat_ui._parse_toolbar_order("tokens,live,model") is first
+        assert mock_chat_ui._parse_toolbar_order("model,tokens") == ("model", "tokens")
+
+    def test_toolbar_separator_follows_setting(self, mocker, mock_chat_ui):
+        """Tests that the cached separator is refreshed when the setting changes."""
+        settings = {"toolbar_separator": " | "}
+        mocker.patch("aiterm.chat_ui.app_settings.settings", settings)
+        assert mock_chat_ui._toolbar_separator() == (" | ", 3)
+
+        settings["toolbar_separator"] = " • "
+        assert mock_chat_ui._toolbar_separator() == (" • ", 3)
+
+    def test_history_token_count_is_incremental(self, mocker, mock_chat_ui):
+        """Tests that only new messages are estimated and resets are detected."""
+        spy = mocker.patch("aiterm.chat_ui.estimate_token_count", return_value=2)
+        history = mock_chat_ui.session.state.history
+        history.extend(
+            [
+                {"role": "user", "parts": [{"text": "hi"}]},
+                {"role": "model", "parts": [{"text": "hello"}]},
+            ]
+        )
+
+        assert mock_chat_ui._history_token_count() == 4
+        assert mock_chat_ui._history_token_count() == 4
+        assert spy.call_count == 2
+
+        history.append({"role": "user", "parts": [{"text": "more"}]})
+        assert mock_chat_ui._history_token_count() == 6
+        assert spy.call_count == 3
+
+        # Clearing and refilling to the same length must not reuse the total.
+        history.clear()
+        history.extend([{"role": "user", "parts": [{"text": "x"}]}] * 3)
+        assert mock_chat_ui._history_token_count() == 6
+        assert spy.call_count == 6
+
+        mock_chat_ui.session.state.history = history[:1]
+        assert mock_chat_ui._history_token_count() == 2
+
+    def test_history_token_count_reuses_counts_after_replacement(
+        self, mocker, mock_chat_ui
+    ):
+        """Tests that a replaced history only estimates messages not seen before."""
+        spy = mocker.patch("aiterm.chat_ui.estimate_token_count", return_value=2)
+        history = [{"role": "user", "content": str(i)} for i in range(6)]
+        mock_chat_ui.session.state.history = history
+        assert mock_chat_ui._history_token_count() == 12
+        assert spy.call_count == 6
+
+        # Condensing swaps in a new list: a summary plus the surviving turns.
+        summary = {"role": "user", "content": "summary"}
+        mock_chat_ui.session.state.history = [summary] + history[4:]
+        assert mock_chat_ui._history_token_count() == 6
+        assert spy.call_count == 7
+        assert len(mock_chat_ui._message_tokens) == 3
+
     def test_handle_slash_command_known(self, mocker, mock_chat_ui):
         """Tests that a known command is dispatched correctly."""
         mock_handler = mocker.MagicMock(return_value=False)
@@ -117,6 +304,27 @@ class TestSingleChatUI:
         assert result is False
         mock_handler.assert_called_once_with(["arg1", "arg2"], mock_chat_ui.session)
 
+    def test_handle_slash_command_normalizes_whitespace(self, mocker, mock_chat_ui):
+        """Tests that the command word is case-folded and args split on any space."""
+        mock_handler = mocker.MagicMock(return_value=False)
+        mocker.patch.dict(commands.COMMAND_MAP, {"/test": mock_handler})
+
+        mock_chat_ui._handle_slash_command("  /TEST\targ1   arg2 ", InMemoryHistory())
+        mock_chat_ui._handle_slash_command("/test", InMemoryHistory())
+
+        assert mock_handler.call_args_list[0].args[0] == ["arg1", "arg2"]
+        assert mock_handler.call_args_list[1].args[0] == []
+
+    def test_handle_slash_command_unknown_skips_arg_split(self, mocker, mock_chat_ui):
+        """Tests that arguments of an unknown command are never tokenized."""
+        mock_print = mocker.patch("builtins.print")
+        rest = mocker.MagicMock(spec=str)
+        mocker.patch("aiterm.chat_ui._split_command", return_value=("/nope", rest))
+
+        assert mock_chat_ui._handle_slash_command("/nope a b", InMemoryHistory()) is False
+        rest.split.assert_not_called()
+        assert "Unknown command: /nope" in mock_print.call_args[0][0]
+
     def test_handle_slash_command_save(self, mocker, mock_chat_ui):
         """Tests special handling for the /save command."""
         mock_save_handler = mocker.MagicMock(return_value=True)
@@ -147,6 +355,7 @@ class TestSingleChatUI:
         mock_chat_ui.session.state.model = "test-model"
 
         mock_chat_ui._log_turn(log_path)
+        chat_log_writer.flush()
 
         assert log_path.exists()
         with open(log_path) as f:
@@ -155,6 +364,22 @@ class TestSingleChatUI:
         assert data["prompt"]["content"] == "Hello"
         assert data["response"]["content"] == "Hi"
 
+    def test_log_turn_preserves_unicode(self, fake_fs, mock_chat_ui):
+        """Tests that non-ASCII turn content is written as UTF-8 JSON lines."""
+        log_path = config.CHATLOG_DIRECTORY / "test_log.jsonl"
+        mock_chat_ui.session.state.history = [
+            {"role": "user", "content": "Grüße"},
+            {"role": "assistant", "content": "こんにちは"},
+        ]
+
+        mock_chat_ui._log_turn(log_path)
+        mock_chat_ui._log_turn(log_path)
+        chat_log_writer.flush()
+
+        lines = log_path.read_bytes().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["response"]["content"] == "こんにちは"
+
     @pytest.mark.skipif(
         sys.platform == "win32", reason="Permission tests are POSIX-specific"
     )
@@ -165,6 +390,7 @@ class TestSingleChatUI:
         mock_chat_ui.session.state.history = [{"role": "user"}, {"role": "assistant"}]
 
         mock_chat_ui._log_turn(log_path)
+        chat_log_writer.flush()
         assert "Could not write to session log file" in caplog.text
 
     def test_run_loop_keyboard_interrupt(self, mocker, mock_chat_ui):
@@ -191,6 +417,48 @@ class TestSingleChatUI:
 
         mock_chat_ui.session.take_turn.assert_not_called()
 
+    def test_run_loop_erases_empty_input_line(self, mocker, mock_chat_ui):
+        """Tests that empty input is erased with one write followed by a flush."""
+        mock_ps_cls = mocker.patch("aiterm.chat_ui.PromptSession")
+        mock_ps_instance = mock_ps_cls.return_value
+        mock_ps_instance.prompt.side_effect = ["", KeyboardInterrupt]
+        mock_ps_instance.history = InMemoryHistory()
+        mock_stdout = mocker.patch("aiterm.chat_ui.sys.stdout")
+
+        mock_chat_ui.run()
+
+        calls = mock_stdout.mock_calls
+        erase = calls.index(mocker.call.write("\x1b[1A\x1b[2K"))
+        assert calls[erase + 1] == mocker.call.flush()
+
+    def test_run_loop_caps_loaded_command_history(self, mocker, mock_chat_ui):
+        """Tests that only the most recent command history entries are loaded."""
+        mocker.patch("aiterm.chat_ui.PromptSession").return_value.prompt.side_effect = (
+            KeyboardInterrupt
+        )
+        mock_history_cls = mocker.patch("aiterm.chat_ui.InMemoryHistory")
+        mock_chat_ui.session.state.command_history = [
+            str(i) for i in range(config.COMMAND_HISTORY_LIMIT + 5)
+        ]
+
+        mock_chat_ui.run()
+
+        loaded = mock_history_cls.call_args.args[0]
+        assert len(loaded) == config.COMMAND_HISTORY_LIMIT
+        assert loaded[0] == "5"
+
+    def test_run_loop_reuses_parsed_prompt(self, mocker, mock_chat_ui):
+        """Tests that the ANSI prompt is parsed once, not on every iteration."""
+        mock_ps_cls = mocker.patch("aiterm.chat_ui.PromptSession")
+        mock_ps_instance = mock_ps_cls.return_value
+        mock_ps_instance.prompt.side_effect = ["", "", KeyboardInterrupt]
+        mock_ps_instance.history = InMemoryHistory()
+
+        mock_chat_ui.run()
+
+        prompts = [c.args[0] for c in mock_ps_instance.prompt.call_args_list]
+        assert all(p is mock_chat_ui._ansi_prompt for p in prompts)
+
     def test_run_loop_slash_command(self, mocker, mock_chat_ui):
         """Test that the run loop correctly handles a slash command."""
         mock_handler = MagicMock()
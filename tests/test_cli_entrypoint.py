@@ -7,7 +7,7 @@ import io
 import sys
 
 import pytest
-from aiterm import cli, handlers, review
+from aiterm import bootstrap, cli, handlers, review
 
 
 @pytest.fixture(autouse=True)
@@ -118,3 +118,38 @@ class TestCLIEntrypoint:
         handlers.handle_chat.assert_called_once()
         call_args, _ = handlers.handle_chat.call_args
         assert call_args[0] == "hello from chat"
+
+    def test_chat_invocation_skips_top_level_parser(self, mocker, monkeypatch):
+        """Tests that chat runs reuse the cached chat parser and skip subparsers."""
+        build_parser = mocker.spy(cli, "_build_parser")
+        monkeypatch.setattr(sys, "argv", ["aiterm", "--prompt", "hello"])
+        cli.main()
+        cli.main()
+
+        build_parser.assert_not_called()
+        assert cli._build_chat_parser() is cli._build_chat_parser()
+
+    def test_usage_error_exits_before_bootstrap(self, monkeypatch):
+        """Tests that argument errors exit before any project files are touched."""
+        monkeypatch.setattr(sys, "argv", ["aiterm", "--max-tokens", "lots"])
+        with pytest.raises(SystemExit):
+            cli.main()
+        bootstrap.ensure_project_structure.assert_not_called()
+
+    def test_missing_files_are_all_reported(self, monkeypatch, capsys, tmp_path):
+        """Tests that every missing -f path is reported before exiting."""
+        existing = tmp_path / "present.txt"
+        existing.write_text("ok")
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["aiterm", "-p", "hi", "-f", "gone1", "-f", str(existing), "-f", "gone2"],
+        )
+        with pytest.raises(SystemExit) as excinfo:
+            cli.main()
+        assert excinfo.value.code == 1
+        err = capsys.readouterr().err
+        assert "'gone1' does not exist" in err
+        assert "'gone2' does not exist" in err
+        assert "present.txt" not in err
+        handlers.handle_chat.assert_not_called()
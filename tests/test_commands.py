@@ -3,10 +3,13 @@
 Tests for the interactive command handlers in aiterm/commands.py.
 """
 
+import copy
 import json
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import pytest
+
 from aiterm import api_client, commands, config
 from aiterm.engine import GeminiEngine, OpenAICompatibleEngine
 from aiterm.managers.context_manager import Attachment
@@ -102,6 +105,17 @@ class TestCommands:
         captured = capsys.readouterr()
         assert "Model set to: gemini-pro" in captured.out
 
+    def test_handle_model_refresh(self, mocker, mock_session_manager):
+        """Tests that '/model --refresh' re-fetches the list in the picker."""
+        mock_select = mocker.patch(
+            "aiterm.commands.select_model", return_value="gemini-pro"
+        )
+        commands.handle_model(["--refresh"], mock_session_manager)
+        mock_select.assert_called_once_with(
+            mock_session_manager.state.engine, "chat", refresh=True
+        )
+        assert mock_session_manager.state.model == "gemini-pro"
+
     def test_handle_engine_switch(self, mocker, mock_openai_session_manager, capsys):
         """Tests a successful switch of the AI engine."""
         # Initial state is openai engine from fixture
@@ -179,6 +193,33 @@ class TestCommands:
         assert "Attached Text Files: 1 (3.00 B)" in captured.out
         assert "System Prompt: Active" in captured.out
 
+    def test_handle_state_skips_missing_attachments(
+        self, mock_session_manager, fake_fs, capsys
+    ):
+        """Tests that attachments deleted from disk don't break the size total."""
+        present = config.DATA_DIR / "present.txt"
+        present.write_text("12345")
+        for path in (present, config.DATA_DIR / "deleted.txt"):
+            mock_session_manager.state.attachments[path] = Attachment(
+                content="x", mtime=1.0
+            )
+
+        commands.handle_state([], mock_session_manager)
+        assert "Attached Text Files: 2 (5.00 B)" in capsys.readouterr().out
+
+    def test_handle_state_uses_recorded_sizes(
+        self, mocker, mock_session_manager, capsys
+    ):
+        """Tests that attachments with a recorded size are not stat'ed."""
+        mock_session_manager.state.attachments[Path("/fake/file.txt")] = Attachment(
+            content="abc", mtime=1.0, size=2048
+        )
+        mock_stat = mocker.patch("pathlib.Path.stat")
+
+        commands.handle_state([], mock_session_manager)
+        mock_stat.assert_not_called()
+        assert "Attached Text Files: 1 (2.00 KB)" in capsys.readouterr().out
+
     def test_handle_save_auto_name(self, mocker, mock_session_manager, fake_fs):
         """Tests that /save with no name calls the AI for a name."""
         # Use mocker.patch.object to mock the method on the real SessionManager instance
@@ -219,6 +260,41 @@ class TestCommands:
         captured = capsys.readouterr()
         assert "Error saving session: Permission denied" in captured.out
 
+    def test_handle_save_does_not_deep_copy_state(
+        self, mocker, mock_session_manager, fake_fs
+    ):
+        """Tests that saving references the live state instead of deep-copying it."""
+        deepcopy = mocker.spy(copy, "deepcopy")
+        mock_session_manager.state.history = [{"role": "user", "content": "hi"}]
+        commands.handle_save(["snap"], mock_session_manager, InMemoryHistory())
+
+        deepcopy.assert_not_called()
+        saved = json.loads((config.SESSIONS_DIRECTORY / "snap.json").read_text())
+        assert saved["history"] == [{"role": "user", "content": "hi"}]
+        assert saved["engine_name"] == "gemini"
+        assert "engine" not in saved
+
+    def test_handle_save_stay_reports_background_failure(
+        self, mocker, mock_session_manager, fake_fs, capsys
+    ):
+        """Tests that a failed background save with --stay is still reported."""
+        mocker.patch("os.replace", side_effect=OSError("Disk full"))
+        result = commands.handle_save(
+            ["my-session", "--stay"], mock_session_manager, InMemoryHistory()
+        )
+        commands.wait_for_pending_saves()
+
+        assert result is False
+        out = capsys.readouterr().out
+        assert "Saving session to:" in out
+        # Nothing is printed from the save worker while a prompt may be active...
+        assert "Error saving session" not in out
+
+        # ...the failure is reported once the UI loop asks for it.
+        commands.report_failed_saves()
+        assert "Error saving session: Disk full" in capsys.readouterr().out
+        assert not list(config.SESSIONS_DIRECTORY.iterdir())
+
     def test_handle_save_with_flags(self, mock_session_manager, fake_fs):
         """Tests the --stay and --remember flags for /save."""
         mock_history = InMemoryHistory()
@@ -227,6 +303,7 @@ class TestCommands:
         )
         assert result is False  # --stay returns False to keep session running
         assert mock_session_manager.state.exit_without_memory is False  # --remember
+        commands.wait_for_pending_saves()
         # The filename "test-session" is sanitized to "test_session"
         saved_file = config.SESSIONS_DIRECTORY / "test_session.json"
         assert saved_file.exists()
@@ -265,6 +342,38 @@ class TestCommands:
         captured = capsys.readouterr()
         assert "Cannot load a multi-chat session here" in captured.out
 
+    def test_handle_load_rehydrates_attachments(
+        self, mocker, mock_session_manager, fake_fs
+    ):
+        """Tests that loaded attachments come back as an indexed AttachmentMap."""
+        mocker.patch("aiterm.api_client.check_api_keys", return_value="key")
+        session_file = config.SESSIONS_DIRECTORY / "with_files.json"
+        session_file.write_text(
+            json.dumps(
+                {
+                    "engine_name": "gemini",
+                    "model": "gemini-1.5-flash",
+                    "system_prompt": None,
+                    "initial_system_prompt": None,
+                    "max_tokens": 1024,
+                    "memory_enabled": False,
+                    "attachments": {
+                        "/a/notes.md": {"content": "one", "mtime": 1.0},
+                        "/b/notes.md": {"content": "two", "mtime": 2.0},
+                    },
+                    "persona_attachments": ["/b/notes.md"],
+                }
+            )
+        )
+        assert commands.handle_load(["with_files"], mock_session_manager) is True
+        attachments = mock_session_manager.state.attachments
+        assert attachments[Path("/b/notes.md")] == Attachment(content="two", mtime=2.0)
+        assert attachments.paths_named("notes.md") == [
+            Path("/a/notes.md"),
+            Path("/b/notes.md"),
+        ]
+        assert mock_session_manager.state.persona_attachments == {Path("/b/notes.md")}
+
     def test_handle_image_delegates_to_workflow(self, mock_session_manager):
         """Tests that the /image command delegates to the image workflow."""
         args = ["a", "test", "prompt"]
@@ -287,6 +396,37 @@ class TestCommands:
         assert "--- Content of file.txt ---" in captured.out
         assert "hello world" in captured.out
 
+    def test_handle_print_duplicate_names(self, mock_session_manager, capsys):
+        """Tests /print shows every attachment sharing the requested name."""
+        mock_session_manager.state.attachments.update(
+            {
+                Path("/a/notes.md"): Attachment(content="first", mtime=1.0),
+                Path("/b/notes.md"): Attachment(content="second", mtime=1.0),
+            }
+        )
+        commands.handle_print(["notes.md"], mock_session_manager)
+        captured = capsys.readouterr()
+        assert "2 attached files are named 'notes.md'" in captured.out
+        assert "--- Content of /a/notes.md ---" in captured.out
+        assert "first" in captured.out and "second" in captured.out
+
+    @pytest.mark.parametrize(
+        "args, expected",
+        [([], ""), (["notes.md"], "notes.md"), (["my", "notes.md"], "my notes.md")],
+    )
+    def test_arg_string(self, args, expected):
+        """Tests that command arguments are rejoined with single spaces."""
+        assert commands._arg_string(args) == expected
+
+    def test_parse_save_args(self):
+        """Tests that /save flags are extracted and the rest forms the filename."""
+        assert commands._parse_save_args(["--stay", "my", "log", "--remember"]) == (
+            "my log",
+            True,
+            True,
+        )
+        assert commands._parse_save_args(["notes"]) == ("notes", False, False)
+
     def test_handle_print_file_not_found(self, mock_session_manager, capsys):
         """Tests /print for a file that is not attached."""
         commands.handle_print(["nonexistent.txt"], mock_session_manager)
@@ -478,7 +618,7 @@ class TestCommands:
     ):
         """Tests `/toolbar on` and `/toolbar off`."""
         mock_save = mocker.patch(
-            "aiterm.commands.save_setting", return_value=(True, "OK")
+            "aiterm.commands.save_setting_deferred", return_value=(True, "OK")
         )
         commands.handle_toolbar(["on"], mock_session_manager)
         mock_save.assert_called_with("toolbar_enabled", "on")
@@ -493,7 +633,7 @@ class TestCommands:
         """Tests `/toolbar toggle <component>`."""
         mocker.patch("aiterm.commands.settings", {"toolbar_show_model": True})
         mock_save = mocker.patch(
-            "aiterm.commands.save_setting", return_value=(True, "OK")
+            "aiterm.commands.save_setting_deferred", return_value=(True, "OK")
         )
         commands.handle_toolbar(["toggle", "model"], mock_session_manager)
         # Should toggle from True to False
@@ -623,6 +763,17 @@ class TestMultiChatCommands:
         captured = capsys.readouterr()
         assert "OpenAI model set to: gpt-4-turbo" in captured.out
 
+    def test_handle_multichat_history(self, mock_multichat_session, capsys):
+        """Tests that /history prints the shared history in order."""
+        mock_multichat_session.state.shared_history = [
+            construct_user_message("openai", "Director to All: hi", []),
+            construct_assistant_message("openai", "[OpenAI]: hello"),
+        ]
+        commands.handle_multichat_history([], mock_multichat_session, None)
+        out = capsys.readouterr().out
+        assert "Shared Conversation History" in out
+        assert out.index("Director to All: hi") < out.index("[OpenAI]: hello")
+
     def test_handle_multichat_clear(self, mock_multichat_session, mock_prompt_toolkit):
         """Tests /clear for multi-chat."""
         mock_multichat_session.state.shared_history = ["some history"]
@@ -9,7 +9,21 @@ from unittest.mock import MagicMock
 
 import pytest
 import requests
-from aiterm.engine import AnthropicEngine, GeminiEngine, OpenAICompatibleEngine, get_engine
+from aiterm.engine import (
+    AnthropicEngine,
+    GeminiEngine,
+    OpenAICompatibleEngine,
+    clear_model_cache,
+    get_engine,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_model_cache():
+    """Keeps fetched model lists from leaking between tests."""
+    clear_model_cache()
+    yield
+    clear_model_cache()
 
 
 class TestEngines:
@@ -32,6 +46,13 @@ class TestEngines:
         with pytest.raises(ValueError):
             get_engine("unknown_engine", "fake_key")
 
+    def test_get_engine_reuses_instance_per_name_and_key(self):
+        """Tests that engines are shared per (name, key) pair."""
+        engine = get_engine("gemini", "shared_key")
+        assert get_engine("gemini", "shared_key") is engine
+        assert get_engine("gemini", "other_key") is not engine
+        assert get_engine("openai", "shared_key") is not engine
+
     @pytest.mark.parametrize("provider_id", ["openai", "groq"])
     def test_openai_compatible_build_chat_payload(self, provider_id):
         """Tests that chat payloads are constructed correctly for older/standard models."""
@@ -48,6 +69,14 @@ class TestEngines:
         assert "max_completion_tokens" not in payload
         assert len(payload["messages"]) == 2
         assert payload["messages"][0] == {"role": "system", "content": "Be brief."}
+        assert messages == [{"role": "user", "content": "Hello"}]  # Caller's list untouched
+
+    def test_openai_compatible_build_chat_payload_without_system_prompt(self):
+        """Tests that the history is passed through uncopied with no system prompt."""
+        engine = OpenAICompatibleEngine("openai", "fake_key")
+        messages = [{"role": "user", "content": "Hello"}]
+        payload = engine.build_chat_payload(messages, None, None, False, "gpt-4o")
+        assert payload["messages"] is messages
 
     @pytest.mark.parametrize("provider_id", ["openai", "groq"])
     def test_openai_compatible_build_chat_payload_max_completion_tokens(self, provider_id):
@@ -102,7 +131,7 @@ class TestEngines:
         mock_response.raise_for_status.side_effect = (
             requests.exceptions.RequestException("HTTP Error")
         )
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("aiterm.api_client._session.get", return_value=mock_response)
 
         with caplog.at_level(logging.WARNING):
             models = engine.fetch_available_models("chat")
@@ -122,7 +151,7 @@ class TestEngines:
                 {"id": "gpt-3.5-turbo"},
             ]
         }
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("aiterm.api_client._session.get", return_value=mock_response)
 
         chat_models = engine.fetch_available_models("chat")
         assert sorted(chat_models) == ["gpt-3.5-turbo", "gpt-4o-mini"]
@@ -140,6 +169,20 @@ class TestEngines:
         assert engine.get_chat_url("some-model", stream=False) == expected_url
         assert engine.get_chat_url("some-model", stream=True) == expected_url
 
+    def test_gemini_get_chat_url(self, mock_gemini_engine):
+        """Tests Gemini URL resolution for streaming and non-streaming calls."""
+        base = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro"
+        assert (
+            mock_gemini_engine.get_chat_url("gemini-pro", stream=True)
+            == f"{base}:streamGenerateContent?key=fake_gemini_key&alt=sse"
+        )
+        assert (
+            mock_gemini_engine.get_chat_url("gemini-pro", stream=False)
+            == f"{base}:generateContent?key=fake_gemini_key"
+        )
+        url = mock_gemini_engine.get_chat_url("gemini-pro", stream=True)
+        assert mock_gemini_engine.get_chat_url("gemini-pro", stream=True) is url
+
     @pytest.mark.parametrize("provider_id", ["openai", "groq"])
     def test_openai_compatible_get_headers(self, provider_id):
         """Tests header generation for OpenAI-compatible engines."""
@@ -148,6 +191,14 @@ class TestEngines:
         assert headers["Authorization"] == "Bearer fake_key"
         assert headers["Content-Type"] == "application/json"
 
+    def test_headers_are_built_once_per_engine(self, mocker):
+        """Tests that the cached headers property calls get_headers only once."""
+        engine = AnthropicEngine("fake_key")
+        spy = mocker.spy(engine, "get_headers")
+        assert engine.headers["x-api-key"] == "fake_key"
+        assert engine.headers is engine.headers
+        spy.assert_called_once()
+
     def test_gemini_build_chat_payload(self, mock_gemini_engine):
         """Tests that Gemini chat payloads are constructed correctly."""
         messages = [{"role": "user", "parts": [{"text": "Hello"}]}]
@@ -226,7 +277,7 @@ class TestEngines:
         mock_response.raise_for_status.side_effect = (
             requests.exceptions.RequestException("HTTP Error")
         )
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("aiterm.api_client._session.get", return_value=mock_response)
         with caplog.at_level(logging.WARNING):
             models = mock_gemini_engine.fetch_available_models("chat")
             assert models == []
@@ -244,7 +295,7 @@ class TestEngines:
         mock_response.raise_for_status.side_effect = (
             requests.exceptions.RequestException("HTTP Error")
         )
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("aiterm.api_client._session.get", return_value=mock_response)
 
         with caplog.at_level(logging.WARNING):
             models = mock_anthropic_engine.fetch_available_models("chat")
@@ -274,7 +325,7 @@ class TestEngines:
                 },
             ]
         }
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("aiterm.api_client._session.get", return_value=mock_response)
 
         chat_models = mock_gemini_engine.fetch_available_models("chat")
         assert sorted(chat_models) == [
@@ -291,7 +342,7 @@ class TestEngines:
                 {"id": "claude-3-opus-20240229"}
             ]
         }
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("aiterm.api_client._session.get", return_value=mock_response)
 
         chat_models = mock_anthropic_engine.fetch_available_models("chat")
         assert sorted(chat_models) == [
@@ -301,4 +352,45 @@ class TestEngines:
 
         # Anthropic doesn't support image generation models
         image_models = mock_anthropic_engine.fetch_available_models("image")
-        assert image_models == []
\ No newline at end of file
+        assert image_models == []
+
+    def test_fetch_available_models_is_cached(self, mock_gemini_engine, mocker):
+        """Tests that model lists are reused until refreshed or the TTL lapses."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "models": [
+                {
+                    "name": "models/gemini-pro",
+                    "supportedGenerationMethods": ["generateContent"],
+                }
+            ]
+        }
+        mock_get = mocker.patch(
+            "aiterm.api_client._session.get", return_value=mock_response
+        )
+
+        assert mock_gemini_engine.fetch_available_models("chat") == ["gemini-pro"]
+        assert mock_gemini_engine.fetch_available_models("chat") == ["gemini-pro"]
+        assert mock_get.call_count == 1
+
+        mock_gemini_engine.fetch_available_models("chat", refresh=True)
+        assert mock_get.call_count == 2
+
+        mocker.patch("aiterm.engine.time.monotonic", return_value=float("inf"))
+        mock_gemini_engine.fetch_available_models("chat")
+        assert mock_get.call_count == 3
+
+    def test_fetch_available_models_does_not_cache_failures(
+        self, mock_gemini_engine, mocker
+    ):
+        """Tests that an empty (failed) fetch is retried on the next call."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.side_effect = (
+            requests.exceptions.RequestException("HTTP Error")
+        )
+        mock_get = mocker.patch(
+            "aiterm.api_client._session.get", return_value=mock_response
+        )
+        mock_gemini_engine.fetch_available_models("chat")
+        mock_gemini_engine.fetch_available_models("chat")
+        assert mock_get.call_count == 2
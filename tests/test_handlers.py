@@ -54,6 +54,32 @@ class TestHandlers:
             "hello"
         )
 
+    def test_handle_chat_missing_key_propagates_after_context_load(
+        self, mock_dependencies
+    ):
+        """Tests that a key error from the concurrent setup still aborts the chat."""
+        handlers.resolve_config_precedence.return_value = {
+            "engine_name": "gemini",
+            "model": "gemini-test",
+            "max_tokens": 100,
+            "stream": False,
+            "memory_enabled": False,
+            "debug_enabled": False,
+            "persona": None,
+            "session_name": None,
+            "system_prompt_arg": None,
+            "files_arg": ["/fake/file.txt"],
+            "exclude_arg": [],
+        }
+        handlers.api_client.check_api_keys.side_effect = ValueError("no key")
+
+        with pytest.raises(ValueError, match="no key"):
+            handlers.handle_chat("hello", argparse.Namespace())
+        handlers.ContextManager.assert_called_once_with(
+            files_arg=["/fake/file.txt"], memory_enabled=False, exclude_arg=[]
+        )
+        handlers.SessionManager.assert_not_called()
+
     def test_handle_chat_interactive(self, mock_dependencies):
         """Tests that interactive mode runs correctly."""
         handlers.resolve_config_precedence.return_value = {
@@ -166,3 +192,17 @@ class TestHandlers:
         state = kwargs["state"]
         assert Path("/fake/file.txt") in state.attachments
         assert state.attachments[Path("/fake/file.txt")].content == "fake content"
+
+    def test_persona_owned_paths(self):
+        """Tests that only attachments listed by the persona are marked as its own."""
+        attachments = {
+            Path("/p/a.md"): Attachment(content="a", mtime=1.0),
+            Path("/cli/b.md"): Attachment(content="b", mtime=1.0),
+        }
+        persona = handlers.Persona(
+            name="P", filename="p.json", attachments=["/p/a.md", "/p/missing.md"]
+        )
+        assert handlers._persona_owned_paths(attachments, persona) == {
+            Path("/p/a.md")
+        }
+        assert handlers._persona_owned_paths(attachments, None) == set()
@@ -4,6 +4,9 @@ Tests for the logger setup in aiterm/logger.py.
 """
 
 import logging
+import logging.handlers
+
+import pytest
 
 from aiterm import logger
 
@@ -15,7 +18,7 @@ def test_setup_logger_file_creation_fails(mocker, capsys):
     """
     # Arrange: Mock RotatingFileHandler to fail on instantiation
     mocker.patch(
-        "aiterm.logger.RotatingFileHandler",
+        "aiterm.logger._LazyRotatingFileHandler",
         side_effect=OSError("Permission denied"),
     )
     # The logger instance is a singleton; we need to reset it to re-trigger setup
@@ -38,3 +41,89 @@ def test_setup_logger_file_creation_fails(mocker, capsys):
     # 2. The logger still has a handler (the console fallback).
     assert len(reloaded_log.handlers) == 1
     assert isinstance(reloaded_log.handlers[0], logging.StreamHandler)
+
+
+def test_setup_logger_writes_file_through_queue(mocker):
+    """Tests that file logging goes through a QueueHandler drained by a listener."""
+    mock_file_handler = mocker.patch("aiterm.logger._LazyRotatingFileHandler").return_value
+    mock_file_handler.level = logging.INFO
+    mocker.patch("aiterm.logger.atexit.register")
+    log_instance = logging.getLogger("aiterm")
+    mocker.patch.object(log_instance, "handlers", [])
+
+    reloaded_log = logger.setup_logger()
+    queue_handler = reloaded_log.handlers[1]
+    assert isinstance(queue_handler, logging.handlers.QueueHandler)
+
+    reloaded_log.info("queued message")
+    logger.atexit.register.call_args.args[0]()  # Stop the listener to drain it.
+
+    handled = mock_file_handler.handle.call_args.args[0]
+    assert handled.getMessage() == "queued message"
+
+
+def test_setup_logger_skips_unused_record_fields(mocker):
+    """Tests that records no longer collect caller, thread, or process details."""
+    for attr, value in (
+        ("_srcfile", __file__),
+        ("logThreads", True),
+        ("logProcesses", True),
+        ("logMultiprocessing", True),
+    ):
+        mocker.patch.object(logging, attr, value)
+
+    logger.setup_logger()
+
+    assert logging._srcfile is None
+    assert logging.logThreads is False
+    assert logging.logProcesses is False
+    assert logging.logMultiprocessing is False
+
+
+def test_file_handler_opens_log_on_first_record(tmp_path):
+    """Tests that the log file is only created once a record is written."""
+    log_file = tmp_path / "aiterm.log"
+    handler = logger._LazyRotatingFileHandler(log_file, encoding="utf-8")
+    assert not log_file.exists()
+
+    handler.handle(logging.makeLogRecord({"msg": "first", "levelno": logging.INFO}))
+    handler.close()
+
+    assert log_file.read_text(encoding="utf-8") == "first\n"
+
+
+def test_file_handler_rejects_unwritable_directory(tmp_path, mocker):
+    """Tests that an unwritable log directory fails at construction, not on emit."""
+    mocker.patch("aiterm.logger.os.access", return_value=False)
+    with pytest.raises(PermissionError, match="not writable"):
+        logger._LazyRotatingFileHandler(tmp_path / "aiterm.log")
+
+
+def test_setup_logger_unwritable_directory_falls_back(mocker, capsys):
+    """Tests that setup_logger uses the console alone when logs cannot be written."""
+    mocker.patch("aiterm.logger.os.access", return_value=False)
+    log_instance = logging.getLogger("aiterm")
+    mocker.patch.object(log_instance, "handlers", [])
+
+    reloaded_log = logger.setup_logger()
+
+    assert "CRITICAL: Could not create log file" in capsys.readouterr().err
+    assert len(reloaded_log.handlers) == 1
+    assert not isinstance(reloaded_log.handlers[0], logging.handlers.QueueHandler)
+
+
+def test_file_handler_open_failure_reported_once(tmp_path, capsys):
+    """Tests that an unopenable log file is reported once, then ignored."""
+    log_file = tmp_path / "aiterm.log"
+    log_file.mkdir()  # Opening a directory fails even when running as root.
+    handler = logger._LazyRotatingFileHandler(log_file)
+    test_log = logging.getLogger("aiterm.test_lazy_handler")
+    test_log.propagate = False
+    test_log.addHandler(handler)
+
+    test_log.error("lost")
+    test_log.error("lost again")
+    test_log.removeHandler(handler)
+
+    captured = capsys.readouterr()
+    assert captured.err.count("CRITICAL: Could not create log file") == 1
@@ -132,6 +132,22 @@ class TestPersonas:
         result = personas.list_personas()
         assert result == []
 
+    def test_list_personas_caches_until_directory_changes(self, fake_fs, mocker):
+        """Tests that persona files are only re-read after the directory changes."""
+        (config.PERSONAS_DIRECTORY / "one.json").write_text(
+            '{"name": "One", "system_prompt": "p"}'
+        )
+        load_spy = mocker.spy(personas, "load_persona")
+
+        assert [p.name for p in personas.list_personas()] == ["One"]
+        assert [p.name for p in personas.list_personas()] == ["One"]
+        assert load_spy.call_count == 1
+
+        (config.PERSONAS_DIRECTORY / "two.json").write_text(
+            '{"name": "Two", "system_prompt": "p"}'
+        )
+        assert [p.name for p in personas.list_personas()] == ["One", "Two"]
+
     def test_list_personas_skips_invalid(self, fake_fs, caplog):
         """Tests that list_personas loads valid files and skips invalid ones."""
         # Valid persona
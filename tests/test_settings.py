@@ -35,3 +35,67 @@ class TestSettings:
         success, message = app_settings.save_setting("non_existent_key", "some_value")
         assert success is False
         assert "Unknown setting: 'non_existent_key'" in message
+
+    def test_save_setting_deferred_batches_writes(self, fake_fs, mocker, monkeypatch):
+        """Tests that deferred changes apply in memory and land in one write."""
+        monkeypatch.setattr(app_settings, "SETTINGS_FLUSH_DELAY", 60)
+        monkeypatch.setitem(app_settings.settings, "toolbar_show_model", True)
+        monkeypatch.setitem(app_settings.settings, "toolbar_show_persona", True)
+        write_spy = mocker.spy(app_settings, "_write_settings")
+
+        app_settings.save_setting_deferred("toolbar_show_model", "false")
+        success, message = app_settings.save_setting_deferred(
+            "toolbar_show_persona", "false"
+        )
+        assert success is True
+        assert "Setting 'toolbar_show_persona' updated to 'False'" in message
+        assert app_settings.settings["toolbar_show_model"] is False
+        assert not config.SETTINGS_FILE.exists()
+
+        app_settings.flush_settings()
+        write_spy.assert_called_once()
+        with open(config.SETTINGS_FILE) as f:
+            data = json.load(f)
+        assert data["toolbar_show_model"] is False
+        assert data["toolbar_show_persona"] is False
+
+    def test_save_setting_deferred_rejects_invalid_value(self):
+        """Tests that validation errors are reported without scheduling a write."""
+        success, message = app_settings.save_setting_deferred(
+            "toolbar_enabled", "maybe"
+        )
+        assert success is False
+        assert "Invalid boolean value" in message
+        assert app_settings._pending_settings == {}
+
+    def test_flush_settings_keeps_changes_after_failed_write(
+        self, fake_fs, mocker, monkeypatch
+    ):
+        """Tests that a failed deferred write is retried and reported."""
+        monkeypatch.setattr(app_settings, "SETTINGS_FLUSH_DELAY", 60)
+        monkeypatch.setitem(app_settings.settings, "toolbar_show_model", True)
+        monkeypatch.setitem(app_settings.settings, "toolbar_show_persona", True)
+        written = []
+
+        def write_settings(pending):
+            if not written:
+                written.append(None)
+                raise OSError("Disk full")
+            written.append(dict(pending))
+
+        mocker.patch.object(app_settings, "_write_settings", side_effect=write_settings)
+
+        app_settings.save_setting_deferred("toolbar_show_model", "false")
+        app_settings.flush_settings()
+        assert app_settings._pending_settings == {"toolbar_show_model": False}
+
+        success, message = app_settings.save_setting_deferred(
+            "toolbar_show_persona", "false"
+        )
+        assert success is True
+        assert "could not be saved: Disk full" in message
+
+        app_settings.flush_settings()
+        assert written[-1] == {"toolbar_show_model": False, "toolbar_show_persona": False}
+        assert app_settings._pending_settings == {}
+        assert app_settings._flush_error is None
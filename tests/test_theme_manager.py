@@ -58,6 +58,7 @@ def mock_packaged_themes(mocker, fake_fs):
 
     mock_files.side_effect = files_side_effect
     mock_as_file.side_effect = as_file_side_effect
+    theme_manager._packaged_theme_descriptions.cache_clear()
 
 
 @pytest.mark.usefixtures("mock_packaged_themes")
@@ -127,3 +128,21 @@ class TestThemeManager:
         # Assert
         assert theme["description"] == "Packaged Default"
         assert "Could not load user theme 'bad'" in caplog.text
+
+    def test_list_themes_rereads_only_changed_user_dir(self, fake_fs, mocker):
+        """Tests that user themes are re-read only after the directory changes."""
+        fake_fs.create_file(
+            USER_THEMES_DIR / "custom.json",
+            contents=json.dumps({"description": "User Custom"}),
+        )
+        load_spy = mocker.spy(theme_manager, "_load_user_theme")
+
+        theme_manager.list_themes()
+        theme_manager.list_themes()
+        assert load_spy.call_count == 1
+
+        fake_fs.create_file(
+            USER_THEMES_DIR / "other.json",
+            contents=json.dumps({"description": "Other"}),
+        )
+        assert theme_manager.list_themes()["other"] == "Other"
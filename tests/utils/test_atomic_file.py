@@ -0,0 +1,31 @@
+# tests/utils/test_atomic_file.py
+"""
+Tests for the atomic file replacement helper in aiterm/utils/atomic_file.py.
+"""
+
+import pytest
+from aiterm.utils.atomic_file import write_atomic
+
+
+class TestWriteAtomic:
+    def test_replaces_existing_file(self, tmp_path):
+        """Tests that the target is replaced and no temporary file is left behind."""
+        target = tmp_path / "state.json"
+        target.write_bytes(b"old")
+
+        write_atomic(target, b"new")
+
+        assert target.read_bytes() == b"new"
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_failed_replace_keeps_original(self, tmp_path, mocker):
+        """Tests that a failed rename leaves the original intact and cleans up."""
+        target = tmp_path / "state.json"
+        target.write_bytes(b"old")
+        mocker.patch("aiterm.utils.atomic_file.os.replace", side_effect=OSError("boom"))
+
+        with pytest.raises(OSError, match="boom"):
+            write_atomic(target, b"new")
+
+        assert target.read_bytes() == b"old"
+        assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,42 @@
+# tests/utils/test_fast_json.py
+"""
+Tests for the optional-orjson JSON helpers in aiterm/utils/fast_json.py.
+"""
+
+import json
+
+import pytest
+from aiterm.utils import fast_json
+
+
+class TestFastJson:
+    def test_loads_accepts_bytes_and_str(self):
+        """Tests that both bytes and str payloads are parsed."""
+        assert fast_json.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+        assert fast_json.loads('{"a": "b"}') == {"a": "b"}
+
+    def test_loads_stdlib_fallback(self, mocker):
+        """Tests the standard library fallback when orjson is unavailable."""
+        mocker.patch("aiterm.utils.fast_json.orjson", None)
+        assert fast_json.loads(b'{"ok": true}') == {"ok": True}
+
+    def test_loads_invalid_raises_json_decode_error(self):
+        """Tests that invalid input raises the stdlib JSONDecodeError type."""
+        with pytest.raises(json.JSONDecodeError):
+            fast_json.loads(b'{"broken": ')
+
+    def test_dumps_returns_compact_bytes(self, mocker):
+        """Tests that both backends serialize to the same compact UTF-8 bytes."""
+        obj = {"a": [1, "é"]}
+        expected = '{"a":[1,"é"]}'.encode()
+        assert fast_json.dumps(obj) == expected
+        mocker.patch("aiterm.utils.fast_json.orjson", None)
+        assert fast_json.dumps(obj) == expected
+
+    def test_dumps_indent_matches_stdlib_layout(self, mocker):
+        """Tests that indented output is identical with either backend."""
+        obj = {"history": [{"role": "user", "content": "é"}], "empty": []}
+        expected = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        assert fast_json.dumps(obj, indent=True) == expected
+        mocker.patch("aiterm.utils.fast_json.orjson", None)
+        assert fast_json.dumps(obj, indent=True) == expected
@@ -7,6 +7,7 @@ import pytest
 from aiterm.utils.formatters import (
     clean_ai_response_text,
     estimate_token_count,
+    fast_token_estimate,
     format_bytes,
     format_token_string,
     sanitize_filename,
@@ -67,6 +68,13 @@ class TestFormatters:
         """Tests the token count estimation logic."""
         assert estimate_token_count(text) == expected_tokens
 
+    @pytest.mark.parametrize(
+        "text, expected_tokens", [("", 0), ("abc", 0), ("abcd", 1), ("x" * 10_000, 2500)]
+    )
+    def test_fast_token_estimate(self, text, expected_tokens):
+        """Tests the constant-time four-characters-per-token estimate."""
+        assert fast_token_estimate(text) == expected_tokens
+
     @pytest.mark.parametrize(
         "byte_count, expected_string",
         [
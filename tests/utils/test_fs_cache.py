@@ -0,0 +1,31 @@
+# tests/utils/test_fs_cache.py
+"""
+Tests for the directory fingerprint helper in aiterm/utils/fs_cache.py.
+"""
+
+from aiterm.utils.fs_cache import json_dir_signature
+
+
+class TestJsonDirSignature:
+    def test_signature_lists_json_files_only(self, tmp_path):
+        """Tests that only *.json files are fingerprinted, sorted by name."""
+        (tmp_path / "b.json").write_text("{}")
+        (tmp_path / "a.json").write_text("[1]")
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "dir.json").mkdir()
+
+        signature = json_dir_signature(tmp_path)
+        assert [entry[0] for entry in signature] == ["a.json", "b.json"]
+        assert signature[0][1] == 3
+
+    def test_signature_changes_when_file_rewritten(self, tmp_path):
+        """Tests that rewriting a file changes the signature."""
+        path = tmp_path / "a.json"
+        path.write_text("{}")
+        before = json_dir_signature(tmp_path)
+        path.write_text('{"k": 1}')
+        assert json_dir_signature(tmp_path) != before
+
+    def test_missing_directory_is_empty(self, tmp_path):
+        """Tests that a missing directory yields an empty signature."""
+        assert json_dir_signature(tmp_path / "missing") == ()
@@ -0,0 +1,45 @@
+# tests/utils/test_log_writer.py
+"""
+Tests for the background log appender in aiterm/utils/log_writer.py.
+"""
+
+from aiterm.utils.log_writer import AppendWriter, BackgroundWriter
+
+
+class TestAppendWriter:
+    def test_flush_writes_queued_lines_in_order(self, tmp_path):
+        """Tests that queued lines are appended per file, in order, by flush()."""
+        first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+        first.write_text("existing\n")
+        writer = AppendWriter()
+
+        writer.put(first, b"one\n")
+        writer.put(second, b"x\n")
+        writer.put(first, b"two\n")
+        writer.flush()
+
+        assert first.read_text() == "existing\none\ntwo\n"
+        assert second.read_text() == "x\n"
+
+    def test_write_error_is_logged(self, tmp_path, caplog):
+        """Tests that an unwritable path is logged rather than raised."""
+        writer = AppendWriter()
+        writer.put(tmp_path / "missing" / "log.jsonl", b"line\n")
+        writer.flush()
+
+        assert "Could not write to session log file" in caplog.text
+
+    def test_batched_writer_waits_for_batch(self):
+        """Tests that a batching writer groups items queued within its interval."""
+        written = []
+
+        class Collector(BackgroundWriter):
+            def _write(self, items):
+                written.append(items)
+
+        writer = Collector("test-writer", batch_size=3, interval=60.0)
+        for n in range(3):
+            writer._put(n)
+        writer.flush()
+
+        assert written == [[0, 1, 2]]
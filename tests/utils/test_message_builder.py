@@ -8,6 +8,7 @@ from aiterm.utils.message_builder import (
     construct_assistant_message,
     construct_user_message,
     extract_text_from_message,
+    make_user_message_builder,
     translate_history,
 )
 
@@ -148,4 +149,13 @@ class TestMessageBuilder:
             "role": "user",
             "content": [{"type": "text", "text": "Hi"}],
         }
-        assert openai_history[1] == {"role": "assistant", "content": "Hello there"}
\ No newline at end of file
+        assert openai_history[1] == {"role": "assistant", "content": "Hello there"}
+
+    @pytest.mark.parametrize("engine_name", ["openai", "groq", "anthropic", "gemini"])
+    def test_make_user_message_builder_matches_construct(self, engine_name):
+        """Tests that a pre-bound builder produces the same message as the dispatcher."""
+        image_data = [{"mime_type": "image/png", "data": "base64data"}]
+        build = make_user_message_builder(engine_name)
+        assert build("Look", image_data) == construct_user_message(
+            engine_name, "Look", image_data
+        )
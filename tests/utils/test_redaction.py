@@ -3,7 +3,7 @@
 Tests for the redaction utility in aiterm/utils/redaction.py.
 """
 
-from aiterm.utils.redaction import redact_sensitive_info
+from aiterm.utils.redaction import _is_sensitive, redact_sensitive_info
 
 
 class TestRedaction:
@@ -74,4 +74,36 @@ class TestRedaction:
         redacted = redact_sensitive_info(log_entry)
         redacted_json = str(redacted)
 
-        assert original_json == redacted_json
\ No newline at end of file
+        assert original_json == redacted_json
+
+    def test_redact_returns_independent_containers(self):
+        """Tests that the redacted copy shares no mutable containers with the input."""
+        log_entry = {"payload": {"messages": [{"role": "user", "content": "hi"}]}}
+        redacted = redact_sensitive_info(log_entry)
+
+        redacted["payload"]["messages"][0]["content"] = "changed"
+        redacted["payload"]["messages"].append({"role": "assistant"})
+
+        assert log_entry == {"payload": {"messages": [{"role": "user", "content": "hi"}]}}
+
+
+    def test_is_sensitive_is_case_insensitive(self):
+        """Tests that key classification ignores case and tolerates non-str keys."""
+        assert _is_sensitive("API_Key")
+        assert _is_sensitive("X-Api-Key")
+        assert not _is_sensitive("messages")
+
+        redacted = redact_sensitive_info({"TOKEN": "secret", 1: "one"})
+        assert redacted == {"TOKEN": "[REDACTED]", 1: "one"}
+
+    def test_redact_deeply_nested_structure(self):
+        """Tests that nesting deeper than the recursion limit is handled."""
+        data = {"token": "secret"}
+        for _ in range(5000):
+            data = {"child": [data]}
+        redacted = redact_sensitive_info(data)
+
+        node = redacted
+        for _ in range(5000):
+            node = node["child"][0]
+        assert node == {"token": "[REDACTED]"}